@@ -0,0 +1,56 @@
+"""
+    Benchmarks of the Custom Exporter hot paths at 10, 100 and 1000 texture sets.
+
+    Run from this directory:
+        pip install -r requirements.txt
+        pytest --benchmark-json=bench_results.json
+    FAKE_PAINTER_LATENCY environment variable adds latency in seconds to every simulated Painter API call.
+"""
+
+import module_export
+import module_texset_cache
+import module_texset_model
+import module_validation_name
+
+
+def invalidate_texture_set_cache():
+    module_texset_cache.texture_set_cache.invalidate()
+
+
+def bench_fill_texset_table(custom_exporter, measure):
+    measure(custom_exporter.fill_texset_table, setup=invalidate_texture_set_cache)
+
+
+def bench_refresh_texset_table_unchanged(custom_exporter, measure):
+    measure(custom_exporter.on_refresh_texset_table)
+
+
+def bench_refresh_texset_table_after_invalidation(custom_exporter, measure):
+    measure(custom_exporter.on_refresh_texset_table, setup=invalidate_texture_set_cache)
+
+
+def bench_refresh_texset_table_shader_type_change(custom_exporter, measure):
+    index = custom_exporter.texset_model.index(0, module_texset_model.SHADER_TYPE_COLUMN)
+    shader_types = custom_exporter.shader_types
+
+    def change_shader_type():
+        current_shader_type = custom_exporter.texset_model.rows[0].shader_type
+        next_shader_type = shader_types[(shader_types.index(current_shader_type) + 1) % len(shader_types)]
+        custom_exporter.texset_model.setData(index, next_shader_type)
+
+    measure(change_shader_type)
+
+
+def bench_validate_texture_sets(custom_exporter, measure):
+    measure(custom_exporter.validate_texture_sets)
+
+
+def bench_build_export_config(custom_exporter, measure):
+    texture_set_names = [texset_row.name for texset_row in custom_exporter.texset_model.rows]
+    measure(lambda: module_export.build_batch_export_config("custom_basic", "D:/Test", texture_set_names))
+
+
+def bench_validate_name_uncached(painter_project, measure):
+    texture_set_names = [texture_set_info.name for texture_set_info in module_texset_cache.texture_set_cache.all_texture_sets()]
+    validate_name = module_validation_name.validate_name.__wrapped__
+    measure(lambda: [validate_name("Props", texture_set_name) for texture_set_name in texture_set_names])
@@ -0,0 +1,88 @@
+"""
+    Benchmark fixtures for the Custom Exporter hot paths.
+
+    The plugin is run against the local Substance Painter stand-in from fake_painter,
+    with the Qt widgets rendered offscreen.
+"""
+
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+BENCHMARKS_DIR = os.path.dirname(__file__)
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path[:0] = [
+        os.path.join(BENCHMARKS_DIR, "fake_painter"),
+        os.path.join(REPO_DIR, "modules"),
+        os.path.join(REPO_DIR, "plugins"),
+        ]
+
+import substance_painter as sp  # noqa: E402
+
+TEXTURE_SET_COUNTS = [10, 100, 1000]
+
+
+@pytest.fixture(scope="session")
+def qt_application():
+    from PySide2 import QtCore, QtWidgets
+
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    QtCore.QCoreApplication.setOrganizationName("CustomExporterBenchmarks")
+    # Resolution autofix dialog is modal, it should never be opened during the benchmarks
+    QtCore.QSettings().setValue("dialog_window_checkbox_state", QtCore.Qt.Checked)
+    return application
+
+
+@pytest.fixture(params=TEXTURE_SET_COUNTS, ids=lambda count: f"{count}_texture_sets")
+def painter_project(request):
+    sp.fake.set_latency(float(os.environ.get("FAKE_PAINTER_LATENCY", 0.0)))
+    sp.fake.open_project(request.param)
+    import module_texset_cache
+    module_texset_cache.texture_set_cache.invalidate()
+    yield request.param
+    sp.fake.close_project()
+    sp.fake.set_latency(0.0)
+
+
+@pytest.fixture
+def custom_exporter(qt_application, painter_project):
+    import custom_exporter
+
+    exporter = custom_exporter.CustomExporter()
+    yield exporter
+    exporter.export_queue.cancel()
+    # Painter events of the next benchmark should not reach the deleted widget
+    sp.event.DISPATCHER.callbacks.clear()
+    module_texset_cache = sys.modules["module_texset_cache"]
+    module_texset_cache.texture_set_cache.is_connected = False
+    exporter.widget.deleteLater()
+
+
+@pytest.fixture
+def measure(benchmark):
+    """
+    Benchmarks the function and records Painter API calls and peak Python memory
+    of a single extra call into the benchmark extra info.
+    """
+    def run(function, setup=None):
+        if setup is not None:
+            setup()
+        sp.fake.reset_api_calls()
+        tracemalloc.start()
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        benchmark.extra_info["painter_api_calls"] = sp.fake.total_api_calls()
+        benchmark.extra_info["painter_api_calls_by_name"] = dict(sp.fake.api_calls)
+        benchmark.extra_info["peak_memory_bytes"] = peak_memory
+
+        if setup is None:
+            return benchmark(function)
+        return benchmark.pedantic(function, setup=setup, rounds=20, warmup_rounds=1)
+
+    return run
@@ -0,0 +1,44 @@
+"""
+    Export farm worker standing in for a headless Painter, to run module_export_farm locally:
+
+        python modules/module_export_farm.py jobs.jsonl --worker-command "python benchmarks/fake_painter/fake_farm_worker.py"
+
+    Job specs are read from stdin and run with module_export.export_farm_job against the local Painter stand-in,
+    which writes small placeholder files. FAKE_FARM_WORKER_FAILURE_RATE (0.0 - 1.0) makes a share of the jobs fail,
+    and FAKE_FARM_WORKER_CRASH_RATE makes the worker exit in the middle of a job, to exercise retries.
+"""
+
+import json
+import os
+import random
+import sys
+
+FAKE_PAINTER_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(FAKE_PAINTER_DIR))
+sys.path[:0] = [FAKE_PAINTER_DIR, os.path.join(REPO_DIR, "modules")]
+
+import substance_painter as sp  # noqa: E402
+
+import module_export  # noqa: E402
+
+FAILURE_RATE = float(os.environ.get("FAKE_FARM_WORKER_FAILURE_RATE", 0.0))
+CRASH_RATE = float(os.environ.get("FAKE_FARM_WORKER_CRASH_RATE", 0.0))
+
+
+def main():
+    sp.export.write_files = True
+    for line in sys.stdin:
+        job_spec = json.loads(line)
+        if random.random() < CRASH_RATE:
+            sys.exit(1)
+
+        if random.random() < FAILURE_RATE:
+            result = {"job_id": job_spec["job_id"], "status": "failed", "details": "Simulated export failure", "exported_files": []}
+        else:
+            result = module_export.export_farm_job(job_spec, post_export_steps=[])
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+    Remote scripting server standing in for a headless Painter, to run modules/module_export_farm_worker.py locally:
+
+        python modules/module_export_farm.py jobs.jsonl --workers 1 --worker-command "python modules/module_export_farm_worker.py --painter-command 'python benchmarks/fake_painter/fake_remote_scripting.py'"
+
+    Python scripts posted to /run.json are run one by one against the local Painter stand-in,
+    which writes small placeholder files, like Painter runs them on its main thread.
+"""
+
+import argparse
+import http.server
+import json
+import os
+import sys
+import traceback
+
+FAKE_PAINTER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, FAKE_PAINTER_DIR)
+
+import substance_painter as sp  # noqa: E402
+
+DEFAULT_PORT = 60041
+
+
+class RemoteScriptingHandler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != "/run.json":
+            self.send_error(404)
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        try:
+            exec(request["python"], {"__name__": "__remote__"})
+            status, response = 200, ""
+        except Exception:  # script errors are answered like Painter does, the server keeps running
+            status, response = 500, traceback.format_exc()
+
+        body = response.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--enable-remote-scripting", action="store_true")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    arguments = parser.parse_args()
+
+    sp.export.write_files = True
+    http.server.HTTPServer(("localhost", arguments.port), RemoteScriptingHandler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
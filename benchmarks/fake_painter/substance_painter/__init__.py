@@ -0,0 +1,6 @@
+"""
+    Local stand-in of the Substance Painter Python API, used to run the Custom Exporter outside of Painter.
+    Only the parts of the API used by the plugin are simulated.
+"""
+
+from . import event, export, fake, logging, project, resource, textureset, ui
@@ -0,0 +1,47 @@
+import collections
+
+
+class Event:
+    pass
+
+
+class ProjectOpened(Event):
+    pass
+
+
+class ProjectCreated(Event):
+    pass
+
+
+class ProjectAboutToClose(Event):
+    pass
+
+
+class ProjectSaved(Event):
+    pass
+
+
+class LayerStacksModelDataChanged(Event):
+    pass
+
+
+class ExportTexturesEnded(Event):
+    pass
+
+
+class Dispatcher:
+    def __init__(self):
+        self.callbacks = collections.defaultdict(list)
+
+    def connect(self, event_type, callback):
+        self.callbacks[event_type].append(callback)
+
+    def disconnect(self, event_type, callback):
+        self.callbacks[event_type].remove(callback)
+
+    def emit(self, event):
+        for callback in list(self.callbacks[type(event)]):
+            callback(event)
+
+
+DISPATCHER = Dispatcher()
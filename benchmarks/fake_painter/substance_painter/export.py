@@ -0,0 +1,44 @@
+import enum
+
+from . import fake
+
+
+class ExportStatus(enum.Enum):
+    Success = 0
+    Cancelled = 1
+    Warning = 2
+    Error = 3
+
+
+class TextureExportResult:
+    def __init__(self, status, message, textures):
+        self.status = status
+        self.message = message
+        self.textures = textures
+
+
+# Maps written by every exported stack. No files are written unless `write_files` is set
+exported_maps = ["BaseColor", "Normal", "ORM"]
+write_files = False
+
+
+def export_project_textures(json_config):
+    fake.api_call("export.export_project_textures")
+    textures = {}
+    for export_entry in json_config["exportList"]:
+        stack = export_entry["rootPath"]
+        output_maps = export_entry.get("filter", {}).get("outputMaps")
+        exported_files = [
+                f"{json_config['exportPath']}/{stack}_{exported_map}.png"
+                for exported_map in exported_maps
+                if output_maps is None or f"$textureSet_{exported_map}" in output_maps
+                ]
+        if write_files:
+            import os
+
+            os.makedirs(json_config["exportPath"], exist_ok=True)
+            for exported_file in exported_files:
+                with open(exported_file, "wb") as file:
+                    file.write(b"\0" * 64)
+        textures[(stack, "")] = exported_files
+    return TextureExportResult(ExportStatus.Success, "Export is done", textures)
@@ -0,0 +1,64 @@
+"""
+    Controls of the local Substance Painter stand-in.
+
+    Every simulated Painter API call is counted in api_calls and sleeps for `latency` seconds,
+    so benchmarks could report how many round-trips into Painter the plugin is doing.
+"""
+
+import collections
+import time
+
+latency = 0.0
+api_calls = collections.Counter()
+
+
+def api_call(name):
+    api_calls[name] += 1
+    if latency:
+        time.sleep(latency)
+
+
+def set_latency(seconds):
+    global latency
+    latency = seconds
+
+
+def reset_api_calls():
+    api_calls.clear()
+
+
+def total_api_calls():
+    return sum(api_calls.values())
+
+
+def generate_texture_set_names(texture_set_count):
+    """ Unique valid Props names, up to 1200 of them: PROP_CHR_S_00, PROP_CHR_S_01, ... """
+    names = [
+            f"PROP_{prop_type}_{prop_size}_{asset_id:02d}"
+            for prop_type in ("CHR", "TBL", "LMP", "WIN")
+            for prop_size in ("S", "M", "L")
+            for asset_id in range(100)
+            ]
+    if texture_set_count > len(names):
+        raise ValueError(f"Only {len(names)} unique texture set names could be generated")
+    return names[:texture_set_count]
+
+
+def open_project(texture_set_count, width=1024, height=1024, file_path=None):
+    """ Opens a fake project with the given number of texture sets. """
+    from substance_painter import event, project, textureset
+
+    textureset._set_texture_sets([
+        textureset.TextureSet(name, textureset.Resolution(width, height))
+        for name in generate_texture_set_names(texture_set_count)
+        ])
+    project._set_open(True, file_path)
+    event.DISPATCHER.emit(event.ProjectOpened())
+
+
+def close_project():
+    from substance_painter import event, project, textureset
+
+    event.DISPATCHER.emit(event.ProjectAboutToClose())
+    textureset._set_texture_sets([])
+    project._set_open(False, None)
@@ -0,0 +1,10 @@
+DBG_INFO = "DBG_INFO"
+INFO = "INFO"
+WARNING = "WARNING"
+ERROR = "ERROR"
+
+messages = []
+
+
+def log(severity, channel, message):
+    messages.append((severity, channel, message))
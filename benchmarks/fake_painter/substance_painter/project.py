@@ -0,0 +1,42 @@
+from . import fake
+
+_is_open = False
+_file_path = None
+_needs_saving = False
+
+
+def _set_open(is_opened, file_path):
+    global _is_open, _file_path
+    _is_open = is_opened
+    _file_path = file_path
+
+
+def is_open():
+    fake.api_call("project.is_open")
+    return _is_open
+
+
+def file_path():
+    fake.api_call("project.file_path")
+    return _file_path
+
+
+def needs_saving():
+    fake.api_call("project.needs_saving")
+    return _needs_saving
+
+
+def open(file_path):
+    from . import event
+
+    fake.api_call("project.open")
+    _set_open(True, file_path)
+    event.DISPATCHER.emit(event.ProjectOpened())
+
+
+def close():
+    from . import event
+
+    fake.api_call("project.close")
+    event.DISPATCHER.emit(event.ProjectAboutToClose())
+    _set_open(False, None)
@@ -0,0 +1,11 @@
+from . import fake
+
+
+class ResourceID:
+    def __init__(self, context, name):
+        self.context = context
+        self.name = name
+
+    def url(self):
+        fake.api_call("resource.ResourceID.url")
+        return f"resource://{self.context}/{self.name}"
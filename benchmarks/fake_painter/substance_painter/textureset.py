@@ -0,0 +1,109 @@
+import enum
+
+from . import fake
+
+_texture_sets = []
+_active_texture_set_name = None
+
+
+class Resolution:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def __eq__(self, other):
+        return (self.width, self.height) == (other.width, other.height)
+
+    def __repr__(self):
+        return f"Resolution({self.width}, {self.height})"
+
+
+class ChannelType(enum.Enum):
+    BaseColor = 0
+    Height = 1
+    Specular = 2
+    Opacity = 3
+    Emissive = 4
+    Roughness = 5
+    Metallic = 6
+    Normal = 7
+    AO = 8
+    User0 = 9
+    User1 = 10
+
+
+# Channels of every stack, unless they are set for the texture set
+DEFAULT_CHANNELS = ["BaseColor", "Height", "Roughness", "Metallic", "Normal"]
+
+
+class Stack:
+    def __init__(self, texture_set_name):
+        self.texture_set_name = texture_set_name
+
+    def __str__(self):
+        return self.texture_set_name
+
+    def all_channels(self):
+        fake.api_call("textureset.Stack.all_channels")
+        channels = self.material()._channels
+        return {ChannelType[channel]: None for channel in channels}
+
+    def material(self):
+        fake.api_call("textureset.Stack.material")
+        return TextureSet.from_name(self.texture_set_name)
+
+
+class TextureSet:
+    def __init__(self, name, resolution, channels=None):
+        self._name = name
+        self._resolution = resolution
+        self._channels = list(DEFAULT_CHANNELS if channels is None else channels)
+
+    @classmethod
+    def from_name(cls, texture_set_name):
+        fake.api_call("textureset.TextureSet.from_name")
+        for texture_set in _texture_sets:
+            if texture_set._name == texture_set_name:
+                return texture_set
+        raise ValueError(f"There is no texture set {texture_set_name}")
+
+    def name(self):
+        fake.api_call("textureset.TextureSet.name")
+        return self._name
+
+    def get_resolution(self):
+        fake.api_call("textureset.TextureSet.get_resolution")
+        return Resolution(self._resolution.width, self._resolution.height)
+
+    def set_resolution(self, resolution):
+        from . import event
+
+        fake.api_call("textureset.TextureSet.set_resolution")
+        self._resolution = Resolution(resolution.width, resolution.height)
+        event.DISPATCHER.emit(event.LayerStacksModelDataChanged())
+
+    def get_stack(self):
+        fake.api_call("textureset.TextureSet.get_stack")
+        return Stack(self._name)
+
+
+def _set_texture_sets(texture_sets):
+    global _texture_sets
+    _texture_sets = texture_sets
+
+
+def _set_active_texture_set(texture_set_name):
+    global _active_texture_set_name
+    _active_texture_set_name = texture_set_name
+
+
+def get_active_stack():
+    fake.api_call("textureset.get_active_stack")
+    if _active_texture_set_name is None:
+        raise ValueError("There is no active stack")
+    return Stack(_active_texture_set_name)
+
+
+def all_texture_sets():
+    fake.api_call("textureset.all_texture_sets")
+    return list(_texture_sets)
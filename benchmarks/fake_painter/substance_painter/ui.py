@@ -0,0 +1,15 @@
+from . import fake
+
+dock_widgets = []
+
+
+def add_dock_widget(widget):
+    fake.api_call("ui.add_dock_widget")
+    dock_widgets.append(widget)
+    return widget
+
+
+def delete_ui_element(widget):
+    fake.api_call("ui.delete_ui_element")
+    if widget in dock_widgets:
+        dock_widgets.remove(widget)
@@ -0,0 +1,3 @@
+""" Local stand-in of the Substance Painter plugins API. """
+
+plugins = {}
@@ -0,0 +1,142 @@
+"""
+    Headless batch validation of Texture Set names and resolutions.
+
+    Runs the same rules as the Custom Exporter widget without Substance Painter,
+    e.g. in CI over texture sets dumped from many .spp projects.
+
+    Input is a JSON Lines or CSV file (or stdin with "-"), one texture set per record:
+        {"project": "props_01.spp", "asset_type": "Props", "name": "PROP_CHR_S_01", "width": 1024, "height": 1024}
+    Asset Type could be omitted in the records and provided with --asset-type instead.
+
+    Records are validated across a multiprocessing pool and results are streamed to stdout as JSON Lines.
+    Malformed records, e.g. without a name or with a non-integer width, are reported as failed with an "error".
+    Exit code is 1 when at least one texture set failed the validation.
+
+    Usage:
+        python module_batch_validation.py texture_sets.jsonl --processes 8 > results.jsonl
+
+    Content:
+        - read_records
+        - check_record
+        - validate_record
+        - main
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+from typing import Dict, Iterator, List, Optional
+
+import module_validation_service
+
+REQUIRED_FIELDS = ["asset_type", "name", "width", "height"]
+
+
+def read_records(input_file, input_format: str) -> Iterator[Dict]:
+    if input_format == "csv":
+        yield from csv.DictReader(input_file)
+        return
+
+    for line_number, line in enumerate(input_file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield {"error": f"Line {line_number} is not valid JSON: {error}"}
+            continue
+        yield record if isinstance(record, dict) else {"error": f"Line {line_number} is not a JSON object"}
+
+
+def check_record(record: Dict) -> Optional[str]:
+    """ Reason why the record could not be validated, None for a well-formed record. """
+    if record.get("error"):
+        return record["error"]
+
+    missing_fields = [field for field in REQUIRED_FIELDS if record.get(field) in (None, "")]
+    if missing_fields:
+        return f"Record is missing {', '.join(missing_fields)}"
+
+    for field in ("width", "height"):
+        try:
+            int(record[field])
+        except (TypeError, ValueError):
+            return f"{field} should be an integer, got {record[field]!r}"
+    return None
+
+
+def validate_record(record: Dict) -> Dict:
+    record_error = check_record(record)
+    if record_error is not None:
+        result = dict(record)
+        result.update({
+            "passed": False,
+            "resolution_passed": False,
+            "name_passed": False,
+            "error": record_error,
+            })
+        return result
+
+    validation_result = module_validation_service.validate_texture_set(
+            record["asset_type"],
+            record["name"],
+            int(record["width"]),
+            int(record["height"]),
+            )
+
+    result = dict(record)
+    result.update({
+        "passed": validation_result.is_valid,
+        "resolution_passed": validation_result.res_is_valid,
+        "resolution_details": validation_result.res_validation_details,
+        "name_passed": validation_result.name_is_valid,
+        "name_details": validation_result.name_validation_details,
+        })
+    return result
+
+
+def with_default_asset_type(records: Iterator[Dict], asset_type: Optional[str]) -> Iterator[Dict]:
+    for record in records:
+        if asset_type is not None and not record.get("asset_type"):
+            record["asset_type"] = asset_type
+        yield record
+
+
+def parse_arguments(argv: Optional[List[str]]):
+    parser = argparse.ArgumentParser(description="Validate Texture Set names and resolutions without Substance Painter.")
+    parser.add_argument("input", help="JSON Lines or CSV file with texture sets, '-' to read JSON Lines from stdin")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="input format, detected from the file extension by default")
+    parser.add_argument("--asset-type", help="Asset Type for the records without one")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes, all cores by default")
+    parser.add_argument("--chunk-size", type=int, default=256, help="number of records sent to a worker at once")
+    parser.add_argument("--failed-only", action="store_true", help="output only texture sets which failed the validation")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    input_format = arguments.format or ("csv" if arguments.input.lower().endswith(".csv") else "jsonl")
+    input_file = sys.stdin if arguments.input == "-" else open(arguments.input, "r", newline="")
+
+    is_validation_passed = True
+    try:
+        records = with_default_asset_type(read_records(input_file, input_format), arguments.asset_type)
+        with multiprocessing.Pool(arguments.processes) as pool:
+            for result in pool.imap(validate_record, records, chunksize=arguments.chunk_size):
+                is_validation_passed = is_validation_passed and result["passed"]
+                if arguments.failed_only and result["passed"]:
+                    continue
+                sys.stdout.write(json.dumps(result) + "\n")
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+    sys.stdout.flush()
+    return 0 if is_validation_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,71 @@
 import substance_painter as sp
+import os
+import time
 from math import log2
-from os import startfile
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import module_export_dedupe
+import module_export_fs
+import module_export_manifest
+import module_instrumentation
+import module_post_export
+import module_texset_cache
+
+
+DEFAULT_EXPORT_TARGET = "Default"
+
+# Target platforms every texture set could be exported for within the same export.
+# Target uses the shader type preset with the given suffix (custom_basic_console),
+# whose output maps are named with the same suffix ($textureSet_BaseColor_console),
+# and its maps are never bigger than max_size. Default target is the shader type preset at full resolution.
+export_targets = {
+        DEFAULT_EXPORT_TARGET: {"preset_suffix": "", "max_size": None},
+        "PC 4K": {"preset_suffix": "pc", "max_size": 4096},
+        "Console 2K": {"preset_suffix": "console", "max_size": 2048},
+        "Mobile 1K": {"preset_suffix": "mobile", "max_size": 1024},
+        }
+
+# Output maps of the export presets for every shader type
+shader_type_output_maps = {
+        "Basic": ["BaseColor", "Normal", "ORM", "Emissive", "Opacity"],
+        "Armament": ["BaseColor", "Normal", "ORM", "Emissive", "Wear"],
+        "Morph": ["BaseColor", "Normal", "ORM", "Mask"],
+        }
+
+# Output maps exported only if the stack has any of their channels, when empty maps are pruned.
+# Maps which are not listed are always exported, e.g. Normal is baked from the mesh maps even without a Normal channel.
+# Wear and Mask are packed by the presets from the user channels.
+shader_type_map_channels = {
+        "Basic": {"Emissive": ["Emissive"], "Opacity": ["Opacity"]},
+        "Armament": {"Emissive": ["Emissive"], "Wear": ["User0"]},
+        "Morph": {"Mask": ["User1"]},
+        }
+
+# Channel count and bit depth of the output maps in the export presets.
+# Exported maps are estimated uncompressed in their format, an upper bound of what is written.
+output_map_formats = {
+        "BaseColor": (3, 8),
+        "Normal": (3, 16),
+        "ORM": (3, 8),
+        "Emissive": (3, 8),
+        "Opacity": (1, 8),
+        "Wear": (1, 8),
+        "Mask": (1, 8),
+        }
+# Format of the output maps which are not listed, RGBA8
+DEFAULT_OUTPUT_MAP_FORMAT = (4, 8)
+
+# Progressive export: previews of the Default target are exported first, downscaled to fit the preview size,
+# into the preview folder of the export path. They are removed when the full resolution export is done.
+PREVIEW_MAX_SIZES = [512, 1024]
+PREVIEW_FOLDER_NAME = "_preview"
+
+
+class ExportJob(NamedTuple):
+    texture_set_name: str
+    shader_type: str
+    export_path: str
+    export_targets: Tuple[str, ...] = (DEFAULT_EXPORT_TARGET,)
 
 
 def get_export_preset_from_shader_type(shader_type):
@@ -16,59 +81,666 @@ def get_export_preset_from_shader_type(shader_type):
     return export_preset_name
 
 
-def build_export_config(texture_set_name, shader_type, export_path):
-    texture_set = sp.textureset.TextureSet.from_name(texture_set_name)
-    texture_set_stack = texture_set.get_stack()
+def get_texture_set_export_data(texture_set_name):
+    texture_set_info = module_texset_cache.texture_set_cache.get_info(texture_set_name)
+    resolution = [log2(texture_set_info.width), log2(texture_set_info.height)]
+    return texture_set_info.stack_id, resolution
 
-    export_preset_name = get_export_preset_from_shader_type(shader_type)
 
-    export_preset_id = sp.resource.ResourceID("test_lib", export_preset_name)
+class IncrementalPlan(NamedTuple):
+    """ Result of the incremental check, done once per export and shared by all of its batches. """
+    # texture set name -> outcome of the texture sets skipped as up to date
+    skipped_outcomes: Dict[str, Tuple[bool, str, List[str]]]
+    # texture set name -> fingerprint to be recorded after the export of the dirty texture sets
+    export_fingerprints: Dict[str, Optional[Dict]]
 
-    resolution = texture_set.get_resolution()
-    resolution = [log2(resolution.width), log2(resolution.height)]
 
-    export_config = {
-            "exportShaderParams": False,
-            "exportPath": export_path,
-            "defaultExportPreset": export_preset_id.url(),
-            "exportList": [
-                {
-                    "rootPath": str(texture_set_stack)
-                }
-                ],
-            "exportParameters": [
+def get_duplicate_texture_sets(export_jobs: List[ExportJob]) -> List[str]:
+    """ Texture sets with more than one job. Outcomes, fingerprints and manifest entries are per texture set. """
+    texture_set_names = set()
+    duplicate_texture_sets = set()
+    for export_job in export_jobs:
+        if export_job.texture_set_name in texture_set_names:
+            duplicate_texture_sets.add(export_job.texture_set_name)
+        texture_set_names.add(export_job.texture_set_name)
+    return sorted(duplicate_texture_sets)
+
+
+def resolve_export_jobs(export_jobs: List[ExportJob], export_outcomes: Dict) -> List[ExportJob]:
+    """
+    Jobs whose texture set is in the project. Texture sets which could not be resolved,
+    e.g. removed from the project while they were queued, are reported as failed into export_outcomes.
+    """
+    resolved_export_jobs = []
+    for export_job in export_jobs:
+        try:
+            get_texture_set_export_data(export_job.texture_set_name)
+        except KeyError:
+            export_outcomes[export_job.texture_set_name] = (False, f"Texture set {export_job.texture_set_name} is not in the project anymore", [])
+            continue
+        resolved_export_jobs.append(export_job)
+    return resolved_export_jobs
+
+
+def group_export_jobs(export_jobs: List[ExportJob]) -> Dict[Tuple[str, str], List[ExportJob]]:
+    """
+    Groups export jobs sharing the same export preset and export path,
+    so every group could be exported with a single export config.
+    Jobs without a valid export preset are grouped under the None preset.
+    """
+    export_groups = {}
+    for export_job in export_jobs:
+        export_preset_name = get_export_preset_from_shader_type(export_job.shader_type)
+        export_groups.setdefault((export_preset_name, export_job.export_path), []).append(export_job)
+    return export_groups
+
+
+def get_export_shader_type(export_preset_name):
+    for shader_type in shader_type_output_maps:
+        if get_export_preset_from_shader_type(shader_type) == export_preset_name:
+            return shader_type
+    return None
+
+
+def fit_size_log2(resolution, max_size):
+    """ Downscales texture set resolution to fit the max size, aspect ratio is kept. """
+    if max_size is None:
+        return resolution
+
+    size_shift = max(0, max(resolution) - log2(max_size))
+    return [resolution[0] - size_shift, resolution[1] - size_shift]
+
+
+def get_target_size_log2(resolution, export_target):
+    return fit_size_log2(resolution, export_targets[export_target]["max_size"])
+
+
+def get_preview_export_path(export_path):
+    return os.path.join(export_path, PREVIEW_FOLDER_NAME)
+
+
+def get_preview_export_job(export_job: ExportJob) -> ExportJob:
+    return export_job._replace(export_path=get_preview_export_path(export_job.export_path), export_targets=(DEFAULT_EXPORT_TARGET,))
+
+
+def get_target_output_maps(export_preset_name, export_target, pruned_output_maps: Sequence[str] = ()):
+    preset_suffix = export_targets[export_target]["preset_suffix"]
+    map_suffix = f"_{preset_suffix}" if preset_suffix else ""
+    output_maps = shader_type_output_maps.get(get_export_shader_type(export_preset_name), [])
+    return [f"$textureSet_{output_map}{map_suffix}" for output_map in output_maps if output_map not in pruned_output_maps]
+
+
+def get_pruned_output_maps(texture_set_name, shader_type) -> List[str]:
+    """ Output maps of the shader type which would be empty, none of their channels is in the texture set stack. """
+    map_channels = shader_type_map_channels.get(shader_type, {})
+    if not map_channels:
+        return []
+
+    channels = module_texset_cache.texture_set_cache.get_channels(texture_set_name)
+    if channels is None:
+        # Maps are not pruned if the stack channels are unknown
+        return []
+    return [
+            output_map
+            for output_map in shader_type_output_maps.get(shader_type, [])
+            if output_map in map_channels and channels.isdisjoint(map_channels[output_map])
+            ]
+
+
+def plan_channel_pruning(export_jobs: List[ExportJob]) -> Dict[str, List[str]]:
+    """ Pruned output maps of every texture set which has any of them. """
+    pruned_output_maps = {}
+    for export_job in export_jobs:
+        texture_set_pruned_maps = get_pruned_output_maps(export_job.texture_set_name, export_job.shader_type)
+        if texture_set_pruned_maps:
+            pruned_output_maps[export_job.texture_set_name] = texture_set_pruned_maps
+    return pruned_output_maps
+
+
+def get_map_bytes(resolution, export_target, output_map) -> int:
+    width_log2, height_log2 = get_target_size_log2(resolution, export_target)
+    channel_count, bit_depth = output_map_formats.get(output_map, DEFAULT_OUTPUT_MAP_FORMAT)
+    return int(2 ** width_log2 * 2 ** height_log2) * channel_count * bit_depth // 8
+
+
+def build_export_entries(export_preset_name, root_path, resolution, texture_set_targets: Sequence[str], pruned_output_maps: Sequence[str] = ()):
+    """
+    Export list and export parameters entries producing every target of the texture set from the same config.
+    Pruned output maps are filtered out of the export list, they are neither computed nor written.
+    """
+    if list(texture_set_targets) == [DEFAULT_EXPORT_TARGET]:
+        export_entry = {"rootPath": root_path}
+        if pruned_output_maps:
+            export_entry["filter"] = {"outputMaps": get_target_output_maps(export_preset_name, DEFAULT_EXPORT_TARGET, pruned_output_maps)}
+        export_list = [export_entry]
+        export_parameters = [
                 {
+                    "filter": {"dataPaths": [root_path]},
                     "parameters": {
                         "paddingAlgorithm": "infinite",
                         "sizeLog2": resolution,
                         }
-                    },
+                    }
                 ]
+        return export_list, export_parameters
+
+    export_list = []
+    export_parameters = []
+    for export_target in texture_set_targets:
+        preset_suffix = export_targets[export_target]["preset_suffix"]
+        export_entry = {"rootPath": root_path}
+        if preset_suffix:
+            export_entry["exportPreset"] = sp.resource.ResourceID("test_lib", f"{export_preset_name}_{preset_suffix}").url()
+        target_output_maps = get_target_output_maps(export_preset_name, export_target, pruned_output_maps)
+        if pruned_output_maps:
+            export_entry["filter"] = {"outputMaps": target_output_maps}
+        export_list.append(export_entry)
+
+        export_parameters.append(
+                {
+                    "filter": {
+                        "dataPaths": [root_path],
+                        "outputMaps": target_output_maps,
+                        },
+                    "parameters": {
+                        "paddingAlgorithm": "infinite",
+                        "sizeLog2": get_target_size_log2(resolution, export_target),
+                        }
+                    }
+                )
+    return export_list, export_parameters
+
+
+def build_batch_export_config(
+        export_preset_name,
+        export_path,
+        texture_set_names,
+        texture_set_targets: Optional[Dict[str, Sequence[str]]] = None,
+        pruned_output_maps: Optional[Dict[str, Sequence[str]]] = None,
+        max_size: Optional[int] = None,
+        ):
+    """
+    texture_set_targets: export targets per texture set, the Default target is used if not specified.
+    pruned_output_maps: output maps which are not exported per texture set, see plan_channel_pruning.
+    max_size: texture sets are downscaled to fit it, e.g. for previews.
+    """
+    export_preset_id = sp.resource.ResourceID("test_lib", export_preset_name)
+    texture_set_targets = texture_set_targets or {}
+    pruned_output_maps = pruned_output_maps or {}
+
+    export_list = []
+    export_parameters = []
+    for texture_set_name in texture_set_names:
+        root_path, resolution = get_texture_set_export_data(texture_set_name)
+        resolution = fit_size_log2(resolution, max_size)
+        entries_export_list, entries_export_parameters = build_export_entries(
+                export_preset_name,
+                root_path,
+                resolution,
+                texture_set_targets.get(texture_set_name, (DEFAULT_EXPORT_TARGET,)),
+                pruned_output_maps.get(texture_set_name, ()),
+                )
+        export_list.extend(entries_export_list)
+        export_parameters.extend(entries_export_parameters)
+
+    export_config = {
+            "exportShaderParams": False,
+            "exportPath": export_path,
+            "defaultExportPreset": export_preset_id.url(),
+            "exportList": export_list,
+            "exportParameters": export_parameters,
             }
     return export_config
 
 
-def open_exporter_at_given_path(path):
-    startfile(path)
+def build_export_config(texture_set_name, shader_type, export_path):
+    export_preset_name = get_export_preset_from_shader_type(shader_type)
+    return build_batch_export_config(export_preset_name, export_path, [texture_set_name])
 
 
-def export_textures(texture_set_name, shader_type, export_path):
-    if not sp.project.is_open():
+def get_project_stamp():
+    """
+    Save time of the project file, used as a proxy of the stack content in export fingerprints.
+    Returns None when the project has unsaved changes and the saved file can't describe its content.
+    """
+    if sp.project.needs_saving():
+        return None
+
+    project_file_path = sp.project.file_path()
+    if project_file_path is None or not os.path.exists(project_file_path):
+        return None
+    return os.path.getmtime(project_file_path)
+
+
+def build_export_fingerprint(export_job: ExportJob, project_stamp, pruned_output_maps: Sequence[str] = ()):
+    if project_stamp is None:
+        return None
+
+    try:
+        root_path, resolution = get_texture_set_export_data(export_job.texture_set_name)
+    except KeyError:
+        # Texture set is not in the project anymore, the export reports it
+        return None
+    export_preset_name = get_export_preset_from_shader_type(export_job.shader_type)
+    return module_export_manifest.build_fingerprint(
+            root_path,
+            resolution,
+            export_preset_name,
+            export_job.shader_type,
+            project_stamp,
+            export_job.export_targets,
+            pruned_output_maps,
+            )
+
+
+def plan_incremental_export(export_jobs: List[ExportJob], pruned_output_maps: Optional[Dict[str, List[str]]] = None) -> IncrementalPlan:
+    """ Checks which texture sets are up to date with the manifest of their export path. """
+    project_stamp = get_project_stamp()
+    pruned_output_maps = pruned_output_maps or {}
+    manifests = {}
+    skipped_outcomes = {}
+    export_fingerprints = {}
+    for export_job in export_jobs:
+        if export_job.export_path not in manifests:
+            manifests[export_job.export_path] = module_export_manifest.load_manifest(export_job.export_path)
+        manifest = manifests[export_job.export_path]
+
+        fingerprint = build_export_fingerprint(export_job, project_stamp, pruned_output_maps.get(export_job.texture_set_name, ()))
+        if module_export_manifest.is_texture_set_dirty(manifest, export_job.texture_set_name, fingerprint):
+            export_fingerprints[export_job.texture_set_name] = fingerprint
+        else:
+            exported_files = [output["path"] for output in manifest[export_job.texture_set_name]["outputs"]]
+            skipped_outcomes[export_job.texture_set_name] = (True, "Texture set is up to date, export is skipped", exported_files)
+    return IncrementalPlan(skipped_outcomes, export_fingerprints)
+
+
+def filter_dirty_export_jobs(export_jobs: List[ExportJob], export_outcomes: Dict, incremental_plan: IncrementalPlan) -> List[ExportJob]:
+    """ Splits out texture sets which are skipped by the plan, they are reported as passed into export_outcomes. """
+    dirty_export_jobs = []
+    for export_job in export_jobs:
+        skipped_outcome = incremental_plan.skipped_outcomes.get(export_job.texture_set_name)
+        if skipped_outcome is None:
+            dirty_export_jobs.append(export_job)
+        else:
+            export_outcomes[export_job.texture_set_name] = skipped_outcome
+    return dirty_export_jobs
+
+
+def update_export_manifest(export_path, export_outcomes, export_fingerprints, texture_set_names):
+    manifest = module_export_manifest.load_manifest(export_path)
+    for texture_set_name in texture_set_names:
+        is_export_passed, _, exported_files = export_outcomes[texture_set_name]
+        if is_export_passed:
+            module_export_manifest.record_export(manifest, texture_set_name, export_fingerprints.get(texture_set_name), exported_files)
+    module_export_manifest.save_manifest(export_path, manifest)
+
+
+def estimate_export_bytes(export_job: ExportJob, pruned_output_maps: Sequence[str] = ()) -> int:
+    """ Uncompressed size of the maps exported by the job, pruned maps are not counted. """
+    _, resolution = get_texture_set_export_data(export_job.texture_set_name)
+    output_maps = [output_map for output_map in shader_type_output_maps.get(export_job.shader_type, []) if output_map not in pruned_output_maps]
+    return sum(
+            get_map_bytes(resolution, export_target, output_map)
+            for export_target in export_job.export_targets
+            for output_map in output_maps
+            )
+
+
+def estimate_pruned_bytes(export_jobs: List[ExportJob], pruned_output_maps: Dict[str, List[str]]) -> int:
+    """ Uncompressed size of the maps which are not exported thanks to the pruning. """
+    pruned_bytes = 0
+    for export_job in export_jobs:
+        texture_set_pruned_maps = pruned_output_maps.get(export_job.texture_set_name)
+        if texture_set_pruned_maps:
+            _, resolution = get_texture_set_export_data(export_job.texture_set_name)
+            pruned_bytes += sum(
+                    get_map_bytes(resolution, export_target, output_map)
+                    for export_target in export_job.export_targets
+                    for output_map in texture_set_pruned_maps
+                    )
+    return pruned_bytes
+
+
+def log_channel_pruning(export_jobs: List[ExportJob], pruned_output_maps: Dict[str, List[str]], export_seconds: float, exported_map_count: int):
+    """ Bake time of the pruned maps is estimated from the average time per map of the same run. """
+    pruned_map_count = sum(
+            len(pruned_output_maps.get(export_job.texture_set_name, ())) * len(export_job.export_targets)
+            for export_job in export_jobs
+            )
+    if not pruned_map_count:
         return
 
-    export_config = build_export_config(texture_set_name, shader_type, export_path)
+    pruned_texture_set_count = sum(1 for export_job in export_jobs if export_job.texture_set_name in pruned_output_maps)
+    pruned_bytes = estimate_pruned_bytes(export_jobs, pruned_output_maps)
+    saved_seconds = export_seconds / exported_map_count * pruned_map_count if exported_map_count else 0.0
+
+    module_instrumentation.count("pruned_maps", pruned_map_count)
+    module_instrumentation.count("pruned_bytes", pruned_bytes)
+    module_instrumentation.count("pruned_bake_ms", int(saved_seconds * 1000))
+    sp.logging.log(
+            sp.logging.INFO,
+            "CUSTOM EXPORTER",
+            f"Channel pruning: {pruned_map_count} empty map(s) of {pruned_texture_set_count} texture set(s) are not exported, \
+            ~{pruned_bytes / 2 ** 20:.1f} MB and ~{saved_seconds:.1f} s of bake time saved",
+            )
+
 
-    sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", "going to perform Texture Exporting")
-    export_result = sp.export.export_project_textures(export_config)
+def prepare_export_jobs(
+        export_jobs: List[ExportJob],
+        incremental_plan: Optional[IncrementalPlan] = None,
+        prune_channels: bool = False,
+        ) -> Tuple[bool, List[str], List[str]]:
+    """
+    Creates the export paths of the jobs and checks they are writable, the export fails if any of them is not,
+    or if a texture set has more than one job.
+    Free space is checked against the estimate of the jobs which will actually be exported, without the texture sets
+    skipped by the incremental plan and without the pruned maps. Shortage of free space is only a warning,
+    the estimate is an upper bound of what is written.
+    Returns (are_paths_ready, errors, warnings).
+    """
+    duplicate_texture_sets = get_duplicate_texture_sets(export_jobs)
+    if duplicate_texture_sets:
+        error = f"Texture sets could be exported only once per export: {', '.join(duplicate_texture_sets)}"
+        sp.logging.log(sp.logging.ERROR, "CUSTOM EXPORTER", error)
+        return False, [error], []
 
-    # In case of error, display a human readable message:
-    if export_result.status == sp.export.ExportStatus.Success:
-        open_exporter_at_given_path(export_path)
-    else:
-        sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", export_result.message)
+    pruned_output_maps = plan_channel_pruning(export_jobs) if prune_channels else {}
+    exported_jobs = export_jobs
+    if incremental_plan is not None:
+        # Outcomes of the skipped texture sets are reported by the export itself
+        exported_jobs = filter_dirty_export_jobs(export_jobs, {}, incremental_plan)
 
+    required_bytes = {export_job.export_path: 0 for export_job in export_jobs}
+    # Texture sets which are not in the project anymore are failed by the export itself
+    for export_job in resolve_export_jobs(exported_jobs, {}):
+        required_bytes[export_job.export_path] += estimate_export_bytes(export_job, pruned_output_maps.get(export_job.texture_set_name, ()))
+
+    are_paths_ready, errors, warnings = module_export_fs.prepare_export_paths(required_bytes.keys(), required_bytes)
+    for error in errors:
+        sp.logging.log(sp.logging.ERROR, "CUSTOM EXPORTER", error)
+    for warning in warnings:
+        sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", warning)
+    return are_paths_ready, errors, warnings
+
+
+def open_exporter_at_given_path(path):
+    module_export_fs.reveal_path(path)
+
+
+def log_exported_textures(export_result):
     # Display the details of what was exported:
     for k, v in export_result.textures.items():
         sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", f"Stack {k}:")
         for exported in v:
             sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", exported)
+
+
+def run_post_export_steps(export_result, post_export_steps):
+    for post_export_result in module_post_export.run_post_export(export_result, post_export_steps):
+        if post_export_result.is_processing_passed:
+            sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", f"Post-export {post_export_result.processor_name}: {post_export_result.source_path} -> {post_export_result.output_paths}")
+        else:
+            sp.logging.log(
+                    sp.logging.WARNING,
+                    "CUSTOM EXPORTER",
+                    f"Post-export {post_export_result.processor_name} has failed for {post_export_result.source_path}: {post_export_result.details}",
+                    )
+
+
+def detach_deduplicated_files(dedupe_store_path, export_path, texture_set_names):
+    """
+    Hardlinked files are detached before every export into an export root with a dedupe store,
+    also when the export itself is not deduplicated. Painter would otherwise overwrite every duplicate in place.
+    """
+    store_path = dedupe_store_path or module_export_dedupe.find_store_path(export_path)
+    if store_path is None:
+        return
+
+    try:
+        module_export_dedupe.detach_texture_sets(store_path, export_path, texture_set_names)
+    except OSError as error:
+        sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Deduplicated files could not be detached from {export_path}: {error}")
+
+
+def deduplicate_exported_files(export_result, dedupe_store_path):
+    try:
+        dedupe_report = module_export_dedupe.deduplicate_files(dedupe_store_path, module_post_export.iter_exported_files(export_result))
+    except OSError as error:
+        sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Exported files could not be deduplicated into {dedupe_store_path}: {error}")
+        return
+
+    module_instrumentation.count("reclaimed_bytes", dedupe_report.reclaimed_bytes)
+    sp.logging.log(
+            sp.logging.INFO,
+            "CUSTOM EXPORTER",
+            f"Deduplication: {dedupe_report.duplicate_files} of {dedupe_report.scanned_files} exported file(s) are duplicates, \
+            {dedupe_report.reclaimed_bytes} bytes reclaimed, {dedupe_report.recorded_bytes} bytes recorded in the dedupe manifest",
+            )
+
+
+def export_textures_batch(
+        export_jobs: List[ExportJob],
+        incremental: bool = False,
+        post_export_steps=None,
+        dedupe_store_path: Optional[str] = None,
+        packager=None,
+        prune_channels: bool = False,
+        preview_max_size: Optional[int] = None,
+        incremental_plan: Optional[IncrementalPlan] = None,
+        ) -> Dict[str, Tuple[bool, str, List[str]]]:
+    """
+    Exports all the given jobs with as few export_project_textures calls as possible.
+    With incremental export, texture sets unchanged since the last export are skipped,
+    according to the incremental plan when it is already done for the whole export, see plan_incremental_export.
+    Post-export steps (studio wide POST_EXPORT_STEPS by default) are run on the exported files.
+    With a dedupe store, duplicated exported files are replaced with hardlinks into the store.
+    With a packager (module_export_package.DeliveryPackager), exported files are packaged in the background,
+    together with the files of the texture sets skipped by the incremental export.
+    With channel pruning, maps whose channels are missing from the texture set stack are neither baked nor written.
+    With a preview max size, only the Default target is exported, downscaled, into the preview folder of the export path.
+    Previews are not meant to be incremental, deduplicated or packaged.
+    Returns export outcome for every texture set:
+    {texture_set_name: (is_export_passed, export_details, exported_files)}
+    Raises ValueError if a texture set has more than one job.
+    """
+    duplicate_texture_sets = get_duplicate_texture_sets(export_jobs)
+    if duplicate_texture_sets:
+        raise ValueError(f"Texture sets could be exported only once per batch: {', '.join(duplicate_texture_sets)}")
+
+    export_outcomes = {}
+    if not sp.project.is_open():
+        return export_outcomes
+
+    export_jobs = resolve_export_jobs(export_jobs, export_outcomes)
+    pruned_output_maps = {}
+    if prune_channels:
+        with module_instrumentation.span("channel_analysis", [export_job.texture_set_name for export_job in export_jobs]):
+            pruned_output_maps = plan_channel_pruning(export_jobs)
+
+    if incremental:
+        with module_instrumentation.span("incremental_check", [export_job.texture_set_name for export_job in export_jobs]):
+            if incremental_plan is None:
+                incremental_plan = plan_incremental_export(export_jobs, pruned_output_maps)
+            dirty_export_jobs = filter_dirty_export_jobs(export_jobs, export_outcomes, incremental_plan)
+            export_fingerprints = incremental_plan.export_fingerprints
+        sp.logging.log(
+                sp.logging.INFO,
+                "CUSTOM EXPORTER",
+                f"Incremental export: {len(dirty_export_jobs)} of {len(export_jobs)} texture set(s) need to be exported",
+                )
+        export_jobs = dirty_export_jobs
+
+        if packager is not None:
+            # Texture sets skipped as up to date are delivered with the outputs recorded in their manifests
+            skipped_outcomes = {texture_set_name: export_outcome for texture_set_name, export_outcome in export_outcomes.items() if export_outcome[0]}
+            with module_instrumentation.span("package_submit", list(skipped_outcomes)):
+                for texture_set_name, (_, _, exported_files) in skipped_outcomes.items():
+                    packager.add_files(texture_set_name, exported_files)
+
+    export_seconds = 0.0
+    exported_map_count = 0
+
+    if post_export_steps is None:
+        post_export_steps = module_post_export.POST_EXPORT_STEPS
+
+    if preview_max_size is not None:
+        export_jobs = [get_preview_export_job(export_job) for export_job in export_jobs]
+
+    for (export_preset_name, export_path), grouped_jobs in group_export_jobs(export_jobs).items():
+        texture_set_names = [export_job.texture_set_name for export_job in grouped_jobs]
+
+        if export_preset_name is None:
+            for texture_set_name in texture_set_names:
+                export_outcomes[texture_set_name] = (False, f"There is no export preset for the shader type {grouped_jobs[0].shader_type}", [])
+            continue
+
+        # Project could change while the previous groups are exported, a missing texture set does not fail the rest of the group
+        grouped_jobs = resolve_export_jobs(grouped_jobs, export_outcomes)
+        if not grouped_jobs:
+            continue
+        texture_set_names = [export_job.texture_set_name for export_job in grouped_jobs]
+
+        with module_instrumentation.span("build_config", texture_set_names):
+            texture_set_targets = {export_job.texture_set_name: export_job.export_targets for export_job in grouped_jobs}
+            export_config = build_batch_export_config(
+                    export_preset_name,
+                    export_path,
+                    texture_set_names,
+                    texture_set_targets,
+                    pruned_output_maps,
+                    preview_max_size,
+                    )
+
+        with module_instrumentation.span("dedupe_detach", texture_set_names):
+            detach_deduplicated_files(dedupe_store_path, export_path, texture_set_names)
+
+        sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", f"going to perform Texture Exporting for {len(texture_set_names)} texture set(s) to {export_path}")
+        try:
+            # Painter bakes and writes the files within the same call, they could not be timed separately
+            export_start = time.perf_counter()
+            with module_instrumentation.span("painter_export", texture_set_names, export_path=export_path):
+                module_instrumentation.count("painter_api_calls")
+                export_result = sp.export.export_project_textures(export_config)
+            export_seconds += time.perf_counter() - export_start
+        except Exception as error:  # Painter raises different error types for rejected export configs
+            sp.logging.log(sp.logging.ERROR, "CUSTOM EXPORTER", f"Export to {export_path} has failed: {error}")
+            for texture_set_name in texture_set_names:
+                export_outcomes[texture_set_name] = (False, str(error), [])
+            continue
+
+        # Split exported files back per texture set. Keys are (texture set name, stack name)
+        exported_files = {texture_set_name: [] for texture_set_name in texture_set_names}
+        for (texture_set_name, _), files in export_result.textures.items():
+            exported_files.setdefault(texture_set_name, []).extend(files)
+            exported_map_count += len(files)
+
+        if module_instrumentation.is_recording():
+            with module_instrumentation.span("collect_results", texture_set_names) as span_attributes:
+                span_attributes["bytes_written"] = {
+                        texture_set_name: sum(os.path.getsize(file) for file in files if os.path.exists(file))
+                        for texture_set_name, files in exported_files.items()
+                        }
+                module_instrumentation.count("bytes_written", sum(span_attributes["bytes_written"].values()))
+
+        # In case of error, display a human readable message:
+        is_export_passed = export_result.status == sp.export.ExportStatus.Success
+        if is_export_passed:
+            export_details = "Export is done!"
+        else:
+            export_details = export_result.message
+            sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", export_result.message)
+
+        log_exported_textures(export_result)
+
+        if is_export_passed and post_export_steps:
+            with module_instrumentation.span("post_export", texture_set_names):
+                run_post_export_steps(export_result, post_export_steps)
+
+        if is_export_passed and dedupe_store_path is not None:
+            with module_instrumentation.span("dedupe", texture_set_names):
+                deduplicate_exported_files(export_result, dedupe_store_path)
+
+        if is_export_passed and packager is not None:
+            with module_instrumentation.span("package_submit", texture_set_names):
+                packager.add_export_result(export_result)
+
+        for texture_set_name in texture_set_names:
+            export_outcomes[texture_set_name] = (is_export_passed, export_details, exported_files[texture_set_name])
+
+        if incremental and is_export_passed:
+            with module_instrumentation.span("manifest", texture_set_names):
+                update_export_manifest(export_path, export_outcomes, export_fingerprints, texture_set_names)
+
+    if pruned_output_maps and export_jobs:
+        log_channel_pruning(export_jobs, pruned_output_maps, export_seconds, exported_map_count)
+
+    return export_outcomes
+
+
+def build_farm_job_specs(export_jobs: List[ExportJob], project_path) -> List[Dict]:
+    """
+    Job specs for module_export_farm, one per texture set.
+    Every spec carries the export config built here, so the farm workers only have to run it.
+    """
+    job_specs = []
+    for export_job in export_jobs:
+        export_preset_name = get_export_preset_from_shader_type(export_job.shader_type)
+        if export_preset_name is None:
+            continue
+
+        try:
+            _, resolution = get_texture_set_export_data(export_job.texture_set_name)
+        except KeyError:
+            sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Texture set {export_job.texture_set_name} is not in the project anymore, no farm job is written")
+            continue
+        export_config = build_batch_export_config(
+                export_preset_name,
+                export_job.export_path,
+                [export_job.texture_set_name],
+                {export_job.texture_set_name: export_job.export_targets},
+                )
+        job_specs.append({
+            "job_id": f"{os.path.basename(project_path)}/{export_job.texture_set_name}",
+            "project_path": project_path,
+            "texture_set_name": export_job.texture_set_name,
+            "shader_type": export_job.shader_type,
+            "export_preset": export_config["defaultExportPreset"],
+            "export_path": export_job.export_path,
+            "size_log2": resolution,
+            "export_targets": list(export_job.export_targets),
+            "export_config": export_config,
+            })
+    return job_specs
+
+
+def export_farm_job(job_spec: Dict, post_export_steps=None) -> Dict:
+    """
+    Runs a job spec of build_farm_job_specs inside of a farm worker Painter.
+    The project of the job is opened unless it is already open.
+    Returns the job result sent back to the farm coordinator.
+    """
+    project_path = job_spec["project_path"]
+    if not sp.project.is_open() or sp.project.file_path() != project_path:
+        if sp.project.is_open():
+            sp.project.close()
+        sp.project.open(project_path)
+
+    detach_deduplicated_files(None, job_spec["export_path"], [job_spec["texture_set_name"]])
+    try:
+        export_result = sp.export.export_project_textures(job_spec["export_config"])
+    except Exception as error:  # Painter raises different error types for rejected export configs
+        return {"job_id": job_spec["job_id"], "status": "failed", "details": str(error), "exported_files": []}
+
+    exported_files = [file for files in export_result.textures.values() for file in files]
+    if export_result.status != sp.export.ExportStatus.Success:
+        return {"job_id": job_spec["job_id"], "status": "failed", "details": export_result.message, "exported_files": exported_files}
+
+    if post_export_steps is None:
+        post_export_steps = module_post_export.POST_EXPORT_STEPS
+    if post_export_steps:
+        run_post_export_steps(export_result, post_export_steps)
+    return {"job_id": job_spec["job_id"], "status": "done", "details": "Export is done!", "exported_files": exported_files}
+
+
+def export_textures(texture_set_name, shader_type, export_path):
+    return export_textures_batch([ExportJob(texture_set_name, shader_type, export_path)]).get(texture_set_name)
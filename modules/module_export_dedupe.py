@@ -0,0 +1,224 @@
+"""
+    Module to deduplicate exported textures with a content-addressed store.
+
+    Different texture sets and presets are often writing byte-identical maps, e.g. flat normal maps,
+    blank opacity or default AO. After the export, written files are streamed through a chunked hash,
+    and every unique content is kept once in the store under the export root:
+        <store>/<hash[:2]>/<hash>
+    A duplicate file is replaced with a hardlink to its store object. When hardlinks are not supported
+    by the file system, e.g. some network shares, duplicates are only recorded in the dedupe manifest
+    of the store, together with the file they are duplicating.
+
+    Hardlinked files are sharing their content, so deduplicated files of texture sets which are about
+    to be exported again are detached (removed) before the export, Painter could otherwise overwrite
+    the shared content of every duplicate in place. Files are detached before every export into an export root
+    with a store, whether the new export is deduplicated or not, see find_store_path.
+
+    The module does not depend on Painter.
+
+    Content:
+        - DedupeReport
+        - get_store_path
+        - find_store_path
+        - detach_texture_sets
+        - deduplicate_files
+        - prune_store
+"""
+
+import concurrent.futures
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import module_export_manifest
+
+DEDUPE_STORE_FOLDER_NAME = "_custom_exporter_store"
+DEDUPE_MANIFEST_FILE_NAME = "dedupe_manifest.json"
+DEDUPE_MANIFEST_VERSION = 1
+# Hashing is I/O bound, hashlib releases the GIL while hashing the chunks
+HASH_WORKERS = 4
+
+
+class DedupeReport(NamedTuple):
+    scanned_files: int
+    scanned_bytes: int
+    duplicate_files: int
+    # bytes freed by replacing duplicates with hardlinks
+    reclaimed_bytes: int
+    # bytes of duplicates which could only be recorded in the dedupe manifest
+    recorded_bytes: int
+
+
+def get_store_path(root_path: str) -> str:
+    return os.path.join(root_path, DEDUPE_STORE_FOLDER_NAME)
+
+
+def find_store_path(export_path: str) -> Optional[str]:
+    """ Store of the export root the export path is in, None if none of its parent folders has a store. """
+    folder_path = os.path.abspath(export_path)
+    while True:
+        store_path = get_store_path(folder_path)
+        if os.path.exists(os.path.join(store_path, DEDUPE_MANIFEST_FILE_NAME)):
+            return store_path
+
+        parent_path = os.path.dirname(folder_path)
+        if parent_path == folder_path:
+            return None
+        folder_path = parent_path
+
+
+def get_store_object_path(store_path: str, content_hash: str) -> str:
+    return os.path.join(store_path, content_hash[:2], content_hash)
+
+
+def load_dedupe_manifest(store_path: str) -> Dict:
+    try:
+        with open(os.path.join(store_path, DEDUPE_MANIFEST_FILE_NAME), "r") as file:
+            dedupe_manifest = json.load(file)
+    except (OSError, ValueError):
+        dedupe_manifest = {}
+
+    if dedupe_manifest.get("version") != DEDUPE_MANIFEST_VERSION:
+        dedupe_manifest = {"version": DEDUPE_MANIFEST_VERSION, "objects": {}, "files": {}}
+    return dedupe_manifest
+
+
+def save_dedupe_manifest(store_path: str, dedupe_manifest: Dict):
+    manifest_path = os.path.join(store_path, DEDUPE_MANIFEST_FILE_NAME)
+    temp_manifest_path = f"{manifest_path}.tmp"
+    with open(temp_manifest_path, "w") as file:
+        json.dump(dedupe_manifest, file, indent=4, sort_keys=True)
+    os.replace(temp_manifest_path, manifest_path)
+
+
+def detach_texture_sets(store_path: str, export_path: str, texture_set_names: Iterable[str]):
+    """ Removes deduplicated files of the texture sets from the export path and its sub folders, before they are exported again. """
+    dedupe_manifest = load_dedupe_manifest(store_path)
+    texture_set_names = set(texture_set_names)
+    export_path = os.path.normpath(os.path.abspath(export_path))
+
+    detached_files = [
+            file_path for file_path, file_entry in dedupe_manifest["files"].items()
+            if file_entry["texture_set"] in texture_set_names and is_in_folder(file_path, export_path)
+            ]
+    if not detached_files:
+        return
+
+    for file_path in detached_files:
+        if dedupe_manifest["files"].pop(file_path)["is_linked"]:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+    save_dedupe_manifest(store_path, dedupe_manifest)
+
+
+def is_in_folder(file_path: str, folder_path: str) -> bool:
+    try:
+        return os.path.commonpath([os.path.abspath(file_path), folder_path]) == folder_path
+    except ValueError:
+        # Paths on different drives
+        return False
+
+
+def link_duplicate(store_object_path: str, file_path: str):
+    """ Replaces the file with a hardlink to the store object, the file is never missing in between. """
+    temp_file_path = f"{file_path}.dedupe"
+    os.link(store_object_path, temp_file_path)
+    try:
+        os.replace(temp_file_path, file_path)
+    except OSError:
+        os.remove(temp_file_path)
+        raise
+
+
+def hash_exported_file(file_path: str) -> Tuple[str, int, str]:
+    return file_path, os.path.getsize(file_path), module_export_manifest.hash_file(file_path)
+
+
+def deduplicate_files(store_path: str, exported_files: Iterable[Tuple[str, str]]) -> DedupeReport:
+    """ exported_files: (texture_set_name, file_path) pairs, hashed as they are streamed in. """
+    os.makedirs(store_path, exist_ok=True)
+    dedupe_manifest = load_dedupe_manifest(store_path)
+    objects = dedupe_manifest["objects"]
+
+    texture_set_by_file = {}
+    file_paths = []
+    for texture_set_name, file_path in exported_files:
+        file_path = os.path.normpath(file_path)
+        if os.path.exists(file_path) and file_path not in texture_set_by_file:
+            texture_set_by_file[file_path] = texture_set_name
+            file_paths.append(file_path)
+
+    scanned_bytes = 0
+    duplicate_files = 0
+    reclaimed_bytes = 0
+    recorded_bytes = 0
+    with concurrent.futures.ThreadPoolExecutor(HASH_WORKERS) as executor:
+        for file_path, file_size, content_hash in executor.map(hash_exported_file, file_paths):
+            scanned_bytes += file_size
+            store_object_path = get_store_object_path(store_path, content_hash)
+            file_entry = {"hash": content_hash, "texture_set": texture_set_by_file[file_path], "is_linked": False}
+            dedupe_manifest["files"][file_path] = file_entry
+
+            store_object = objects.get(content_hash)
+            if store_object is None:
+                # First occurrence of the content becomes the store object
+                store_object = objects[content_hash] = {"size": file_size, "source": file_path, "is_stored": False}
+                try:
+                    os.makedirs(os.path.dirname(store_object_path), exist_ok=True)
+                    os.link(file_path, store_object_path)
+                except FileExistsError:
+                    store_object["is_stored"] = True
+                except OSError:
+                    continue
+                else:
+                    store_object["is_stored"] = True
+                    file_entry["is_linked"] = True
+                    continue
+
+            if store_object["is_stored"] and os.path.exists(store_object_path):
+                if os.path.samefile(store_object_path, file_path):
+                    file_entry["is_linked"] = True
+                    continue
+                duplicate_files += 1
+                try:
+                    link_duplicate(store_object_path, file_path)
+                except OSError:
+                    file_entry["duplicate_of"] = store_object["source"]
+                    recorded_bytes += file_size
+                else:
+                    file_entry["is_linked"] = True
+                    reclaimed_bytes += file_size
+            elif store_object["source"] != file_path and os.path.exists(store_object["source"]):
+                duplicate_files += 1
+                file_entry["duplicate_of"] = store_object["source"]
+                recorded_bytes += file_size
+            else:
+                # Source of the recorded content is gone, the file takes its place
+                store_object["source"] = file_path
+
+    save_dedupe_manifest(store_path, dedupe_manifest)
+    return DedupeReport(len(file_paths), scanned_bytes, duplicate_files, reclaimed_bytes, recorded_bytes)
+
+
+def prune_store(store_path: str) -> List[str]:
+    """ Removes store objects which are not linked from any exported file anymore. """
+    dedupe_manifest = load_dedupe_manifest(store_path)
+    pruned_hashes = []
+    for content_hash, store_object in list(dedupe_manifest["objects"].items()):
+        store_object_path = get_store_object_path(store_path, content_hash)
+        try:
+            is_orphaned = os.stat(store_object_path).st_nlink <= 1 if store_object["is_stored"] else not os.path.exists(store_object["source"])
+        except FileNotFoundError:
+            is_orphaned = True
+
+        if is_orphaned:
+            if store_object["is_stored"] and os.path.exists(store_object_path):
+                os.remove(store_object_path)
+            del dedupe_manifest["objects"][content_hash]
+            pruned_hashes.append(content_hash)
+
+    if pruned_hashes:
+        save_dedupe_manifest(store_path, dedupe_manifest)
+    return pruned_hashes
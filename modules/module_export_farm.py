@@ -0,0 +1,249 @@
+"""
+    Distributed export farm: spreads texture set exports across several headless Painter workers.
+
+    Job specs are written from the Custom Exporter table (see module_export.build_farm_job_specs),
+    one JSON Lines record per texture set, with the export config the worker has to run:
+        {"job_id": "props_01.spp/PROP_CHR_S_01", "project_path": "...", "texture_set_name": "PROP_CHR_S_01",
+         "shader_type": "Basic", "export_preset": "resource://...", "export_path": "...", "size_log2": [10, 10],
+         "export_targets": ["Default"], "export_config": {...}}
+
+    The coordinator keeps N long-living worker processes, every worker loads a project once
+    and exports the jobs it is handed one by one. Worker protocol is JSON Lines over stdin/stdout:
+    a job spec is written to the worker, and the worker answers with a result record
+        {"job_id": "...", "status": "done" | "failed", "details": "...", "exported_files": [...]}
+    Other lines printed by the worker are ignored. Inside Painter the result is produced by module_export.export_farm_job.
+    On a farm node, the worker is module_export_farm_worker, which starts Painter with remote scripting enabled
+    and runs export_farm_job in it for every job spec.
+
+    Failed jobs are retried, and a crashed or hung worker is restarted.
+    Every attempt is appended to a results journal, so after a coordinator crash the farm
+    could be resumed with the same journal: jobs which are already done are not exported again.
+
+    The module does not depend on Painter.
+
+    Usage:
+        python module_export_farm.py jobs.jsonl --journal journal.jsonl --workers 1 --worker-command "python module_export_farm_worker.py --painter-command '<painter executable>'"
+
+    Content:
+        - read_job_specs
+        - write_job_specs
+        - read_journal
+        - FarmWorker
+        - run_farm
+        - main
+"""
+
+import argparse
+import collections
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+DONE = "done"
+FAILED = "failed"
+
+
+def read_job_specs(job_specs_path: str) -> List[Dict]:
+    with open(job_specs_path, "r") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def write_job_specs(job_specs_path: str, job_specs: List[Dict]):
+    os.makedirs(os.path.dirname(job_specs_path) or ".", exist_ok=True)
+    with open(job_specs_path, "w") as file:
+        for job_spec in job_specs:
+            file.write(json.dumps(job_spec) + "\n")
+
+
+def read_journal(journal_path: str) -> Dict[str, Dict]:
+    """ Last journal record of every job. Truncated line left by a crash is ignored. """
+    journal = {}
+    if not os.path.exists(journal_path):
+        return journal
+
+    with open(journal_path, "r") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            journal[record["job_id"]] = record
+    return journal
+
+
+def append_journal_record(journal_file, record: Dict):
+    journal_file.write(json.dumps(record) + "\n")
+    journal_file.flush()
+    os.fsync(journal_file.fileno())
+
+
+class FarmWorker:
+    def __init__(self, worker_command: List[str]):
+        self.worker_command = worker_command
+        self.process = None
+
+    def start(self):
+        self.process = subprocess.Popen(
+                self.worker_command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+                bufsize=1,
+                )
+
+    def stop(self):
+        if self.process is None:
+            return
+
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def run_job(self, job_spec: Dict, timeout: Optional[float] = None) -> Dict:
+        """ Worker is killed when the job is not done within the timeout, it is restarted by the next job. """
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+
+        process = self.process
+        watchdog = None
+        if timeout is not None:
+            watchdog = threading.Timer(timeout, process.kill)
+            watchdog.start()
+
+        result = None
+        try:
+            process.stdin.write(json.dumps(job_spec) + "\n")
+            process.stdin.flush()
+            for line in process.stdout:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get("job_id") == job_spec["job_id"]:
+                    result = record
+                    break
+        except OSError:
+            pass
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+
+        if result is None:
+            self.stop()
+            return {"job_id": job_spec["job_id"], "status": FAILED, "details": "Worker has exited without a result", "exported_files": []}
+        return result
+
+
+def run_farm(
+        job_specs: List[Dict],
+        journal_path: str,
+        worker_command: List[str],
+        worker_count: int = 4,
+        max_attempts: int = 3,
+        timeout: Optional[float] = None,
+        resume: bool = True,
+        ) -> Dict[str, Dict]:
+    """
+    Exports all the job specs across worker_count workers, failed jobs are tried up to max_attempts times.
+    With resume, jobs already done according to the journal are skipped.
+    Returns the final journal record of every job.
+    """
+    final_records = {}
+    journal = read_journal(journal_path) if resume else {}
+    pending_jobs = collections.deque()
+    for job_spec in job_specs:
+        record = journal.get(job_spec["job_id"])
+        if record is not None and record["status"] == DONE:
+            final_records[job_spec["job_id"]] = record
+        else:
+            pending_jobs.append((job_spec, 0))
+
+    lock = threading.Lock()
+    os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+    with open(journal_path, "a") as journal_file:
+
+        def run_worker_loop():
+            worker = FarmWorker(worker_command)
+            try:
+                while True:
+                    with lock:
+                        if not pending_jobs:
+                            return
+                        job_spec, attempts = pending_jobs.popleft()
+
+                    start = time.perf_counter()
+                    result = worker.run_job(job_spec, timeout)
+                    record = {
+                            "job_id": job_spec["job_id"],
+                            "texture_set_name": job_spec.get("texture_set_name"),
+                            "attempt": attempts + 1,
+                            "status": result.get("status", FAILED),
+                            "details": result.get("details", ""),
+                            "exported_files": result.get("exported_files", []),
+                            "duration": time.perf_counter() - start,
+                            "finished_at": time.time(),
+                            }
+
+                    with lock:
+                        append_journal_record(journal_file, record)
+                        if record["status"] != DONE and record["attempt"] < max_attempts:
+                            pending_jobs.append((job_spec, record["attempt"]))
+                        else:
+                            final_records[job_spec["job_id"]] = record
+            finally:
+                worker.stop()
+
+        threads = [threading.Thread(target=run_worker_loop, daemon=True) for _ in range(min(worker_count, len(pending_jobs)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return final_records
+
+
+def parse_arguments(argv: Optional[List[str]]):
+    parser = argparse.ArgumentParser(description="Export texture set job specs across several headless Painter workers.")
+    parser.add_argument("job_specs", help="JSON Lines file with the job specs written by the Custom Exporter")
+    parser.add_argument("--journal", help="results journal, the job specs file with the .journal.jsonl extension by default")
+    parser.add_argument("--worker-command", required=True, help="command starting a worker, which reads job specs from stdin")
+    parser.add_argument("--workers", type=int, default=4, help="number of worker processes")
+    parser.add_argument("--max-attempts", type=int, default=3, help="number of attempts of a failing job")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds after which a job is failed and its worker is restarted")
+    parser.add_argument("--restart", action="store_true", help="export all the jobs again, ignoring the journal")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    journal_path = arguments.journal or f"{os.path.splitext(arguments.job_specs)[0]}.journal.jsonl"
+    job_specs = read_job_specs(arguments.job_specs)
+
+    final_records = run_farm(
+            job_specs,
+            journal_path,
+            shlex.split(arguments.worker_command),
+            worker_count=arguments.workers,
+            max_attempts=arguments.max_attempts,
+            timeout=arguments.timeout,
+            resume=not arguments.restart,
+            )
+
+    failed_records = [record for record in final_records.values() if record["status"] != DONE]
+    for record in failed_records:
+        sys.stderr.write(f"{record['job_id']} has failed after {record['attempt']} attempt(s): {record['details']}\n")
+    sys.stdout.write(f"{len(final_records) - len(failed_records)} of {len(job_specs)} job(s) are done, journal: {journal_path}\n")
+    return 1 if failed_records else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+    Export farm worker: the --worker-command of module_export_farm on a farm node with Substance Painter.
+
+    The worker starts Painter with remote scripting enabled and bridges the farm protocol to it:
+    job specs are read from stdin as JSON Lines, every job is sent to Painter as a Python script
+    over the remote scripting API (POST /run.json on localhost), and the script runs
+    module_export.export_farm_job inside Painter. Remote scripting does not return the values of Python scripts,
+    so the script writes the job result into a temporary file which the worker prints back to stdout.
+
+    Painter is started once and keeps the project open between the jobs of the same project.
+    When Painter exits or stops answering, the worker exits as well and the coordinator starts a new one.
+    Remote scripting listens on a single port, so every worker of a node needs its own port,
+    or one worker is run per farm node.
+
+    The module does not depend on Painter.
+
+    Usage:
+        python module_export_farm.py jobs.jsonl --workers 1 --worker-command "python module_export_farm_worker.py --painter-command '<painter executable>'"
+
+    Content:
+        - PainterRemote
+        - build_job_script
+        - run_job
+        - main
+"""
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+DEFAULT_REMOTE_SCRIPTING_PORT = 60041
+# Painter startup, including the plugins and the license check
+DEFAULT_STARTUP_TIMEOUT = 600
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class PainterRemote:
+    def __init__(self, painter_command: Optional[List[str]], port: int = DEFAULT_REMOTE_SCRIPTING_PORT):
+        """ painter_command: command starting Painter, None to connect to a Painter which is already running. """
+        self.painter_command = painter_command
+        self.url = f"http://localhost:{port}/run.json"
+        self.process = None
+
+    def start(self, startup_timeout: float = DEFAULT_STARTUP_TIMEOUT):
+        """ Raises RuntimeError if Painter exits or does not answer within the timeout. """
+        if self.painter_command is not None:
+            self.process = subprocess.Popen(self.painter_command + ["--enable-remote-scripting"], stdout=subprocess.DEVNULL)
+
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                self.run_script("pass", timeout=10)
+                return
+            except OSError as error:
+                if not self.is_alive():
+                    raise RuntimeError(f"Painter has exited during the startup: {error}")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Painter remote scripting is not answering at {self.url}: {error}")
+                time.sleep(1)
+
+    def stop(self):
+        if self.process is None:
+            return
+
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def is_alive(self) -> bool:
+        return self.process is None or self.process.poll() is None
+
+    def run_script(self, script: str, timeout: Optional[float] = None) -> str:
+        """ Runs Python script in Painter. Raises HTTPError if the script has failed, OSError if Painter could not be reached. """
+        request = urllib.request.Request(
+                self.url,
+                data=json.dumps({"python": script}).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read().decode("utf-8", errors="replace")
+
+
+def build_job_script(job_spec_path: str, result_path: str, modules_dir: str = MODULES_DIR) -> str:
+    """ Script run inside Painter, any failure of the export is written into the result file. """
+    return "\n".join([
+        "import json",
+        "import sys",
+        f"if {modules_dir!r} not in sys.path:",
+        f"    sys.path.insert(0, {modules_dir!r})",
+        "import module_export",
+        f"with open({job_spec_path!r}, 'r') as file:",
+        "    job_spec = json.load(file)",
+        "try:",
+        "    result = module_export.export_farm_job(job_spec)",
+        "except Exception as error:",
+        "    result = {'job_id': job_spec['job_id'], 'status': 'failed', 'details': repr(error), 'exported_files': []}",
+        f"with open({result_path!r}, 'w') as file:",
+        "    json.dump(result, file)",
+        ])
+
+
+def run_job(painter_remote: PainterRemote, job_spec: Dict, timeout: Optional[float] = None) -> Optional[Dict]:
+    """ Job result, None if Painter could not run the job script at all. """
+    with tempfile.TemporaryDirectory(prefix="custom_exporter_farm_") as temp_dir:
+        job_spec_path = os.path.join(temp_dir, "job_spec.json")
+        result_path = os.path.join(temp_dir, "result.json")
+        with open(job_spec_path, "w") as file:
+            json.dump(job_spec, file)
+
+        try:
+            response = painter_remote.run_script(build_job_script(job_spec_path, result_path), timeout)
+        except urllib.error.HTTPError as error:
+            # Painter has answered with the error of the script
+            response = error.read().decode("utf-8", errors="replace")
+        except OSError as error:
+            sys.stderr.write(f"Painter could not run {job_spec['job_id']}: {error}\n")
+            return None
+
+        try:
+            with open(result_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            # Script has failed before the export, e.g. the modules could not be imported
+            return {"job_id": job_spec["job_id"], "status": "failed", "details": f"Job script has failed: {response}", "exported_files": []}
+
+
+def parse_arguments(argv: Optional[List[str]]):
+    parser = argparse.ArgumentParser(description="Export farm worker running the job specs in Substance Painter over remote scripting.")
+    parser.add_argument("--painter-command", help="command starting Painter, --enable-remote-scripting is added to it")
+    parser.add_argument("--connect", action="store_true", help="use a Painter which is already running with remote scripting")
+    parser.add_argument("--port", type=int, default=DEFAULT_REMOTE_SCRIPTING_PORT, help="remote scripting port of Painter")
+    parser.add_argument("--startup-timeout", type=float, default=DEFAULT_STARTUP_TIMEOUT, help="seconds to wait for Painter to start")
+    parser.add_argument("--job-timeout", type=float, default=None, help="seconds after which Painter is considered hung")
+    arguments = parser.parse_args(argv)
+    if arguments.painter_command is None and not arguments.connect:
+        parser.error("either --painter-command or --connect is required")
+    return arguments
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    painter_command = None if arguments.connect else shlex.split(arguments.painter_command)
+    painter_remote = PainterRemote(painter_command, arguments.port)
+    try:
+        try:
+            painter_remote.start(arguments.startup_timeout)
+        except RuntimeError as error:
+            sys.stderr.write(f"{error}\n")
+            return 1
+
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            job_spec = json.loads(line)
+            result = run_job(painter_remote, job_spec, arguments.job_timeout)
+            if result is None:
+                # Coordinator fails the job and starts a new worker with a new Painter
+                return 1
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        painter_remote.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
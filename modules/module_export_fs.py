@@ -0,0 +1,158 @@
+"""
+    Module with the file system side of the export: preparation of the export paths and reveal of the results.
+
+    Before an export starts, all its export paths are created and checked for writability concurrently,
+    so a broken export root fails the whole export before anything is baked. The free space of every disk
+    they are on is checked against the estimated size of the export, a disk short of space is only a warning,
+    as the estimate is an upper bound of what is written.
+
+    Files replaced by a later export, e.g. previews of the progressive export, are removed with their emptied folders.
+
+    Reveal opens a single file browser window on the common folder of the exported files,
+    with the file browser of the platform (Explorer, Finder, or xdg-open on Linux), without waiting for it.
+
+    The module does not depend on Painter.
+
+    Content:
+        - PathCheck
+        - prepare_export_paths
+        - remove_files
+        - get_reveal_path
+        - reveal_path
+"""
+
+import concurrent.futures
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Export paths are mostly on network shares, where the checks are waiting on the I/O
+PREPARE_WORKERS = 8
+# Free space left on a disk after the export
+MIN_FREE_BYTES = 512 * 1024 * 1024
+
+
+class PathCheck(NamedTuple):
+    path: str
+    is_ready: bool
+    details: str
+    device: Optional[int]
+
+
+def check_export_path(export_path: str) -> PathCheck:
+    """ Writability is checked with a real file, os.access is not reliable on Windows and network shares. """
+    try:
+        os.makedirs(export_path, exist_ok=True)
+        with tempfile.TemporaryFile(dir=export_path):
+            pass
+        device = os.stat(export_path).st_dev
+    except OSError as error:
+        return PathCheck(export_path, False, f"Export path {export_path} is not writable: {error}", None)
+    return PathCheck(export_path, True, "Export path is ready", device)
+
+
+def check_free_space(path_checks: List[PathCheck], required_bytes: Dict[str, int], min_free_bytes: int) -> List[str]:
+    """ Export paths on the same disk are sharing its free space. Returns the warnings of the disks short of space. """
+    paths_by_device = {}
+    for path_check in path_checks:
+        paths_by_device.setdefault(path_check.device, []).append(path_check.path)
+
+    warnings = []
+    for paths in paths_by_device.values():
+        disk_required_bytes = sum(required_bytes.get(path, 0) for path in paths) + min_free_bytes
+        free_bytes = get_free_bytes(paths[0])
+        if free_bytes is not None and free_bytes < disk_required_bytes:
+            warnings.append(
+                    f"There may not be enough free space for the export to {', '.join(sorted(paths))}: \
+                    {free_bytes // 2 ** 20} MB free, up to {disk_required_bytes // 2 ** 20} MB estimated",
+                    )
+    return warnings
+
+
+def get_free_bytes(path: str) -> Optional[int]:
+    try:
+        return shutil.disk_usage(path).free
+    except OSError:
+        return None
+
+
+def prepare_export_paths(
+        export_paths: Iterable[str],
+        required_bytes: Optional[Dict[str, int]] = None,
+        min_free_bytes: int = MIN_FREE_BYTES,
+        ) -> Tuple[bool, List[str], List[str]]:
+    """
+    Creates and checks all the export paths, stops at the first broken path.
+    required_bytes: estimated size of the export per export path, checked against the free space of the disks.
+    Returns (are_paths_ready, errors, warnings).
+    """
+    export_paths = sorted(set(export_paths))
+    path_checks = []
+    errors = []
+    executor = concurrent.futures.ThreadPoolExecutor(PREPARE_WORKERS)
+    futures = [executor.submit(check_export_path, export_path) for export_path in export_paths]
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            path_check = future.result()
+            if not path_check.is_ready:
+                errors.append(path_check.details)
+                break
+            path_checks.append(path_check)
+    finally:
+        # Checks which didn't start yet are dropped as soon as a path is broken
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+    if errors:
+        return False, errors, []
+
+    warnings = check_free_space(path_checks, required_bytes or {}, min_free_bytes)
+    return True, [], warnings
+
+
+def remove_files(file_paths: Iterable[str]) -> List[str]:
+    """ Removes the files and their folders left empty. Returns the errors, files which are already gone are not errors. """
+    errors = []
+    folders = set()
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            errors.append(f"File {file_path} could not be removed: {error}")
+        folders.add(os.path.dirname(file_path))
+
+    for folder in folders:
+        try:
+            os.rmdir(folder)
+        except OSError:
+            # Folder still holds other files
+            pass
+    return errors
+
+
+def get_reveal_path(exported_files: Iterable[str]) -> Optional[str]:
+    """ Deepest folder holding all the exported files. """
+    folders = {os.path.dirname(os.path.abspath(exported_file)) for exported_file in exported_files}
+    if not folders:
+        return None
+
+    try:
+        return os.path.commonpath(list(folders))
+    except ValueError:
+        # Files on different drives, the first folder is revealed
+        return sorted(folders)[0]
+
+
+def reveal_path(path: str):
+    if sys.platform == "win32":
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
@@ -0,0 +1,128 @@
+"""
+    Module to keep track of what was already exported into an export path.
+
+    Every export path holds a manifest file with a fingerprint per texture set:
+    stack identity, resolution, preset, shader type, export targets, pruned output maps, project save stamp
+    and the hashes of the files written by the last export.
+    Texture set is considered dirty (needs to be re-exported) when its fingerprint
+    is changed, or one of the exported files is missing or modified on disk.
+
+    Content:
+        - hash_file
+        - build_fingerprint
+        - load_manifest
+        - save_manifest
+        - is_texture_set_dirty
+        - record_export
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+MANIFEST_FILE_NAME = ".custom_exporter_manifest.json"
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """ Hashes the file in chunks, so big textures are never loaded in memory at once. """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def build_fingerprint(
+        stack_id: str,
+        resolution: List[float],
+        export_preset_name: str,
+        shader_type: str,
+        project_stamp: Optional[float],
+        export_targets: Sequence[str] = (),
+        pruned_output_maps: Sequence[str] = (),
+        ) -> Dict:
+    fingerprint = {
+            "stack": stack_id,
+            "resolution": list(resolution),
+            "preset": export_preset_name,
+            "shader_type": shader_type,
+            "project_stamp": project_stamp,
+            "targets": sorted(export_targets),
+            }
+    # Recorded only when maps are pruned, fingerprints of full exports are kept as they were
+    if pruned_output_maps:
+        fingerprint["pruned"] = sorted(pruned_output_maps)
+    return fingerprint
+
+
+def get_manifest_path(export_path: str) -> str:
+    return os.path.join(export_path, MANIFEST_FILE_NAME)
+
+
+def load_manifest(export_path: str) -> Dict:
+    manifest_path = get_manifest_path(export_path)
+    try:
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("texture_sets", {})
+
+
+def save_manifest(export_path: str, manifest: Dict):
+    manifest_path = get_manifest_path(export_path)
+    temp_manifest_path = f"{manifest_path}.tmp"
+    with open(temp_manifest_path, "w") as file:
+        json.dump({"version": MANIFEST_VERSION, "texture_sets": manifest}, file, indent=4, sort_keys=True)
+    os.replace(temp_manifest_path, manifest_path)
+
+
+def is_output_modified(output: Dict) -> bool:
+    """ Cheap size and mtime check first, content hash is only computed when the stat is changed. """
+    try:
+        stat = os.stat(output["path"])
+    except OSError:
+        return True
+
+    if stat.st_size == output["size"] and stat.st_mtime == output["mtime"]:
+        return False
+    return hash_file(output["path"]) != output["hash"]
+
+
+def is_texture_set_dirty(manifest: Dict, texture_set_name: str, fingerprint: Optional[Dict]) -> bool:
+    """ Fingerprint is None when it can't be trusted, e.g. project has unsaved changes. """
+    if fingerprint is None:
+        return True
+
+    manifest_entry = manifest.get(texture_set_name)
+    if manifest_entry is None or manifest_entry["fingerprint"] != fingerprint:
+        return True
+
+    if not manifest_entry["outputs"]:
+        return True
+
+    return any(is_output_modified(output) for output in manifest_entry["outputs"])
+
+
+def record_export(manifest: Dict, texture_set_name: str, fingerprint: Optional[Dict], exported_files: List[str]):
+    if fingerprint is None:
+        manifest.pop(texture_set_name, None)
+        return
+
+    outputs = []
+    for exported_file in exported_files:
+        stat = os.stat(exported_file)
+        outputs.append({
+            "path": exported_file,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": hash_file(exported_file),
+            })
+
+    manifest[texture_set_name] = {"fingerprint": fingerprint, "outputs": outputs}
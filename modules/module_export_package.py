@@ -0,0 +1,254 @@
+"""
+    Module to package exported texture sets into delivery archives.
+
+    Exported files are streamed into the archives as soon as their export group is done,
+    while the next texture sets are still exported. Archives are written in parallel on a thread pool,
+    zlib and zstandard are releasing the GIL while compressing. Every file is read in chunks,
+    hashed and compressed on the fly, so memory stays bounded and no second copy of the textures
+    is staged on disk, even for multi-GB deliveries. Archive checksums are computed on the written stream as well.
+
+    Archive formats:
+        - zip: PNG and JPEG files are stored, they are already compressed
+        - tar.zst: requires the optional zstandard package
+    Grouping:
+        - asset: archive per texture set, e.g. PROP_CHR_S_01.zip
+        - batch: single archive for the whole export, e.g. delivery.zip
+
+    Paths in the archives are relative to the export root: Props/PROP_CHR_S_01/Basic/PROP_CHR_S_01_BaseColor.png
+    When packaging is finished, delivery_manifest.json is written next to the archives,
+    with sizes and SHA-256 checksums of every archive and every packaged file.
+
+    The module does not depend on Painter.
+
+    Content:
+        - DeliveryPackager
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_FORMATS = ["zip", "tar.zst"]
+GROUPINGS = ["asset", "batch"]
+BATCH_ARCHIVE_NAME = "delivery"
+DELIVERY_MANIFEST_FILE_NAME = "delivery_manifest.json"
+CHUNK_SIZE = 1024 * 1024
+ZSTD_COMPRESS_LEVEL = 10
+# Already compressed files are stored as is
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+
+class HashingWriter:
+    """
+    Non-seekable output stream which hashes and counts everything written into the archive file.
+    zipfile writes its entries in the streaming mode into non-seekable streams.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.file.write(data)
+        self.hash.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.size
+
+    def seekable(self):
+        return False
+
+    def flush(self):
+        self.file.flush()
+
+
+class HashingReader:
+    """ Source file stream which hashes the chunks read by tarfile. """
+
+    def __init__(self, file):
+        self.file = file
+        self.hash = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.hash.update(data)
+        return data
+
+
+class ArchiveWriter:
+    def __init__(self, archive_path: str, archive_format: str):
+        self.archive_path = archive_path
+        self.archive_format = archive_format
+        self.lock = threading.Lock()
+        self.files = []
+        self.arcnames = set()
+        self.error = None
+
+        self.file = open(archive_path, "wb")
+        self.output = HashingWriter(self.file)
+        if archive_format == "zip":
+            self.zstd_writer = None
+            self.archive = zipfile.ZipFile(self.output, "w", zipfile.ZIP_DEFLATED, allowZip64=True)
+        else:
+            self.zstd_writer = zstandard.ZstdCompressor(level=ZSTD_COMPRESS_LEVEL).stream_writer(self.output, closefd=False)
+            self.archive = tarfile.open(fileobj=self.zstd_writer, mode="w|")
+
+    def add_file(self, file_path: str, arcname: str):
+        if arcname in self.arcnames:
+            return
+        self.arcnames.add(arcname)
+
+        file_size = os.path.getsize(file_path)
+        with open(file_path, "rb") as source_file:
+            if self.archive_format == "zip":
+                file_hash = self.add_zip_entry(source_file, file_path, arcname)
+            else:
+                tar_info = tarfile.TarInfo(arcname)
+                tar_info.size = file_size
+                tar_info.mtime = int(os.path.getmtime(file_path))
+                source_reader = HashingReader(source_file)
+                self.archive.addfile(tar_info, source_reader)
+                file_hash = source_reader.hash
+
+        self.files.append({"path": arcname, "size": file_size, "sha256": file_hash.hexdigest()})
+
+    def add_zip_entry(self, source_file, file_path: str, arcname: str):
+        zip_info = zipfile.ZipInfo(arcname, time.localtime(os.path.getmtime(file_path))[:6])
+        is_stored = os.path.splitext(file_path)[1].lower() in STORED_EXTENSIONS
+        zip_info.compress_type = zipfile.ZIP_STORED if is_stored else zipfile.ZIP_DEFLATED
+
+        file_hash = hashlib.sha256()
+        with self.archive.open(zip_info, "w", force_zip64=True) as archive_entry:
+            for chunk in iter(lambda: source_file.read(CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+                archive_entry.write(chunk)
+        return file_hash
+
+    def close(self) -> Dict:
+        try:
+            self.archive.close()
+            if self.zstd_writer is not None:
+                self.zstd_writer.close()
+        finally:
+            self.file.close()
+
+        return {
+                "archive": os.path.basename(self.archive_path),
+                "size": self.output.size,
+                "sha256": self.output.hash.hexdigest(),
+                "files": self.files,
+                "error": self.error,
+                }
+
+
+class DeliveryPackager:
+    def __init__(self, delivery_path: str, root_path: str, archive_format: str = "zip", grouping: str = "asset", workers: Optional[int] = None):
+        """ Raises RuntimeError if the archive format is not available. """
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown delivery archive format {archive_format}, valid formats are: {ARCHIVE_FORMATS}")
+        if grouping not in GROUPINGS:
+            raise ValueError(f"Unknown delivery grouping {grouping}, valid groupings are: {GROUPINGS}")
+        if archive_format == "tar.zst" and zstandard is None:
+            raise RuntimeError("tar.zst delivery archives require the zstandard package")
+
+        self.delivery_path = delivery_path
+        self.root_path = root_path
+        self.archive_format = archive_format
+        self.grouping = grouping
+        self.archive_writers = {}
+        self.archive_writers_lock = threading.Lock()
+        self.futures = []
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers or os.cpu_count())
+        os.makedirs(delivery_path, exist_ok=True)
+
+    def get_arcname(self, file_path: str) -> str:
+        arcname = os.path.relpath(file_path, self.root_path)
+        if arcname.startswith(os.pardir):
+            # File is exported outside of the export root
+            arcname = os.path.basename(file_path)
+        return arcname.replace(os.sep, "/")
+
+    def get_archive_writer(self, archive_name: str) -> ArchiveWriter:
+        with self.archive_writers_lock:
+            archive_writer = self.archive_writers.get(archive_name)
+            if archive_writer is None:
+                archive_path = os.path.join(self.delivery_path, f"{archive_name}.{self.archive_format}")
+                archive_writer = self.archive_writers[archive_name] = ArchiveWriter(archive_path, self.archive_format)
+            return archive_writer
+
+    def package_files(self, archive_name: str, file_paths: List[str]):
+        archive_writer = self.get_archive_writer(archive_name)
+        # Files of the same archive are written one after another, different archives are written in parallel
+        with archive_writer.lock:
+            for file_path in file_paths:
+                try:
+                    archive_writer.add_file(file_path, self.get_arcname(file_path))
+                except OSError as error:
+                    archive_writer.error = f"{file_path} could not be packaged: {error}"
+
+    def add_files(self, texture_set_name: str, file_paths: Iterable[str]):
+        """ Returns right away, files are packaged in the background. """
+        archive_name = texture_set_name if self.grouping == "asset" else BATCH_ARCHIVE_NAME
+        self.futures.append(self.executor.submit(self.package_files, archive_name, list(file_paths)))
+
+    def add_export_result(self, export_result):
+        for (texture_set_name, _), exported_files in export_result.textures.items():
+            self.add_files(texture_set_name, exported_files)
+
+    def close(self) -> Dict:
+        """
+        Waits for all the archives, closes them and writes the delivery manifest.
+        Failures of the packaging tasks, e.g. an archive which could not be created, are listed in its errors.
+        """
+        errors = []
+        for future in self.futures:
+            try:
+                future.result()
+            except Exception as error:  # any failure of a packaging task is reported in the manifest
+                errors.append(str(error))
+        self.executor.shutdown(wait=True)
+
+        archives = []
+        for archive_name in sorted(self.archive_writers):
+            try:
+                archives.append(self.archive_writers[archive_name].close())
+            except OSError as error:
+                archives.append({"archive": archive_name, "error": f"Archive could not be closed: {error}"})
+
+        delivery_manifest = {
+                "archive_format": self.archive_format,
+                "grouping": self.grouping,
+                "created_at": time.time(),
+                "archives": archives,
+                "errors": errors,
+                }
+        with open(os.path.join(self.delivery_path, DELIVERY_MANIFEST_FILE_NAME), "w") as file:
+            json.dump(delivery_manifest, file, indent=4)
+        return delivery_manifest
+
+    def finish(self) -> concurrent.futures.Future:
+        """ Closes the packager in the background, the future is resolved with the delivery manifest. """
+        future = concurrent.futures.Future()
+
+        def close_in_background():
+            try:
+                future.set_result(self.close())
+            except Exception as error:  # reported through the future
+                future.set_exception(error)
+
+        threading.Thread(target=close_in_background, daemon=True).start()
+        return future
@@ -0,0 +1,107 @@
+"""
+    Module to build export paths of texture sets from studio-defined path templates.
+
+    Export roots and the path template are declared in export_paths.json:
+        {
+            "roots": {"personal": "C:/Test", "official": "D:/Test"},
+            "template": "{root}/{asset_type}/{name}/{shader}"
+        }
+    Roots could use environment variables and ~, e.g. "$USERPROFILE/Exports".
+    Config file could be overridden with CUSTOM_EXPORTER_EXPORT_PATHS environment variable.
+
+    Template tokens:
+        - root: personal or official export root
+        - asset_type: Asset Type selected in the widget, e.g. Props
+        - name: Texture Set name, e.g. PROP_CHR_S_01
+        - shader: Shader Type of the texture set, e.g. Basic
+        - asset_type_acronym, asset_detail_1, asset_detail_2, asset_id: acronyms of the parsed Texture Set name,
+          e.g. PROP, CHR, S, 01. Names which could not be parsed get UNKNOWN_ACRONYM instead.
+
+    Template is validated and compiled once, when the config is loaded,
+    so export paths of thousands of rows are built with a single bulk call.
+
+    Content:
+        - PathTemplate
+        - load_export_paths_config
+        - get_export_root
+        - build_export_paths
+"""
+
+import json
+import os
+import string
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+import module_validation_name
+
+DEFAULT_EXPORT_PATHS_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "export_paths.json")
+ROW_TOKENS = frozenset(["root", "asset_type", "name", "shader"])
+NAME_TOKENS = frozenset(module_validation_name.ParsedName._fields)
+UNKNOWN_ACRONYM = "UNKNOWN"
+
+
+class PathTemplate(NamedTuple):
+    template: str
+    tokens: FrozenSet[str]
+    # Names are parsed only if the template uses their acronyms
+    uses_name_tokens: bool
+
+
+export_roots: Dict[str, str] = {}
+path_template: PathTemplate = None
+
+
+def compile_path_template(template: str) -> PathTemplate:
+    """ Raises ValueError for unknown tokens, positional fields and format specs, before any path is built. """
+    tokens = set()
+    for _, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if field_name is None:
+            continue
+        if field_name not in ROW_TOKENS | NAME_TOKENS:
+            raise ValueError(f"Export path template {template} has unknown token {{{field_name}}}. \
+                             Valid tokens are: {sorted(ROW_TOKENS | NAME_TOKENS)}")
+        if format_spec or conversion:
+            raise ValueError(f"Export path template {template} should not format its tokens, token: {{{field_name}}}")
+        tokens.add(field_name)
+
+    if not template.startswith("{root}"):
+        raise ValueError(f"Export path template {template} should start from the {{root}} token")
+
+    return PathTemplate(template, frozenset(tokens), bool(tokens & NAME_TOKENS))
+
+
+def load_export_paths_config(export_paths_config_path: str = None):
+    global path_template
+
+    export_paths_config_path = export_paths_config_path or os.environ.get("CUSTOM_EXPORTER_EXPORT_PATHS", DEFAULT_EXPORT_PATHS_CONFIG_PATH)
+    with open(export_paths_config_path, "r") as file:
+        export_paths_config = json.load(file)
+
+    path_template = compile_path_template(export_paths_config["template"])
+    export_roots.clear()
+    for root_name, root in export_paths_config["roots"].items():
+        export_roots[root_name] = os.path.expanduser(os.path.expandvars(root)).replace("\\", "/").rstrip("/")
+
+
+def get_export_root(is_personal_export: bool) -> str:
+    return export_roots["personal" if is_personal_export else "official"]
+
+
+def build_export_paths(root: str, asset_type: str, texture_sets: Iterable[Tuple[str, str]]) -> List[str]:
+    """ texture_sets: (texture_set_name, shader_type) of every row, export paths are in the same order. """
+    template = path_template.template
+    uses_name_tokens = path_template.uses_name_tokens
+    unknown_name = module_validation_name.ParsedName(*[UNKNOWN_ACRONYM] * len(NAME_TOKENS))
+
+    export_paths = []
+    tokens = {"root": root, "asset_type": asset_type}
+    for texture_set_name, shader_type in texture_sets:
+        tokens["name"] = texture_set_name
+        tokens["shader"] = shader_type
+        if uses_name_tokens:
+            tokens.update((module_validation_name.parse_name(texture_set_name) or unknown_name)._asdict())
+        export_paths.append(template.format_map(tokens))
+    return export_paths
+
+
+load_export_paths_config()
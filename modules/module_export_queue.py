@@ -0,0 +1,215 @@
+"""
+    Module to run texture set exports in the background of the Painter UI.
+
+    Painter API can only be called from the main thread, so exports are scheduled
+    cooperatively: every tick of the Qt event loop exports one small group of texture sets,
+    and the UI stays responsive in between. Jobs could be skipped or the whole queue cancelled
+    while it is running. Export options are kept on every step, so jobs enqueued later with other options
+    are not changing the jobs which are already waiting.
+
+    With progressive export, downscaled previews of all the jobs are exported first,
+    ahead of everything else waiting in the queue, and the full resolution exports follow.
+    Preview files are removed when the full resolution export of their texture set is done.
+
+    A step raising an error, e.g. for a texture set removed from the project while it was queued,
+    fails its jobs and the queue goes on with the next step, so the queue is always finished.
+
+    Content:
+        - ExportStep
+        - ExportQueue
+"""
+
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+from PySide2 import QtCore
+
+import substance_painter as sp
+
+import module_export
+import module_export_fs
+
+QUEUED = "Queued"
+PREVIEW_RUNNING = "Preview Running"
+PREVIEW = "Preview"
+RUNNING = "Running"
+DONE = "Done"
+FAILED = "Failed"
+SKIPPED = "Skipped"
+CANCELLED = "Cancelled"
+
+
+class ExportStep(NamedTuple):
+    export_jobs: List[module_export.ExportJob]
+    # None for the full resolution export
+    preview_max_size: Optional[int] = None
+    incremental: bool = False
+    dedupe_store_path: Optional[str] = None
+    # module_export_package.DeliveryPackager
+    packager: Optional[object] = None
+    prune_channels: bool = False
+    # module_export.IncrementalPlan of the whole enqueued export, None to check every step on its own
+    incremental_plan: Optional[module_export.IncrementalPlan] = None
+
+
+class ExportQueue(QtCore.QObject):
+    # texture set name, state, details
+    job_state_changed = QtCore.Signal(str, str, str)
+    # {texture_set_name: (is_export_passed, export_details, exported_files)}
+    queue_finished = QtCore.Signal(dict)
+
+    def __init__(self, jobs_per_step: int = 4, parent=None):
+        super().__init__(parent)
+        self.jobs_per_step = jobs_per_step
+        self.pending_steps = deque()
+        self.skipped_texture_sets = set()
+        self.export_outcomes = {}
+        # texture set name -> preview files to be removed by its full resolution export
+        self.preview_files = {}
+        # Step is popped before its export starts, the queue is running until the export returns
+        self.is_exporting = False
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.process_next_step)
+
+    def is_running(self) -> bool:
+        return self.is_exporting or len(self.pending_steps) > 0
+
+    def enqueue(
+            self,
+            export_jobs: List[module_export.ExportJob],
+            incremental: bool = False,
+            dedupe_store_path: Optional[str] = None,
+            packager=None,
+            prune_channels: bool = False,
+            preview_max_size: Optional[int] = None,
+            incremental_plan: Optional[module_export.IncrementalPlan] = None,
+            ):
+        preview_steps = []
+        for grouped_jobs in module_export.group_export_jobs(export_jobs).values():
+            for i in range(0, len(grouped_jobs), self.jobs_per_step):
+                step_jobs = grouped_jobs[i:i + self.jobs_per_step]
+                self.pending_steps.append(ExportStep(step_jobs, None, incremental, dedupe_store_path, packager, prune_channels, incremental_plan))
+                if preview_max_size is not None:
+                    # Incremental check, dedupe and packaging are kept for the full resolution export
+                    preview_steps.append(ExportStep(step_jobs, preview_max_size, prune_channels=prune_channels))
+        # Previews are the first look at the texture sets, they are not waiting for the full resolution exports
+        self.pending_steps.extendleft(reversed(preview_steps))
+
+        for export_job in export_jobs:
+            self.skipped_texture_sets.discard(export_job.texture_set_name)
+            self.job_state_changed.emit(export_job.texture_set_name, QUEUED, "Waiting for the export")
+
+        self.timer.start()
+
+    def skip(self, texture_set_name: str):
+        """ Skipped job is dropped from the queue right before its export starts. """
+        self.skipped_texture_sets.add(texture_set_name)
+
+    def cancel(self):
+        while self.pending_steps:
+            for export_job in self.pending_steps.popleft().export_jobs:
+                self.job_state_changed.emit(export_job.texture_set_name, CANCELLED, "Export is cancelled")
+        self.timer.stop()
+        if not self.is_exporting:
+            # Running step finishes the queue itself, with its outcomes
+            self.finish()
+
+    def process_next_step(self):
+        # Timers are still fired by processEvents while a step is exported, the next step waits for it
+        if self.is_exporting or not self.pending_steps:
+            return
+
+        export_step = self.pending_steps.popleft()
+        self.is_exporting = True
+        try:
+            self.run_step(export_step)
+        except Exception as error:  # any step failure fails its jobs, the rest of the queue keeps going
+            self.fail_step(export_step, error)
+        finally:
+            self.is_exporting = False
+
+        if self.pending_steps:
+            # Give the event loop a chance to process user input before the next export
+            self.timer.start()
+        else:
+            self.finish()
+
+    def run_step(self, export_step: ExportStep):
+        export_jobs = []
+        for export_job in export_step.export_jobs:
+            if export_job.texture_set_name in self.skipped_texture_sets:
+                self.job_state_changed.emit(export_job.texture_set_name, SKIPPED, "Export is skipped")
+            elif export_step.preview_max_size is not None:
+                self.job_state_changed.emit(export_job.texture_set_name, PREVIEW_RUNNING, "Preview export is running")
+                export_jobs.append(export_job)
+            else:
+                self.job_state_changed.emit(export_job.texture_set_name, RUNNING, "Export is running")
+                export_jobs.append(export_job)
+
+        if export_jobs and export_step.preview_max_size is not None:
+            self.export_previews(export_step._replace(export_jobs=export_jobs))
+        elif export_jobs:
+            # Paint the running state before Painter blocks the main thread with the export
+            QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
+            export_outcomes = module_export.export_textures_batch(
+                    export_jobs,
+                    incremental=export_step.incremental,
+                    dedupe_store_path=export_step.dedupe_store_path,
+                    packager=export_step.packager,
+                    prune_channels=export_step.prune_channels,
+                    incremental_plan=export_step.incremental_plan,
+                    )
+            for export_job in export_jobs:
+                export_outcome = export_outcomes.setdefault(export_job.texture_set_name, (False, "Project is not opened", []))
+                is_export_passed, export_details, _ = export_outcome
+                self.job_state_changed.emit(export_job.texture_set_name, DONE if is_export_passed else FAILED, export_details)
+                if is_export_passed:
+                    module_export_fs.remove_files(self.preview_files.pop(export_job.texture_set_name, []))
+            self.export_outcomes.update(export_outcomes)
+
+    def fail_step(self, export_step: ExportStep, error: Exception):
+        """ Jobs of the step which were not skipped are failed with the error, outcomes already reported are kept. """
+        sp.logging.log(sp.logging.ERROR, "CUSTOM EXPORTER", f"Export step has failed: {error!r}")
+        is_preview_step = export_step.preview_max_size is not None
+        export_details = f"Preview export has failed: {error!r}" if is_preview_step else f"Export has failed: {error!r}"
+        for export_job in export_step.export_jobs:
+            texture_set_name = export_job.texture_set_name
+            if texture_set_name in self.skipped_texture_sets:
+                continue
+            if not is_preview_step:
+                if texture_set_name in self.export_outcomes:
+                    continue
+                self.export_outcomes[texture_set_name] = (False, export_details, [])
+            self.job_state_changed.emit(texture_set_name, FAILED, export_details)
+
+    def export_previews(self, export_step: ExportStep):
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
+        export_outcomes = module_export.export_textures_batch(
+                export_step.export_jobs,
+                prune_channels=export_step.prune_channels,
+                preview_max_size=export_step.preview_max_size,
+                )
+        preview_max_size = export_step.preview_max_size
+        for export_job in export_step.export_jobs:
+            is_export_passed, export_details, exported_files = export_outcomes.get(export_job.texture_set_name, (False, "Project is not opened", []))
+            if is_export_passed:
+                self.preview_files[export_job.texture_set_name] = exported_files
+                self.job_state_changed.emit(
+                        export_job.texture_set_name,
+                        PREVIEW,
+                        f"Preview fitting {preview_max_size} px is exported to {module_export.get_preview_export_path(export_job.export_path)}, \
+                        full resolution export is waiting",
+                        )
+            else:
+                self.job_state_changed.emit(export_job.texture_set_name, FAILED, f"Preview export has failed: {export_details}")
+
+    def finish(self):
+        export_outcomes = self.export_outcomes
+        self.export_outcomes = {}
+        # Previews of the texture sets whose full resolution export was not done are kept
+        self.preview_files = {}
+        self.skipped_texture_sets.clear()
+        self.queue_finished.emit(export_outcomes)
@@ -0,0 +1,95 @@
+"""
+    Module to watch the Painter project for changes to be exported automatically.
+
+    Texture set of the active stack is marked dirty by every layer stacks change,
+    project save and the changes themselves are restarting the debounce window, so a burst of edits
+    and saves is coalesced into a single export of the dirty texture sets when the window is over.
+    All the texture sets are marked dirty if the active stack is not known, e.g. in older Painter versions.
+
+    Content:
+        - ExportWatcher
+"""
+
+from typing import Iterable, List
+
+from PySide2 import QtCore
+
+import substance_painter as sp
+
+WATCH_DEBOUNCE_MS = 2000
+
+
+class ExportWatcher(QtCore.QObject):
+    # names of the dirty texture sets, empty list for all of them
+    dirty_texture_sets_ready = QtCore.Signal(list)
+
+    def __init__(self, debounce_ms: int = WATCH_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.dirty_texture_sets = set()
+        self.is_all_dirty = False
+        self.is_watching = False
+        self.painter_connections = {}
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def start(self):
+        if self.is_watching:
+            return
+
+        # Not all of the events are available in every Painter version
+        for event_name, callback in (("ProjectSaved", self.on_project_saved), ("LayerStacksModelDataChanged", self.on_layer_stacks_changed)):
+            event = getattr(sp.event, event_name, None)
+            if event is not None:
+                sp.event.DISPATCHER.connect(event, callback)
+                self.painter_connections[event] = callback
+        self.is_watching = True
+
+    def stop(self):
+        for event, callback in self.painter_connections.items():
+            sp.event.DISPATCHER.disconnect(event, callback)
+        self.painter_connections = {}
+        self.is_watching = False
+        self.clear()
+
+    def clear(self):
+        self.timer.stop()
+        self.dirty_texture_sets.clear()
+        self.is_all_dirty = False
+
+    def get_active_texture_set_name(self):
+        try:
+            return sp.textureset.get_active_stack().material().name()
+        except (AttributeError, ValueError, RuntimeError):
+            return None
+
+    def on_layer_stacks_changed(self, event):
+        texture_set_name = self.get_active_texture_set_name()
+        if texture_set_name is None:
+            self.is_all_dirty = True
+        else:
+            self.dirty_texture_sets.add(texture_set_name)
+        self.timer.start()
+
+    def on_project_saved(self, event):
+        if self.dirty_texture_sets or self.is_all_dirty:
+            self.timer.start()
+
+    def postpone(self, texture_set_names: Iterable[str]):
+        """ Texture sets which could not be exported yet, e.g. while the previous export is running, are retried after the next window. """
+        texture_set_names = list(texture_set_names)
+        if not texture_set_names:
+            self.is_all_dirty = True
+        self.dirty_texture_sets.update(texture_set_names)
+        self.timer.start()
+
+    def flush(self):
+        if not (self.dirty_texture_sets or self.is_all_dirty):
+            return
+
+        texture_set_names: List[str] = [] if self.is_all_dirty else sorted(self.dirty_texture_sets)
+        self.dirty_texture_sets.clear()
+        self.is_all_dirty = False
+        self.dirty_texture_sets_ready.emit(texture_set_names)
@@ -0,0 +1,167 @@
+"""
+    Module to instrument Custom Exporter runs.
+
+    A run (an export, or a table refresh) collects spans of its phases with durations,
+    the texture sets they were done for, and counters, e.g. bytes written or Painter API calls.
+    When no run is recorded, spans and counters cost nothing.
+    Finished run is turned into a machine-readable report, which could be written as JSON.
+    A run could optionally be profiled with cProfile into a .prof file.
+
+    Usage:
+        module_instrumentation.start_run("export")
+        with module_instrumentation.span("build_config", texture_set_names=["PROP_CHR_S_01"]):
+            ...
+        report = module_instrumentation.finish_run()
+
+    Content:
+        - start_run
+        - span
+        - count
+        - finish_run
+        - write_report
+        - summarize_report
+"""
+
+import collections
+import contextlib
+import cProfile
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+import module_texset_cache
+
+
+class RunRecorder:
+    def __init__(self, run_name: str, profile_path: Optional[str] = None):
+        self.run_name = run_name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.counters = collections.Counter()
+        self.cache_stats_at_start = module_texset_cache.texture_set_cache.get_stats()
+
+        self.profile_path = profile_path
+        self.profiler = None
+        if profile_path is not None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def add_span(self, name: str, start: float, duration: float, texture_set_names: Iterable[str], attributes: Dict):
+        self.spans.append({
+            "name": name,
+            "start": start - self.start,
+            "duration": duration,
+            "texture_sets": list(texture_set_names),
+            "attributes": attributes,
+            })
+
+    def finish(self) -> Dict:
+        duration = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+            os.makedirs(os.path.dirname(self.profile_path) or ".", exist_ok=True)
+            self.profiler.dump_stats(self.profile_path)
+
+        cache_stats = module_texset_cache.texture_set_cache.get_stats()
+        cache_stats = {name: value - self.cache_stats_at_start[name] for name, value in cache_stats.items()}
+        counters = dict(self.counters)
+        counters["painter_api_calls"] = counters.get("painter_api_calls", 0) + cache_stats["api_calls"]
+
+        return {
+                "run": self.run_name,
+                "started_at": self.started_at,
+                "duration": duration,
+                "phases": aggregate_phases(self.spans),
+                "texture_sets": aggregate_texture_sets(self.spans),
+                "counters": counters,
+                "texture_set_cache": cache_stats,
+                "profile_path": self.profile_path,
+                "spans": self.spans,
+                }
+
+
+active_recorder: Optional[RunRecorder] = None
+
+
+def is_recording() -> bool:
+    return active_recorder is not None
+
+
+def start_run(run_name: str, profile_path: Optional[str] = None):
+    """ Starts a new run, the run which is still recorded is dropped. """
+    global active_recorder
+    if active_recorder is not None and active_recorder.profiler is not None:
+        active_recorder.profiler.disable()
+    active_recorder = RunRecorder(run_name, profile_path)
+
+
+def finish_run() -> Optional[Dict]:
+    global active_recorder
+    if active_recorder is None:
+        return None
+
+    report = active_recorder.finish()
+    active_recorder = None
+    return report
+
+
+@contextlib.contextmanager
+def span(name: str, texture_set_names: Iterable[str] = (), **attributes):
+    if active_recorder is None:
+        yield attributes
+        return
+
+    recorder = active_recorder
+    start = time.perf_counter()
+    try:
+        # Attributes could be filled in by the caller inside of the span, e.g. bytes written
+        yield attributes
+    finally:
+        recorder.add_span(name, start, time.perf_counter() - start, texture_set_names, attributes)
+
+
+def count(name: str, value: int = 1):
+    if active_recorder is not None:
+        active_recorder.counters[name] += value
+
+
+def aggregate_phases(spans: List[Dict]) -> Dict[str, Dict]:
+    phases = {}
+    for recorded_span in spans:
+        phase = phases.setdefault(recorded_span["name"], {"count": 0, "duration": 0.0})
+        phase["count"] += 1
+        phase["duration"] += recorded_span["duration"]
+    return phases
+
+
+def aggregate_texture_sets(spans: List[Dict]) -> Dict[str, Dict]:
+    """ Duration of a span done for several texture sets at once is split evenly between them. """
+    texture_sets = {}
+    for recorded_span in spans:
+        texture_set_names = recorded_span["texture_sets"]
+        for texture_set_name in texture_set_names:
+            texture_set = texture_sets.setdefault(texture_set_name, {"phases": {}, "bytes_written": 0})
+            phases = texture_set["phases"]
+            phases[recorded_span["name"]] = phases.get(recorded_span["name"], 0.0) + recorded_span["duration"] / len(texture_set_names)
+
+        bytes_written = recorded_span["attributes"].get("bytes_written", {})
+        for texture_set_name, written in bytes_written.items():
+            texture_sets.setdefault(texture_set_name, {"phases": {}, "bytes_written": 0})["bytes_written"] += written
+    return texture_sets
+
+
+def write_report(report: Dict, report_path: str):
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    with open(report_path, "w") as file:
+        json.dump(report, file, indent=4)
+
+
+def summarize_report(report: Dict) -> List[List[str]]:
+    """ Rows of the summary table: Phase, Count, Total seconds. """
+    rows = [[phase_name, str(phase["count"]), f"{phase['duration']:.3f}"] for phase_name, phase in report["phases"].items()]
+    rows.append(["total", "1", f"{report['duration']:.3f}"])
+    for counter_name, value in report["counters"].items():
+        rows.append([counter_name, str(value), ""])
+    return rows
@@ -0,0 +1,201 @@
+"""
+    Module to post-process exported textures in parallel.
+
+    Post-export steps are configured as dictionaries:
+        {"processor": "resize", "options": {"max_size": 1024}, "extensions": [".png"]}
+    Every step is applied to every exported file with a matching extension
+    in a process pool sized to the machine cores. Results are yielded as soon as each file is processed.
+
+    The module does not depend on Painter, so it could be run on any object
+    with a `textures` attribute shaped like the Painter export result:
+        {(texture_set_name, stack_name): [exported_file_path, ...]}
+
+    Inside Painter, sys.executable is the Painter application itself,
+    so the path of a regular Python interpreter has to be provided to spawn the workers.
+    Without it, steps are run in-process on a thread pool instead of spawning Painter instances.
+
+    Content:
+        - iter_exported_files
+        - register_processor
+        - run_post_export
+        - resize_texture
+        - generate_mips
+        - convert_texture_format
+        - optimize_png
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Studio wide post-export steps, applied after every export when no steps are given explicitly
+POST_EXPORT_STEPS = []
+# Python interpreter used to spawn the worker processes, required when running inside Painter
+POST_EXPORT_PYTHON_EXECUTABLE = None
+
+
+class PostExportResult(NamedTuple):
+    texture_set_name: str
+    source_path: str
+    processor_name: str
+    is_processing_passed: bool
+    details: str
+    output_paths: List[str]
+
+
+def require_pillow():
+    if Image is None:
+        raise RuntimeError("Pillow is required for this post-export processor. Install it with: pip install Pillow")
+
+
+def build_output_path(file_path: str, suffix: str = "", extension: Optional[str] = None) -> str:
+    stem, file_extension = os.path.splitext(file_path)
+    return f"{stem}{suffix}{extension or file_extension}"
+
+
+def resize_texture(file_path: str, max_size: int = 1024) -> List[str]:
+    """ Downscales texture, so its biggest side is not bigger than max_size. Aspect ratio is kept. """
+    require_pillow()
+    with Image.open(file_path) as image:
+        scale = min(1.0, max_size / max(image.size))
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        output_path = build_output_path(file_path, f"_{max_size}")
+        image.resize(size, Image.LANCZOS).save(output_path)
+    return [output_path]
+
+
+def generate_mips(file_path: str, min_size: int = 1) -> List[str]:
+    """ Writes full mip chain next to the texture: name_mip1.png, name_mip2.png, ... """
+    require_pillow()
+    output_paths = []
+    with Image.open(file_path) as image:
+        mip = image
+        mip_level = 0
+        while min(mip.size) // 2 >= min_size:
+            mip_level += 1
+            mip = mip.resize((mip.width // 2, mip.height // 2), Image.BOX)
+            output_path = build_output_path(file_path, f"_mip{mip_level}")
+            mip.save(output_path)
+            output_paths.append(output_path)
+    return output_paths
+
+
+def convert_texture_format(file_path: str, extension: str = ".tga") -> List[str]:
+    require_pillow()
+    output_path = build_output_path(file_path, extension=extension)
+    with Image.open(file_path) as image:
+        image.save(output_path)
+    return [output_path]
+
+
+def optimize_png(file_path: str) -> List[str]:
+    """
+    Re-encodes PNG in place with the maximum zlib compression.
+    Optimized file replaces the original one, so content shared by a hardlink is never rewritten.
+    """
+    require_pillow()
+    with Image.open(file_path) as image:
+        image.load()
+    temp_file_path = build_output_path(file_path, ".optimized")
+    image.save(temp_file_path, format="PNG", optimize=True)
+    os.replace(temp_file_path, file_path)
+    return [file_path]
+
+
+post_export_processors = {
+        "resize": resize_texture,
+        "mips": generate_mips,
+        "convert": convert_texture_format,
+        "optimize_png": optimize_png,
+        }
+
+
+def register_processor(processor_name: str, processor: Callable[..., List[str]]):
+    """ Processor has to be a module level function, so it could be pickled into the worker processes. """
+    post_export_processors[processor_name] = processor
+
+
+def iter_exported_files(export_result) -> Iterator[Tuple[str, str]]:
+    for (texture_set_name, _), exported_files in export_result.textures.items():
+        for exported_file in exported_files:
+            yield texture_set_name, exported_file
+
+
+def run_processors(processors: List[Tuple[str, Callable[..., List[str]], Dict]], file_path: str) -> List[Tuple[str, bool, str, List[str]]]:
+    """ Steps of the same file are run one after another, as some of them are rewriting the file in place. """
+    processing_results = []
+    for processor_name, processor, options in processors:
+        try:
+            output_paths = processor(file_path, **options)
+        except Exception as error:  # any processor failure is reported per file, the rest of the files keep going
+            processing_results.append((processor_name, False, str(error), []))
+        else:
+            processing_results.append((processor_name, True, "Post-export processing is done!", output_paths))
+    return processing_results
+
+
+def is_python_executable(executable: Optional[str]) -> bool:
+    """ Painter executable is not a Python interpreter, e.g. "Adobe Substance 3D Painter.exe". """
+    return bool(executable) and os.path.basename(executable).lower().startswith("python")
+
+
+def create_process_pool(max_workers: Optional[int] = None, python_executable: Optional[str] = None) -> concurrent.futures.Executor:
+    """ Thread pool is returned when there is no Python interpreter to spawn the workers with. """
+    python_executable = python_executable or POST_EXPORT_PYTHON_EXECUTABLE
+    if python_executable is None and not is_python_executable(sys.executable):
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+    mp_context = multiprocessing.get_context("spawn")
+    if python_executable is not None:
+        mp_context.set_executable(python_executable)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), mp_context=mp_context)
+
+
+def run_post_export(export_result, post_export_steps: List[Dict], executor: Optional[concurrent.futures.Executor] = None) -> Iterator[PostExportResult]:
+    """
+    Runs every configured step on every matching exported file.
+    Results are yielded as soon as each file is processed.
+    Process pool is created for the run, unless an executor is given.
+    """
+    tasks = []
+    for texture_set_name, exported_file in iter_exported_files(export_result):
+        file_extension = os.path.splitext(exported_file)[1].lower()
+        processors = []
+        for post_export_step in post_export_steps:
+            extensions = post_export_step.get("extensions")
+            if extensions is not None and file_extension not in extensions:
+                continue
+
+            processor_name = post_export_step["processor"]
+            processor = post_export_processors.get(processor_name)
+            if processor is None:
+                yield PostExportResult(texture_set_name, exported_file, processor_name, False, f"There is no post-export processor {processor_name}", [])
+                continue
+            processors.append((processor_name, processor, post_export_step.get("options", {})))
+
+        if processors:
+            tasks.append((texture_set_name, exported_file, processors))
+
+    if not tasks:
+        return
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = create_process_pool()
+
+    try:
+        futures = {executor.submit(run_processors, processors, exported_file): (texture_set_name, exported_file) for texture_set_name, exported_file, processors in tasks}
+        for future in concurrent.futures.as_completed(futures):
+            texture_set_name, exported_file = futures[future]
+            for processor_name, is_processing_passed, details, output_paths in future.result():
+                yield PostExportResult(texture_set_name, exported_file, processor_name, is_processing_passed, details, output_paths)
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True)
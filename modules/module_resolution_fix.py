@@ -0,0 +1,71 @@
+"""
+    Module to plan the bulk autofix of Texture Set resolutions which are over the budget of the Asset Type.
+
+    Planning is a dry run: every over budget texture set gets its new resolution and the estimated
+    GPU memory saved by the change, so the whole diff could be reviewed before anything is applied.
+    New resolution keeps the aspect ratio of the texture set, and fits both sides of the budget,
+    which doesn't have to be square: 4096 x 2048 with a 2048 x 2048 budget becomes 2048 x 1024.
+
+    Changes are applied by the widget in a single grouped Painter modification.
+
+    The module does not depend on Painter.
+
+    Content:
+        - ResolutionChange
+        - get_fixed_resolution
+        - plan_resolution_changes
+        - format_resolution_diff
+"""
+
+from math import ceil, log2
+from typing import Iterable, List, NamedTuple, Tuple
+
+import module_validation_service
+
+# Maps are exported as RGBA8
+BYTES_PER_PIXEL = 4
+# All mip levels together are taking 1/3 of the base level
+MIP_CHAIN_FACTOR = 4 / 3
+
+
+class ResolutionChange(NamedTuple):
+    texture_set_name: str
+    old_width: int
+    old_height: int
+    new_width: int
+    new_height: int
+    # Estimated GPU memory of the exported maps, mip chains included
+    saved_bytes: int
+
+
+def get_fixed_resolution(width: int, height: int, required_width: int, required_height: int) -> Tuple[int, int]:
+    """ Both sides are halved together, until the resolution fits the budget. """
+    size_shift = max(0, ceil(log2(width / required_width)), ceil(log2(height / required_height)))
+    return max(1, width >> size_shift), max(1, height >> size_shift)
+
+
+def plan_resolution_changes(asset_type: str, texture_sets: Iterable[Tuple[str, int, int, int]]) -> List[ResolutionChange]:
+    """ texture_sets: (texture_set_name, width, height, exported map count). Texture sets within the budget are left out. """
+    required_width, required_height = module_validation_service.get_required_res(asset_type)
+
+    resolution_changes = []
+    for texture_set_name, width, height, map_count in texture_sets:
+        new_width, new_height = get_fixed_resolution(width, height, required_width, required_height)
+        if (new_width, new_height) == (width, height):
+            continue
+
+        saved_pixels = width * height - new_width * new_height
+        saved_bytes = int(saved_pixels * BYTES_PER_PIXEL * MIP_CHAIN_FACTOR * map_count)
+        resolution_changes.append(ResolutionChange(texture_set_name, width, height, new_width, new_height, saved_bytes))
+    return resolution_changes
+
+
+def format_resolution_diff(resolution_changes: List[ResolutionChange]) -> List[str]:
+    lines = []
+    for change in resolution_changes:
+        old_resolution = f"{change.old_width} x {change.old_height}"
+        new_resolution = f"{change.new_width} x {change.new_height}"
+        lines.append(f"{change.texture_set_name}: {old_resolution} -> {new_resolution}, {change.saved_bytes / 2 ** 20:.1f} MB saved")
+    total_saved_bytes = sum(change.saved_bytes for change in resolution_changes)
+    lines.append(f"Total: {len(resolution_changes)} texture set(s), {total_saved_bytes / 2 ** 20:.1f} MB of GPU memory saved")
+    return lines
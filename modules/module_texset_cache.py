@@ -0,0 +1,144 @@
+"""
+    Module with a caching facade over substance_painter.textureset.
+
+    Texture set names, resolutions and stacks are read from Painter once per project snapshot,
+    every following read is served from the snapshot. Channels of the stacks are read on demand,
+    and kept with the snapshot as well. The snapshot is dropped only by Painter events:
+    project open/create/close and layer stacks changes (which include resolution changes),
+    or explicitly with invalidate().
+    Invalidations within deferred_invalidation(), e.g. by the events of a bulk resolution change,
+    are coalesced into a single one at its end.
+    Hit and miss counters are kept to measure the saved round-trips into the Painter API.
+
+    Content:
+        - TextureSetInfo
+        - TextureSetCache
+        - texture_set_cache
+"""
+
+import contextlib
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+
+import substance_painter as sp
+
+# Events which are making the snapshot outdated. Not all of them are available in every Painter version
+INVALIDATION_EVENT_NAMES = [
+        "ProjectOpened",
+        "ProjectCreated",
+        "ProjectAboutToClose",
+        "LayerStacksModelDataChanged",
+        ]
+
+
+class TextureSetInfo(NamedTuple):
+    name: str
+    width: int
+    height: int
+    stack_id: str
+
+
+class TextureSetCache:
+    def __init__(self):
+        self.snapshot: Optional[Dict[str, TextureSetInfo]] = None
+        self.texture_sets = {}
+        self.channels: Dict[str, Optional[FrozenSet[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.api_calls = 0
+        self.invalidations = 0
+        self.is_connected = False
+        self.deferral_depth = 0
+        self.is_invalidation_deferred = False
+
+    def connect_painter_events(self):
+        if self.is_connected:
+            return
+
+        for event_name in INVALIDATION_EVENT_NAMES:
+            event = getattr(sp.event, event_name, None)
+            if event is not None:
+                sp.event.DISPATCHER.connect(event, self.invalidate)
+        self.is_connected = True
+
+    def invalidate(self, event=None):
+        if self.deferral_depth:
+            self.is_invalidation_deferred = True
+            return
+
+        self.snapshot = None
+        self.texture_sets = {}
+        self.channels = {}
+        self.invalidations += 1
+
+    @contextlib.contextmanager
+    def deferred_invalidation(self):
+        self.deferral_depth += 1
+        try:
+            yield
+        finally:
+            self.deferral_depth -= 1
+            if self.deferral_depth == 0 and self.is_invalidation_deferred:
+                self.is_invalidation_deferred = False
+                self.invalidate()
+
+    def get_snapshot(self) -> Dict[str, TextureSetInfo]:
+        if self.snapshot is not None:
+            self.hits += 1
+            return self.snapshot
+
+        self.misses += 1
+        self.snapshot = {}
+        if not sp.project.is_open():
+            return self.snapshot
+
+        all_texture_sets = sp.textureset.all_texture_sets()
+        self.api_calls += 1
+        for texture_set in all_texture_sets:
+            name = texture_set.name()
+            resolution = texture_set.get_resolution()
+            stack = texture_set.get_stack()
+            self.api_calls += 3
+
+            self.texture_sets[name] = texture_set
+            self.snapshot[name] = TextureSetInfo(name, resolution.width, resolution.height, str(stack))
+        return self.snapshot
+
+    def all_texture_sets(self) -> List[TextureSetInfo]:
+        return list(self.get_snapshot().values())
+
+    def get_info(self, texture_set_name: str) -> TextureSetInfo:
+        """ Raises KeyError if there is no texture set with the given name in the project. """
+        return self.get_snapshot()[texture_set_name]
+
+    def get_texture_set(self, texture_set_name: str):
+        """ Painter TextureSet object, e.g. to change its resolution. """
+        self.get_snapshot()
+        return self.texture_sets[texture_set_name]
+
+    def get_channels(self, texture_set_name: str) -> Optional[FrozenSet[str]]:
+        """ Names of the channels of the texture set stack, e.g. BaseColor, Emissive. None if they could not be read. """
+        if texture_set_name in self.channels:
+            self.hits += 1
+            return self.channels[texture_set_name]
+
+        self.misses += 1
+        try:
+            all_channels = self.get_texture_set(texture_set_name).get_stack().all_channels()
+            channels = frozenset(channel_type.name for channel_type in all_channels)
+        except (AttributeError, ValueError, RuntimeError, KeyError):
+            # Stack channels are not available in every Painter version, or the texture set is not in the project anymore
+            channels = None
+        self.api_calls += 2
+        self.channels[texture_set_name] = channels
+        return channels
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "api_calls": self.api_calls,
+                "invalidations": self.invalidations,
+                }
+
+
+texture_set_cache = TextureSetCache()
@@ -0,0 +1,170 @@
+"""
+    Module to search Texture Sets of the widget table.
+
+    Index is built once per refresh of the table from the acronyms of the texture set names,
+    their validation status and resolution. Queries are then answered from the index,
+    without going through the rows: acronym lookups are dict lookups, prefix lookups are
+    binary searches over the sorted acronyms and resolution comparisons are binary searches
+    over the sorted resolutions.
+
+    Query is a list of terms separated by spaces, all the terms have to match:
+        - field=value, field!=value: type, detail1, detail2, id, name, status (pass, fail, pending)
+        - value*: prefix of the value, e.g. name=WPN_RFL* or detail1=R*
+        - res>2048, res>=, res<, res<=, res=, res!=: larger side of the texture set resolution
+        - bare word: prefix of the name or of any of its acronyms, e.g. WPN_RFL or EPC
+    Query example: detail1=RFL status=fail res>2048
+
+    The module does not depend on Painter.
+
+    Content:
+        - QueryTerm
+        - parse_query
+        - TextureSetIndex
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+import module_validation_name
+
+# field of the query: attribute of module_validation_name.ParsedName
+ACRONYM_FIELDS = {
+        "type": "asset_type_acronym",
+        "detail1": "asset_detail_1",
+        "detail2": "asset_detail_2",
+        "id": "asset_id",
+        }
+TEXT_FIELDS = ["name", "status", *ACRONYM_FIELDS]
+RES_FIELD = "res"
+STATUS_PASS = "PASS"
+STATUS_FAIL = "FAIL"
+STATUS_PENDING = "PENDING"
+
+term_pattern = re.compile(r"(?P<field>[a-z0-9]+)(?P<operator>!=|>=|<=|=|>|<)(?P<value>.*)", re.IGNORECASE)
+
+
+class QueryTerm(NamedTuple):
+    # None for bare words
+    field: Optional[str]
+    operator: str
+    value: str
+    is_prefix: bool
+
+
+def parse_query(query: str) -> List[QueryTerm]:
+    """ Raises ValueError with the reason if the query is not valid. """
+    terms = []
+    for word in query.split():
+        match = term_pattern.fullmatch(word)
+        if match is None:
+            terms.append(QueryTerm(None, "=", word.rstrip("*").upper(), True))
+            continue
+
+        field, operator, value = match.group("field").lower(), match.group("operator"), match.group("value")
+        if not value:
+            raise ValueError(f"Value is missing in '{word}'")
+
+        if field == RES_FIELD:
+            if not value.isdigit():
+                raise ValueError(f"Resolution should be a number in '{word}'")
+            terms.append(QueryTerm(field, operator, value, False))
+        elif field in TEXT_FIELDS:
+            if operator not in ("=", "!="):
+                raise ValueError(f"Only = and != are valid for '{field}' in '{word}'")
+            terms.append(QueryTerm(field, operator, value.rstrip("*").upper(), value.endswith("*")))
+        else:
+            raise ValueError(f"Unknown field '{field}' in '{word}', valid fields are: {TEXT_FIELDS + [RES_FIELD]}")
+    return terms
+
+
+def get_status(is_valid: Optional[bool]) -> str:
+    if is_valid is None:
+        return STATUS_PENDING
+    return STATUS_PASS if is_valid else STATUS_FAIL
+
+
+class TextureSetIndex:
+    def __init__(self, texset_rows: Iterable = ()):
+        """ texset_rows: records with name, width, height and is_valid, e.g. module_texset_model.TextureSetRow """
+        # field -> value -> rows
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in TEXT_FIELDS}
+        # field -> sorted values, for the prefix lookups
+        self.sorted_values: Dict[str, List[str]] = {}
+        self.resolutions: List[int] = []
+        self.rows_by_resolution: List[int] = []
+        self.all_rows: Set[int] = set()
+
+        resolution_rows = []
+        for i, texset_row in enumerate(texset_rows):
+            self.all_rows.add(i)
+            self.add_posting("name", texset_row.name.upper(), i)
+            self.add_posting("status", get_status(texset_row.is_valid), i)
+            parsed_name = module_validation_name.parse_name(texset_row.name)
+            if parsed_name is not None:
+                for field, attribute in ACRONYM_FIELDS.items():
+                    self.add_posting(field, getattr(parsed_name, attribute).upper(), i)
+            resolution_rows.append((max(texset_row.width, texset_row.height), i))
+
+        for field, postings in self.postings.items():
+            self.sorted_values[field] = sorted(postings)
+        resolution_rows.sort()
+        self.resolutions = [resolution for resolution, _ in resolution_rows]
+        self.rows_by_resolution = [i for _, i in resolution_rows]
+
+    def add_posting(self, field: str, value: str, row: int):
+        self.postings[field].setdefault(value, set()).add(row)
+
+    def __len__(self):
+        return len(self.all_rows)
+
+    def find_text(self, field: str, value: str, is_prefix: bool) -> Set[int]:
+        postings = self.postings[field]
+        if not is_prefix:
+            return postings.get(value, set())
+
+        sorted_values = self.sorted_values[field]
+        rows = set()
+        for j in range(bisect_left(sorted_values, value), len(sorted_values)):
+            if not sorted_values[j].startswith(value):
+                break
+            rows |= postings[sorted_values[j]]
+        return rows
+
+    def find_resolution(self, operator: str, resolution: int) -> Set[int]:
+        first = bisect_left(self.resolutions, resolution)
+        last = bisect_right(self.resolutions, resolution)
+        if operator == ">":
+            return set(self.rows_by_resolution[last:])
+        if operator == ">=":
+            return set(self.rows_by_resolution[first:])
+        if operator == "<":
+            return set(self.rows_by_resolution[:first])
+        if operator == "<=":
+            return set(self.rows_by_resolution[:last])
+        rows = set(self.rows_by_resolution[first:last])
+        return rows if operator == "=" else self.all_rows - rows
+
+    def find_term(self, term: QueryTerm) -> Set[int]:
+        if term.field is None:
+            rows = set()
+            for field in ("name", *ACRONYM_FIELDS):
+                rows |= self.find_text(field, term.value, True)
+            return rows
+
+        if term.field == RES_FIELD:
+            return self.find_resolution(term.operator, int(term.value))
+
+        rows = self.find_text(term.field, term.value, term.is_prefix)
+        return rows if term.operator == "=" else self.all_rows - rows
+
+    def search(self, query: str) -> Set[int]:
+        """ Rows matching all the terms of the query, all the rows for an empty query. Raises ValueError for invalid queries. """
+        terms = parse_query(query)
+        # Terms are intersected starting from the most selective one
+        matching_rows = None
+        for rows in sorted((self.find_term(term) for term in terms), key=len):
+            matching_rows = set(rows) if matching_rows is None else matching_rows & rows
+            if not matching_rows:
+                break
+        return set(self.all_rows) if matching_rows is None else matching_rows
@@ -0,0 +1,291 @@
+"""
+    Module with the Qt model behind the Custom Exporter texture set table.
+
+    Rows are kept in a compact row store of TextureSetRow records, no widgets are created per row:
+    the Export checkbox is painted from the check state role, the Shader Type combo box
+    and the Targets menu are only created by the delegates while the cell is edited.
+    Filtering and sorting are done by TextureSetProxyModel on top of the model,
+    rows matching the search are looked up in module_texset_index.
+
+    Content:
+        - TextureSetRow
+        - TextureSetTableModel
+        - TextureSetProxyModel
+        - ShaderTypeDelegate
+        - ExportTargetsDelegate
+"""
+
+from typing import Iterable, List, Optional, Set, Tuple
+
+from PySide2 import QtCore, QtWidgets
+
+EXPORT_COLUMN = 0
+NAME_COLUMN = 1
+SHADER_TYPE_COLUMN = 2
+EXPORT_TARGETS_COLUMN = 3
+RESOLUTION_COLUMN = 4
+EXPORT_PATH_COLUMN = 5
+VALIDATION_COLUMN = 6
+
+COLUMN_HEADERS = ["Export", "Texture Set Name", "Shader Type", "Targets", "Resolution", "Export Path", "Validation"]
+
+SORT_ROLE = QtCore.Qt.UserRole + 1
+
+
+class TextureSetRow:
+    __slots__ = (
+            "name",
+            "shader_type",
+            "export_targets",
+            "width",
+            "height",
+            "export_path",
+            "is_checked",
+            "res_is_valid",
+            "is_valid",
+            "validation_tooltip",
+            "validation_result",
+            "export_state",
+            "export_details",
+            "rendered_inputs",
+            )
+
+    def __init__(self, name: str, shader_type: str, width: int, height: int, export_targets: Tuple[str, ...] = ()):
+        self.name = name
+        self.shader_type = shader_type
+        self.export_targets = export_targets
+        self.width = width
+        self.height = height
+        self.export_path = ""
+        # Rows are checked by their first validation, rows which are still populated are never exported
+        self.is_checked = False
+        self.res_is_valid = None
+        self.is_valid = None
+        self.validation_tooltip = ""
+        self.validation_result = None
+        self.export_state = ""
+        self.export_details = ""
+        # Inputs the row was last rendered with, see CustomExporter.on_refresh_texset_table
+        self.rendered_inputs = {}
+
+
+class TextureSetTableModel(QtCore.QAbstractTableModel):
+    # source row
+    shader_type_changed = QtCore.Signal(int)
+
+    def __init__(self, icon_validation_ok, icon_validation_fail, parent=None):
+        super().__init__(parent)
+        self.rows: List[TextureSetRow] = []
+        self.row_by_name = {}
+        self.icon_validation_ok = icon_validation_ok
+        self.icon_validation_fail = icon_validation_fail
+
+    def set_rows(self, rows: List[TextureSetRow]):
+        self.beginResetModel()
+        self.rows = rows
+        self.row_by_name = {row.name: i for i, row in enumerate(rows)}
+        self.endResetModel()
+
+    def find_row(self, texture_set_name: str) -> Optional[int]:
+        return self.row_by_name.get(texture_set_name)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return COLUMN_HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self.rows[index.row()]
+        column = index.column()
+
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            if column == NAME_COLUMN:
+                return row.name
+            if column == SHADER_TYPE_COLUMN:
+                return row.shader_type
+            if column == EXPORT_TARGETS_COLUMN:
+                return ", ".join(row.export_targets) if role == QtCore.Qt.DisplayRole else row.export_targets
+            if column == RESOLUTION_COLUMN:
+                return f"{row.width} x {row.height}"
+            if column == EXPORT_PATH_COLUMN:
+                return row.export_path
+            if column == VALIDATION_COLUMN:
+                return row.export_state
+
+        elif role == QtCore.Qt.CheckStateRole and column == EXPORT_COLUMN:
+            return QtCore.Qt.Checked if row.is_checked else QtCore.Qt.Unchecked
+
+        elif role == QtCore.Qt.DecorationRole and column == VALIDATION_COLUMN and row.is_valid is not None:
+            return self.icon_validation_ok if row.is_valid else self.icon_validation_fail
+
+        elif role == QtCore.Qt.ToolTipRole:
+            if column == SHADER_TYPE_COLUMN:
+                return "Specify Type of the export preset to be used during the export"
+            if column == EXPORT_TARGETS_COLUMN:
+                return "Specify target platforms the texture set is exported for, all of them are produced by the same export"
+            if column == VALIDATION_COLUMN and row.export_state:
+                return f"Export state of texture set {row.name}: {row.export_state} \
+                        \n{row.export_details}"
+            if column in (EXPORT_COLUMN, VALIDATION_COLUMN):
+                return row.validation_tooltip
+
+        elif role == SORT_ROLE:
+            if column == EXPORT_COLUMN:
+                return int(row.is_checked)
+            if column == RESOLUTION_COLUMN:
+                return row.width * row.height
+            if column == VALIDATION_COLUMN:
+                return int(bool(row.is_valid))
+            return self.data(index, QtCore.Qt.DisplayRole)
+
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+
+        row = self.rows[index.row()]
+        column = index.column()
+        flags = QtCore.Qt.ItemIsSelectable
+
+        if column == EXPORT_COLUMN:
+            flags |= QtCore.Qt.ItemIsUserCheckable
+            if row.is_valid:
+                flags |= QtCore.Qt.ItemIsEnabled
+        elif column == VALIDATION_COLUMN or row.is_checked:
+            # Unchecked rows are grayed out
+            flags |= QtCore.Qt.ItemIsEnabled
+
+        if column in (SHADER_TYPE_COLUMN, EXPORT_TARGETS_COLUMN):
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid():
+            return False
+
+        row = self.rows[index.row()]
+        column = index.column()
+
+        if role == QtCore.Qt.CheckStateRole and column == EXPORT_COLUMN:
+            row.is_checked = value == QtCore.Qt.Checked
+            self.update_rows([index.row()])
+            return True
+
+        if role == QtCore.Qt.EditRole and column == SHADER_TYPE_COLUMN and value != row.shader_type:
+            row.shader_type = value
+            self.dataChanged.emit(index, index)
+            self.shader_type_changed.emit(index.row())
+            return True
+
+        if role == QtCore.Qt.EditRole and column == EXPORT_TARGETS_COLUMN and value:
+            row.export_targets = tuple(value)
+            self.dataChanged.emit(index, index)
+            return True
+
+        return False
+
+    def update_rows(self, rows: Iterable[int], first_column: int = EXPORT_COLUMN, last_column: int = VALIDATION_COLUMN):
+        """ Notifies the views about changed rows, contiguous rows are merged into a single notification. """
+        rows = sorted(rows)
+        start = None
+        for i, row in enumerate(rows):
+            if start is None:
+                start = row
+            if i + 1 == len(rows) or rows[i + 1] != row + 1:
+                self.dataChanged.emit(self.index(start, first_column), self.index(row, last_column))
+                start = None
+
+    def set_export_state(self, texture_set_name: str, export_state: str, export_details: str):
+        i = self.find_row(texture_set_name)
+        if i is None:
+            return
+
+        row = self.rows[i]
+        row.export_state = export_state
+        row.export_details = export_details
+        self.update_rows([i], VALIDATION_COLUMN, VALIDATION_COLUMN)
+
+
+class TextureSetProxyModel(QtCore.QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        # Source rows matching the search, None shows all the rows
+        self.matching_rows: Optional[Set[int]] = None
+
+    def set_matching_rows(self, matching_rows: Optional[Set[int]]):
+        self.matching_rows = matching_rows
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.matching_rows is None or source_row in self.matching_rows
+
+    def map_rows_to_source(self, indexes) -> List[int]:
+        return sorted({self.mapToSource(index).row() for index in indexes})
+
+
+class ShaderTypeDelegate(QtWidgets.QStyledItemDelegate):
+    """ Combo box editor, created only for the cell being edited. """
+
+    def __init__(self, shader_types: List[str], parent=None):
+        super().__init__(parent)
+        self.shader_types = shader_types
+
+    def createEditor(self, parent, option, index):
+        combo_box = QtWidgets.QComboBox(parent)
+        combo_box.addItems(self.shader_types)
+        combo_box.activated.connect(lambda _: self.commitData.emit(combo_box))
+        return combo_box
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(QtCore.Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), QtCore.Qt.EditRole)
+
+
+class ExportTargetsDelegate(QtWidgets.QStyledItemDelegate):
+    """ Menu of checkable export targets, created only for the cell being edited. At least one target stays checked. """
+
+    def __init__(self, export_targets: List[str], parent=None):
+        super().__init__(parent)
+        self.export_targets = export_targets
+
+    def createEditor(self, parent, option, index):
+        tool_button = QtWidgets.QToolButton(parent)
+        tool_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        menu = QtWidgets.QMenu(tool_button)
+        for export_target in self.export_targets:
+            action = menu.addAction(export_target)
+            action.setCheckable(True)
+            action.toggled.connect(lambda _: self.on_export_target_toggled(tool_button))
+        tool_button.setMenu(menu)
+        return tool_button
+
+    def on_export_target_toggled(self, tool_button):
+        tool_button.setText(", ".join(self.get_checked_targets(tool_button)))
+        self.commitData.emit(tool_button)
+
+    def get_checked_targets(self, tool_button) -> List[str]:
+        return [action.text() for action in tool_button.menu().actions() if action.isChecked()]
+
+    def setEditorData(self, editor, index):
+        export_targets = index.data(QtCore.Qt.EditRole)
+        for action in editor.menu().actions():
+            action.blockSignals(True)
+            action.setChecked(action.text() in export_targets)
+            action.blockSignals(False)
+        editor.setText(", ".join(export_targets))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, self.get_checked_targets(editor), QtCore.Qt.EditRole)
@@ -0,0 +1,204 @@
+"""
+    Module to audit exported textures against the texture budget of the asset type.
+
+    The texture set resolution validation only checks the declared resolution.
+    The audit is reading what actually landed on disk, one image at a time,
+    and computes with NumPy:
+        - on disk size
+        - estimated GPU memory with full mip chain (uncompressed)
+        - constant channels, e.g. fully opaque alpha
+        - uniform maps, which could be swapped for a constant value
+    Pillow decodes every image once, its pixels are then reduced strip by strip, so NumPy never copies more than
+    a strip of the image, and the scan stops as soon as none of the channels could be constant anymore.
+    GPU memory of all the maps of a texture set is checked against the memory budget of the asset type.
+    Files which could not be read, e.g. EXR outputs or files removed since the export, are reported as audit failures.
+    The audit could be run in a worker thread, so the UI is not blocked while the images are decoded.
+
+    NumPy and Pillow are optional dependencies, required only to run the audit.
+
+    Content:
+        - audit_texture
+        - audit_exported_textures
+        - audit_exported_textures_in_background
+        - format_audit_report
+"""
+
+import concurrent.futures
+import os
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+import module_resolution_fix
+
+# GPU memory budget of a texture set per asset type: all its maps with full mip chains, uncompressed
+texture_set_gpu_budgets = {
+        "Props": 32 * 2 ** 20,
+        "Weapons": 128 * 2 ** 20,
+        "Characters": 512 * 2 ** 20,
+        }
+# Strictest budget, used for asset types without their own one
+default_texture_set_gpu_budget = min(texture_set_gpu_budgets.values())
+# Rows of an image reduced at once
+AUDIT_STRIP_ROWS = 256
+
+
+class TextureAudit(NamedTuple):
+    file_path: str
+    width: int
+    height: int
+    channels: int
+    disk_bytes: int
+    gpu_bytes: int
+    constant_channels: List[int]
+    constant_value: Tuple
+    is_uniform: bool
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy and Pillow are required for the texture audit. Install them with: pip install numpy Pillow")
+
+
+def get_texture_set_gpu_budget(asset_type: str) -> int:
+    return texture_set_gpu_budgets.get(asset_type, default_texture_set_gpu_budget)
+
+
+def audit_texture(file_path: str) -> TextureAudit:
+    require_numpy()
+    channel_min = None
+    channel_max = None
+    with Image.open(file_path) as image:
+        width, height = image.size
+        for top in range(0, height, AUDIT_STRIP_ROWS):
+            strip = np.asarray(image.crop((0, top, width, min(height, top + AUDIT_STRIP_ROWS))))
+            # Grayscale images are loaded as 2D arrays
+            if strip.ndim == 2:
+                strip = strip[:, :, np.newaxis]
+            channels = strip.shape[2]
+            bytes_per_channel = strip.dtype.itemsize
+
+            # Min and max for all the channels in a single pass over the flattened strip
+            flat_strip = strip.reshape(-1, channels)
+            strip_min = flat_strip.min(axis=0)
+            strip_max = flat_strip.max(axis=0)
+            channel_min = strip_min if channel_min is None else np.minimum(channel_min, strip_min)
+            channel_max = strip_max if channel_max is None else np.maximum(channel_max, strip_max)
+            if not (channel_min == channel_max).any():
+                break
+
+    is_channel_constant = channel_min == channel_max
+    constant_channels = np.flatnonzero(is_channel_constant).tolist()
+    is_uniform = bool(is_channel_constant.all())
+    constant_value = tuple(channel_min.tolist()) if is_uniform else ()
+
+    gpu_bytes = int(width * height * channels * bytes_per_channel * module_resolution_fix.MIP_CHAIN_FACTOR)
+
+    return TextureAudit(
+            file_path=file_path,
+            width=width,
+            height=height,
+            channels=channels,
+            disk_bytes=os.path.getsize(file_path),
+            gpu_bytes=gpu_bytes,
+            constant_channels=constant_channels,
+            constant_value=constant_value,
+            is_uniform=is_uniform,
+            )
+
+
+def audit_exported_textures(exported_textures: Dict[str, List[str]], asset_type: str) -> Dict:
+    """
+    Audits exported files of every texture set: {texture_set_name: [exported_file_path, ...]}
+    Images are read one by one, so memory usage is bound by the biggest texture.
+    Raises RuntimeError if NumPy or Pillow is missing.
+    """
+    require_numpy()
+    gpu_budget_bytes = get_texture_set_gpu_budget(asset_type)
+    report = {"asset_type": asset_type, "gpu_budget_bytes": gpu_budget_bytes, "texture_sets": {}, "failures": [], "totals": {}}
+    total_disk_bytes = 0
+    total_gpu_bytes = 0
+    reclaimable_gpu_bytes = 0
+    over_budget_count = 0
+
+    for texture_set_name, exported_files in exported_textures.items():
+        texture_audits = []
+        for exported_file in exported_files:
+            try:
+                texture_audits.append(audit_texture(exported_file))
+            except (OSError, ValueError) as error:
+                # PIL UnidentifiedImageError is an OSError
+                report["failures"].append({"texture_set_name": texture_set_name, "file_path": exported_file, "error": str(error)})
+
+        texture_set_gpu_bytes = sum(texture_audit.gpu_bytes for texture_audit in texture_audits)
+        is_over_budget = texture_set_gpu_bytes > gpu_budget_bytes
+        report["texture_sets"][texture_set_name] = {
+                "textures": [texture_audit._asdict() for texture_audit in texture_audits],
+                "gpu_bytes": texture_set_gpu_bytes,
+                "is_over_budget": is_over_budget,
+                }
+
+        total_disk_bytes += sum(texture_audit.disk_bytes for texture_audit in texture_audits)
+        total_gpu_bytes += texture_set_gpu_bytes
+        reclaimable_gpu_bytes += sum(texture_audit.gpu_bytes for texture_audit in texture_audits if texture_audit.is_uniform)
+        over_budget_count += is_over_budget
+
+    report["totals"] = {
+            "disk_bytes": total_disk_bytes,
+            "gpu_bytes": total_gpu_bytes,
+            "reclaimable_gpu_bytes": reclaimable_gpu_bytes,
+            "over_budget_count": over_budget_count,
+            "failed_count": len(report["failures"]),
+            }
+    return report
+
+
+def audit_exported_textures_in_background(exported_textures: Dict[str, List[str]], asset_type: str) -> concurrent.futures.Future:
+    """
+    Runs audit_exported_textures in a worker thread, the future is resolved with the audit report.
+    Pillow and NumPy are releasing the GIL while decoding and reducing the images.
+    Raises RuntimeError if NumPy or Pillow is missing.
+    """
+    require_numpy()
+    future = concurrent.futures.Future()
+
+    def audit_in_background():
+        try:
+            future.set_result(audit_exported_textures(exported_textures, asset_type))
+        except Exception as error:  # reported through the future
+            future.set_exception(error)
+
+    threading.Thread(target=audit_in_background, daemon=True).start()
+    return future
+
+
+def format_audit_report(report: Dict) -> List[str]:
+    """ Human readable lines of the audit report, only textures and texture sets with findings are listed. """
+    lines = []
+    for texture_set_name, texture_set_audit in report["texture_sets"].items():
+        for texture_audit in texture_set_audit["textures"]:
+            file_name = os.path.basename(texture_audit["file_path"])
+            if texture_audit["is_uniform"]:
+                lines.append(f"{texture_set_name}: {file_name} is uniform {texture_audit['constant_value']}, could be replaced by a constant")
+            elif texture_audit["constant_channels"]:
+                lines.append(f"{texture_set_name}: {file_name} has constant channels {texture_audit['constant_channels']}")
+        if texture_set_audit["is_over_budget"]:
+            lines.append(f"{texture_set_name} is over the {report['asset_type']} GPU memory budget: \
+                        {texture_set_audit['gpu_bytes'] / 2**20:.1f} MB of {report['gpu_budget_bytes'] / 2**20:.1f} MB")
+
+    for failure in report.get("failures", []):
+        lines.append(f"{failure['texture_set_name']}: {os.path.basename(failure['file_path'])} could not be audited: {failure['error']}")
+
+    totals = report["totals"]
+    lines.append(f"Total on disk: {totals['disk_bytes'] / 2**20:.1f} MB; \
+                Total on GPU with mips: {totals['gpu_bytes'] / 2**20:.1f} MB; \
+                Reclaimable by constants: {totals['reclaimable_gpu_bytes'] / 2**20:.1f} MB; \
+                Over budget texture sets: {totals['over_budget_count']}; \
+                Failed audits: {totals.get('failed_count', 0)}")
+    return lines
@@ -1,170 +1,182 @@
 """
-    Module to validate Texture Set name. 
-    
+    Module to validate Texture Set name.
+
     Rules:
     Name should be splitted with _
     Name should consists of acronyms: AssetType_AssetDetail1_AssetDetail2_AssetID
-    
-    For Props, details are Prop Type and Size/Scale:
-        Prop Type could be: "CHR" (Chair), "TBL" (Table), LMP (Lamp), or WIN (Window).
-        Prop Size/Scale could be: "S" (Small), "M" (Medium), or "L" (Large).
-        Valid Texture Set names for Props:
-            Prop_CHR_S_01
-            Prop_BKL_M_02
-    
-    For Weapons, details are Weapon Type and Rarity:
-        Weapon Type could be: "SWD: (Sword), "BOW" (Bow), "RFL" (Rifle), or "EXP" (Explosive).
-        Weapon Rarity could be: "COM" (Common),  "RAR" (Rare), or "EPC" (Epic).
-        Valid Texture Set names for Weapons:
-            WPN_BOW_COM_01
-            WPN_RLF_EPC_04
-    
-    For Character, details are Character Type and Gender
-        Character Type could be: "PLR" (Player), "ENM" (Enemy), or "CIV" (Civilian).
-        Character Gender could be: Male (ML), or Female (FL).
-        Valid Texture Set names for Characters:
-            CHAR_PLR_ML_01
-            CHAR_CIV_FM_05
+    Asset ID has to match the asset_id_pattern, by default any number from range 00 to 99.
+
+    Valid acronyms for every Asset Type are declared in naming_rules.json:
+        {
+            "separator": "_",
+            "asset_id_pattern": "[0-9]{2}",
+            "asset_types": {
+                "Props": {
+                    "asset_type_acronym": "PROP",
+                    "asset_detail_1": ["CHR", "TBL", "LMP", "WIN"],
+                    "asset_detail_2": ["S", "M", "L"]
+                },
+                ...
+            }
+        }
+    Valid Texture Set names: PROP_CHR_S_01, WPN_BOW_COM_01, CHAR_CIV_FL_05
+
+    Rules file could be overridden with CUSTOM_EXPORTER_NAMING_RULES environment variable.
+    Rules are compiled once, when the module is loaded, into a single regex per Asset Type
+    used as the fast path for valid names. Detailed error messages are only built for invalid names.
 
     Content:
+        - load_naming_rules
+        - get_asset_types
+        - parse_name
         - validate_name
-        - validate_name_props
-        - validate_name_characters
-        - validate_name_weapon
 
     Contributors:
         - Viacheslav Makhynko, viacheslav.makhynko@gmail.com
 """
 
-from typing import Tuple
-
-props_asset_detail_1_list = ["CHR", "TBL", "LMP", "WIN"]
-props_asset_detail_2_list = ["S", "M", "L"]
-
-weapons_asset_detail_1_list = ["SWD", "BOW", "RFL", "EXP"]
-weapons_asset_detail_2_list = ["COM", "RAR", "EPC"]
-
-character_asset_detail_1_list = ["PLR", "ENM", "CIV"]
-character_asset_detail_2_list = ["ML", "FL"]
-
-
-def validate_name_props(asset_type_acronym: str, asset_type_detail_1: str, asset_type_detail_2: str) -> Tuple[bool, str]:
-    """ Sub-validation fucntion used for specific rules check applied to Characters Texture sets. """
-    is_validation_passed = None
-    validation_details = None
-    if asset_type_acronym != "PROP":
-        is_validation_passed = False
-        validation_details = f"First acronym is for Asset Type \
-                            \nFor asset type 'Props' valid option is 'PROP'. \
-                            \nCurrent acronyms is: {asset_type_acronym}"
-
-    elif asset_type_detail_1 not in props_asset_detail_1_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #1 \
-                            \nFor 'Props' valid option are {props_asset_detail_1_list}. \
-                            \nCurrent acronyms is: {asset_type_detail_1}"
-
-    elif asset_type_detail_2 not in props_asset_detail_2_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #2 \
-                            \nFor 'Props' valid option are {props_asset_detail_2_list}. \
-                            \nCurrent acronyms is: {asset_type_detail_2}"
-    else:
-        is_validation_passed = True
-        validation_details = "Validation is passed!"
-
-    return is_validation_passed, validation_details
-
-
-def validate_name_weapons(asset_type_acronym: str, asset_type_detail_1: str, asset_type_detail_2: str) -> Tuple[bool, str]:
-    """ Sub-validation fucntion used for specific rules check applied to Weapons Texture sets. """
-    is_validation_passed = None
-    validation_details = None
-    if asset_type_acronym != "WPN":
-        is_validation_passed = False
-        validation_details = f"First acronym is for Asset Type \
-                            \nFor asset type 'Weapons' valid option is 'WPN'. \
-                            \nCurrent acronyms is: {asset_type_acronym}"
-
-    elif asset_type_detail_1 not in weapons_asset_detail_1_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #1 \
-                            \nFor 'Weapons' valid option are {weapons_asset_detail_1_list}. \
-                            \nCurrent acronyms is: {asset_type_detail_1}"
-
-    elif asset_type_detail_2 not in weapons_asset_detail_2_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #2 \
-                            \nFor 'Weapons' valid option are {weapons_asset_detail_2_list}. \
-                            \nCurrent acronyms is: {asset_type_detail_2}"
-
-    else:
-        is_validation_passed = True
-        validation_details = "Validation is passed!"
-
-    return is_validation_passed, validation_details
-
-
-def validate_name_characters(asset_type_acronym: str, asset_type_detail_1: str, asset_type_detail_2: str) -> Tuple[bool, str]:
-    """ Sub-validation fucntion used for specific rules check applied to Characters Texture sets. """
-    is_validation_passed = None
-    validation_details = None
-    if asset_type_acronym != "CHAR":
-        is_validation_passed = False
-        validation_details = f"First acronym is for Asset Type \
-                            \nFor asset type 'Characters' valid option is 'CHAR'. \
-                            \nCurrent acronyms is: {asset_type_acronym}"
-
-    elif asset_type_detail_1 not in character_asset_detail_1_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #1 \
-                            \nFor 'Characters' valid option are {character_asset_detail_1_list}. \
-                            \nCurrent acronyms is: {asset_type_detail_1}"
-
-    elif asset_type_detail_2 not in character_asset_detail_2_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #2 \
-                            \nFor 'Characters' valid option are {character_asset_detail_2_list}. \
-                            \nCurrent acronyms is: {asset_type_detail_1}"
-
-    else:
-        is_validation_passed = True
-        validation_details = "Validation is passed!"
-
-    return is_validation_passed, validation_details
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, NamedTuple, Optional, Pattern, Tuple
+
+DEFAULT_NAMING_RULES_PATH = os.path.join(os.path.dirname(__file__), "naming_rules.json")
+
+
+class NamingRule(NamedTuple):
+    asset_type: str
+    asset_type_acronym: str
+    asset_detail_1: Tuple[str, ...]
+    asset_detail_2: Tuple[str, ...]
+    asset_detail_1_set: FrozenSet[str]
+    asset_detail_2_set: FrozenSet[str]
+    pattern: Pattern
+
+
+class ParsedName(NamedTuple):
+    asset_type_acronym: str
+    asset_detail_1: str
+    asset_detail_2: str
+    asset_id: str
+
+
+separator = "_"
+asset_id_pattern = re.compile("[0-9]{2}")
+naming_rules: Dict[str, NamingRule] = {}
+
+
+def compile_naming_rule(asset_type: str, rule: Dict) -> NamingRule:
+    asset_detail_1 = tuple(rule["asset_detail_1"])
+    asset_detail_2 = tuple(rule["asset_detail_2"])
+    pattern = re.escape(separator).join([
+        re.escape(rule["asset_type_acronym"]),
+        f"(?:{'|'.join(map(re.escape, asset_detail_1))})",
+        f"(?:{'|'.join(map(re.escape, asset_detail_2))})",
+        f"(?:{asset_id_pattern.pattern})",
+        ])
+
+    return NamingRule(
+            asset_type=asset_type,
+            asset_type_acronym=rule["asset_type_acronym"],
+            asset_detail_1=asset_detail_1,
+            asset_detail_2=asset_detail_2,
+            asset_detail_1_set=frozenset(asset_detail_1),
+            asset_detail_2_set=frozenset(asset_detail_2),
+            pattern=re.compile(pattern),
+            )
+
+
+def load_naming_rules(naming_rules_path: str = None):
+    """ Loads and compiles naming rules. Previously cached validation results are dropped. """
+    global separator, asset_id_pattern
+
+    naming_rules_path = naming_rules_path or os.environ.get("CUSTOM_EXPORTER_NAMING_RULES", DEFAULT_NAMING_RULES_PATH)
+    with open(naming_rules_path, "r") as file:
+        naming_rules_data = json.load(file)
+
+    separator = naming_rules_data.get("separator", "_")
+    asset_id_pattern = re.compile(naming_rules_data.get("asset_id_pattern", "[0-9]{2}"))
 
+    naming_rules.clear()
+    for asset_type, rule in naming_rules_data["asset_types"].items():
+        naming_rules[asset_type] = compile_naming_rule(asset_type, rule)
 
+    validate_name.cache_clear()
+
+
+def get_asset_types():
+    return list(naming_rules)
+
+
+def parse_name(texture_set_name: str) -> Optional[ParsedName]:
+    """ Splits the name into its acronyms, None if the name doesn't have the structure. Acronyms themselves are not validated. """
+    texture_set_name_acronyms = texture_set_name.split(separator)
+    if len(texture_set_name_acronyms) != 4:
+        return None
+    return ParsedName(*texture_set_name_acronyms)
+
+
+def describe_asset_id_rule() -> str:
+    """ Digit counts, e.g. [0-9]{2}, are described as a range of numbers, other patterns are shown as they are. """
+    digits_match = re.fullmatch(r"\[0-9\]\{(\d+)\}", asset_id_pattern.pattern)
+    if digits_match is None:
+        return f"Valid options are matching the pattern {asset_id_pattern.pattern}"
+
+    digits = int(digits_match.group(1))
+    return f"Valid options are any number from range {0:0{digits}d} to {10 ** digits - 1}. Example: {1:0{digits}d}, {10 ** digits - 1}"
+
+
+def explain_name_error(naming_rule: NamingRule, asset_type_acronym: str, asset_type_detail_1: str, asset_type_detail_2: str) -> str:
+    """ Builds the detailed message for the first acronym which breaks the rules of the Asset Type. """
+    if asset_type_acronym != naming_rule.asset_type_acronym:
+        return f"First acronym is for Asset Type \
+                \nFor asset type '{naming_rule.asset_type}' valid option is '{naming_rule.asset_type_acronym}'. \
+                \nCurrent acronyms is: {asset_type_acronym}"
+
+    if asset_type_detail_1 not in naming_rule.asset_detail_1_set:
+        return f"Second acronym is for Asset Detail #1 \
+                \nFor '{naming_rule.asset_type}' valid option are {list(naming_rule.asset_detail_1)}. \
+                \nCurrent acronyms is: {asset_type_detail_1}"
+
+    return f"Third acronym is for Asset Detail #2 \
+            \nFor '{naming_rule.asset_type}' valid option are {list(naming_rule.asset_detail_2)}. \
+            \nCurrent acronyms is: {asset_type_detail_2}"
+
+
+@lru_cache(maxsize=65536)
 def validate_name(asset_type: str, texture_set_name: str) -> Tuple[bool, str]:
     """
     Core function to validate texture set name.
-    Performs general rules validation and, if thy are passed,
-    triggers sub-validation functions for specific asset type.
+    Valid names are matched with the compiled regex of the asset type,
+    the rules are checked one by one only to explain why the name is invalid.
     """
-    texture_set_name_acronyms = texture_set_name.split("_")
+    naming_rule = naming_rules.get(asset_type)
+    if naming_rule is not None and naming_rule.pattern.fullmatch(texture_set_name):
+        return True, "Validation is passed!"
+
+    texture_set_name_acronyms = texture_set_name.split(separator)
 
     # Template vallidation
     if len(texture_set_name_acronyms) != 4:
-        return False, f"Texture Set name should consist of 4 acronyms separated by underscored _ \
+        return False, f"Texture Set name should consist of 4 acronyms separated by underscored {separator} \
                         \nValid structure: AssetType_AssetDetail1_AssetDetail2_AssetID\
                         \nCurrent number of acronyms: {len(texture_set_name_acronyms)}"
 
     asset_type_acronym, asset_type_detail_1, asset_type_detail_2, asset_id = texture_set_name_acronyms
 
     # Asset ID Validation
-    if (len(asset_id) != 2) or (not asset_id.isdigit()):
+    if not asset_id_pattern.fullmatch(asset_id):
         return False, f"last acronym is used to specify Asset ID \
-                        \nValid options are any number from range 00 to 99. Example: 01, 55, 99\
-                        \nCurrent acronyms is: {len(asset_id)}"
+                        \n{describe_asset_id_rule()}\
+                        \nCurrent acronyms is: {asset_id}"
 
-    if asset_type == "Props":
-        return validate_name_props(asset_type_acronym, asset_type_detail_1, asset_type_detail_2)
+    if naming_rule is None:
+        return False, "General validation error. Asset Type is not valid \
+                        \nThere is a mismatch between Asset Type in the Dropdown list of the widget with the Asset Types in naming_rules.json \
+                        \nPlease, contact a tool maintaner for the assistance"
 
-    elif asset_type == "Weapons":
-        return validate_name_weapons(asset_type_acronym, asset_type_detail_1, asset_type_detail_2)
+    return False, explain_name_error(naming_rule, asset_type_acronym, asset_type_detail_1, asset_type_detail_2)
 
-    elif asset_type == "Characters":
-        return validate_name_characters(asset_type_acronym, asset_type_detail_1, asset_type_detail_2)
 
-    return False, "General validation error. Asset Type is not valid \
-                    \nThere is a mismatch between Asset Type in the Dropdown list of the widget with the strings in alidate_name function \
-                    \nPlease, contact a tool maintaner for the assistance"
+load_naming_rules()
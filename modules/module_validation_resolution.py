@@ -1,4 +1,12 @@
-import substance_painter as sp
+import logging
+
+# Painter is optional, so the validation could be run headless, e.g. by module_batch_validation
+try:
+    import substance_painter as sp
+except ImportError:
+    sp = None
+
+logger = logging.getLogger("custom_exporter")
 
 res_requirement = {
     "Props": [1024, 1024],
@@ -7,14 +15,22 @@ res_requirement = {
 }
 
 
+def log_warning(message):
+    if sp is not None:
+        sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", message)
+    else:
+        logger.warning(message)
+
+
+# Strictest budget, used for asset types without their own one
+default_res_requirement = min(res_requirement.values(), key=sum)
+
+
 def get_required_res_from_asset_type(asset_type):
     required_res = res_requirement.get(asset_type)
     if required_res is None:
-        strict_res_values = min(res_requirement.values(), key=sum)
-        required_res_width, required_res_height = strict_res_values
-        sp.logging.log(
-            sp.logging.WARNING,
-            "CUSTOM EXPORTER",
+        required_res_width, required_res_height = default_res_requirement
+        log_warning(
             f"There is no resolution budget for the asset type {asset_type}. \
             Fallback to the default {required_res_width} x {required_res_height}",
         )
@@ -24,11 +40,14 @@ def get_required_res_from_asset_type(asset_type):
     return required_res_width, required_res_height
 
 
-def validate_res(asset_type, current_texture_set_res):
+def validate_res(asset_type, current_texture_set_res, required_res=None):
+    """ required_res: budget of the asset type, if it was already looked up. """
     is_valitadion_passed = None
     validation_details = None
 
-    required_res_width, required_res_height = get_required_res_from_asset_type(asset_type)
+    if required_res is None:
+        required_res = get_required_res_from_asset_type(asset_type)
+    required_res_width, required_res_height = required_res
     if current_texture_set_res.width > required_res_width or current_texture_set_res.height > required_res_height:
         is_valitadion_passed = False
         validation_details = f"Current resolution for Texture Set is {current_texture_set_res.width} x {current_texture_set_res.height}, \
@@ -0,0 +1,78 @@
+"""
+    Module to validate Texture Sets with memoized results.
+
+    Resolution budgets of all the Asset Types are looked up once, when the rules are loaded.
+    Validation result of a texture set depends only on (asset_type, texture_set_name, width, height),
+    so results are kept in a bounded LRU cache keyed on that tuple. Refreshes of the widget,
+    e.g. after a Shader Type change, are then served from the cache.
+
+    Painter is not required, the same validation is run headless by module_batch_validation.
+
+    Content:
+        - Resolution
+        - ValidationResult
+        - load_validation_rules
+        - validate_texture_set
+        - validate_texture_sets
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import module_validation_name
+import module_validation_resolution
+
+
+class Resolution(NamedTuple):
+    """ Stand-in for substance_painter.textureset.Resolution """
+    width: int
+    height: int
+
+
+class ValidationResult(NamedTuple):
+    res_is_valid: bool
+    res_validation_details: str
+    name_is_valid: bool
+    name_validation_details: str
+
+    @property
+    def is_valid(self) -> bool:
+        return self.res_is_valid and self.name_is_valid
+
+
+required_res_by_asset_type: Dict[str, Tuple[int, int]] = {}
+
+
+def load_validation_rules(naming_rules_path: str = None):
+    """ (Re)loads naming rules and precomputes resolution budgets. Cached validation results are dropped. """
+    if naming_rules_path is not None:
+        module_validation_name.load_naming_rules(naming_rules_path)
+
+    required_res_by_asset_type.clear()
+    for asset_type in module_validation_name.get_asset_types():
+        required_res_by_asset_type[asset_type] = module_validation_resolution.get_required_res_from_asset_type(asset_type)
+
+    validate_texture_set.cache_clear()
+
+
+def get_required_res(asset_type: str) -> Tuple[int, int]:
+    required_res = required_res_by_asset_type.get(asset_type)
+    if required_res is None:
+        # Asset Type which is not in the naming rules, its fallback is warned about only once
+        required_res = required_res_by_asset_type[asset_type] = module_validation_resolution.get_required_res_from_asset_type(asset_type)
+    return required_res
+
+
+@lru_cache(maxsize=65536)
+def validate_texture_set(asset_type: str, texture_set_name: str, width: int, height: int) -> ValidationResult:
+    res_is_valid, res_validation_details = module_validation_resolution.validate_res(asset_type, Resolution(width, height), get_required_res(asset_type))
+    name_is_valid, name_validation_details = module_validation_name.validate_name(asset_type, texture_set_name)
+    return ValidationResult(res_is_valid, res_validation_details, name_is_valid, name_validation_details)
+
+
+def validate_texture_sets(asset_type: str, texture_sets: Iterable[Tuple[str, int, int]]) -> List[ValidationResult]:
+    """ texture_sets: (texture_set_name, width, height) of every row, results are in the same order. """
+    return [validate_texture_set(asset_type, texture_set_name, width, height) for texture_set_name, width, height in texture_sets]
+
+
+load_validation_rules()
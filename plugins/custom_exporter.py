@@ -1,44 +1,146 @@
 # Painter API Module
 import substance_painter as sp
-import substance_painter_plugins as spp
 
 # 3rd party ui lib
 from PySide2 import QtWidgets, QtCore, QtGui
 
-# custom exporter modules
-import module_export
-import module_validation_name
-import module_validation_resolution
-
 # default utils
+import contextlib
 import importlib
+import importlib.util
 import os
-
-is_user_dev = True
+import sys
+import time
+
+
+def lazy_import(module_name):
+    """ Module is registered right away, but loaded only when its attribute is used for the first time. """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    module_spec = importlib.util.find_spec(module_name)
+    module_spec.loader = importlib.util.LazyLoader(module_spec.loader)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[module_name] = module
+    module_spec.loader.exec_module(module)
+    return module
+
+
+# custom exporter modules, imported on first use so they don't add to Painter startup
+module_export = lazy_import("module_export")
+module_export_dedupe = lazy_import("module_export_dedupe")
+module_export_farm = lazy_import("module_export_farm")
+module_export_fs = lazy_import("module_export_fs")
+module_export_package = lazy_import("module_export_package")
+module_export_paths = lazy_import("module_export_paths")
+module_export_queue = lazy_import("module_export_queue")
+module_export_watch = lazy_import("module_export_watch")
+module_instrumentation = lazy_import("module_instrumentation")
+module_resolution_fix = lazy_import("module_resolution_fix")
+module_texset_cache = lazy_import("module_texset_cache")
+module_texset_index = lazy_import("module_texset_index")
+module_texset_model = lazy_import("module_texset_model")
+module_texture_audit = lazy_import("module_texture_audit")
+module_validation_name = lazy_import("module_validation_name")
+module_validation_service = lazy_import("module_validation_service")
+
+# Modules are reloaded with every start of the plugin, to pick up their changes without restarting Painter
+is_user_dev = os.environ.get("CUSTOM_EXPORTER_DEV", "0") == "1"
 if is_user_dev:
+    importlib.reload(module_export_dedupe)
+    importlib.reload(module_export_fs)
+    importlib.reload(module_export_package)
     importlib.reload(module_export)
+    importlib.reload(module_export_farm)
+    importlib.reload(module_export_queue)
+    importlib.reload(module_export_watch)
+    importlib.reload(module_instrumentation)
+    importlib.reload(module_texset_cache)
+    importlib.reload(module_texset_index)
+    importlib.reload(module_texset_model)
+    importlib.reload(module_texture_audit)
     importlib.reload(module_validation_name)
+    importlib.reload(module_export_paths)
+    importlib.reload(module_validation_service)
+    importlib.reload(module_resolution_fix)
+
+# Rows rendered per tick of the event loop, when the table is populated in the background
+POPULATION_CHUNK_SIZE = 100
+
+TEXSET_SEARCH_HELP = "All the terms have to match: \
+        \nfield=value, field!=value for type, detail1, detail2, id, name, status (pass, fail, pending) \
+        \nvalue* for a prefix, e.g. detail1=R* \
+        \nres>2048, res>=, res<, res<=, res= for the larger side of the resolution \
+        \nbare word for a prefix of the name or of any of its acronyms"
 
 CUSTOM_EXPORTER = None
 
 
 class CustomExporter():
-    def __init__(self):
-        self.initialization()
+    def __init__(self, lazy: bool = False):
+        """
+        With lazy startup, only an empty dock is registered. Its UI is built when the dock is shown for the first time,
+        and the table is populated in chunks on the event loop.
+        """
+        self.startup_start = time.perf_counter()
+        self.is_ui_built = False
+        self.is_populating = False
+        self.has_deferred_overbudget_res = False
+        self.population_row = 0
+        self.delivery_packager = None
+        self.is_watch_export_run = False
+        self.is_autofix_prompt_suppressed = False
+        if lazy:
+            self.lazy_initialization()
+        else:
+            self.initialization()
+        sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", f"Cold start: {(time.perf_counter() - self.startup_start) * 1000:.1f} ms")
 
     def initialization(self):
+        self.init_dock_widget()
         self.init_widget_window()
         self.show_ui_widget()
+        self.widget.show()
         self.connect_widget_events()
         self.connect_painter_events()
+        if sp.project.is_open():
+            self.reset_dialog_checkbox_state()
+            self.fill_texset_table()
 
-    def init_widget_window(self):
-        self.asset_types = ["Props", "Weapons", "Characters"]
-        self.shader_types = ["Basic", "Armament", "Morph"]
-        self.texsets_with_overbudget_res = []
+    def lazy_initialization(self):
+        self.init_dock_widget()
+        self.startup_event_filter = StartupEventFilter(self.on_first_show, self.on_first_paint, self.widget)
+        self.widget.installEventFilter(self.startup_event_filter)
+        self.show_ui_widget()
+        self.connect_painter_events()
+
+    def init_dock_widget(self):
         self.widget = QtWidgets.QWidget()
         self.widget.setObjectName("Custom Exporter")
         self.widget.setWindowTitle("CUSTOM EXPORTER")
+        self.layout = QtWidgets.QVBoxLayout(self.widget)
+
+    def on_first_show(self):
+        self.show_start = time.perf_counter()
+        self.init_widget_window()
+        self.connect_widget_events()
+        if sp.project.is_open():
+            self.reset_dialog_checkbox_state()
+            self.populate_texset_table()
+
+    def on_first_paint(self):
+        sp.logging.log(
+                sp.logging.INFO,
+                "CUSTOM EXPORTER",
+                f"First paint: {(time.perf_counter() - self.show_start) * 1000:.1f} ms after the dock was shown, \
+                {(time.perf_counter() - self.startup_start) * 1000:.1f} ms after the plugin start",
+                )
+
+    def init_widget_window(self):
+        self.asset_types = module_validation_name.get_asset_types()
+        self.shader_types = ["Basic", "Armament", "Morph"]
+        self.texsets_with_overbudget_res = []
+        self.texture_set_cache = module_texset_cache.texture_set_cache
 
         self.file_dir = os.path.dirname(__file__)
 
@@ -49,7 +151,6 @@ class CustomExporter():
         self.icon_validation_fail = QtGui.QIcon(os.path.join(self.icon_path, "validation_fail.png"))
         self.pixmap_help= QtGui.QPixmap(os.path.join(self.icon_path, "help.png"))
         self.widget.setWindowIcon(self.icon_main_window)
-        self.layout = QtWidgets.QVBoxLayout(self.widget)
 
         # help icon
         help_layout = QtWidgets.QHBoxLayout()
@@ -88,49 +189,190 @@ class CustomExporter():
         self.refresh_table_button.setShortcut(QtGui.QKeySequence(QtCore.Qt.ALT + QtCore.Qt.Key_R))
         self.layout.addWidget(self.refresh_table_button)
 
+        # table search
+        search_layout = QtWidgets.QHBoxLayout()
+        self.texset_filter_le = QtWidgets.QLineEdit()
+        self.texset_filter_le.setPlaceholderText("Search texture sets, e.g. WPN_RFL or detail1=RFL status=fail res>2048")
+        self.texset_filter_le.setClearButtonEnabled(True)
+        self.texset_filter_le.setToolTip(TEXSET_SEARCH_HELP)
+        search_layout.addWidget(self.texset_filter_le)
+        self.check_matching_button = QtWidgets.QPushButton("Check All Matching")
+        self.check_matching_button.setToolTip("Select for export exactly the valid texture sets matching the search")
+        search_layout.addWidget(self.check_matching_button)
+        self.layout.addLayout(search_layout)
+
         # table
-        self.texset_table = QtWidgets.QTableWidget()
+        self.texset_model = module_texset_model.TextureSetTableModel(self.icon_validation_ok, self.icon_validation_fail, self.widget)
+        self.texset_proxy_model = module_texset_model.TextureSetProxyModel(self.widget)
+        self.texset_proxy_model.setSourceModel(self.texset_model)
+        self.texset_table = QtWidgets.QTableView()
+        self.texset_table.setModel(self.texset_proxy_model)
+        self.texset_table.setItemDelegateForColumn(
+                module_texset_model.SHADER_TYPE_COLUMN,
+                module_texset_model.ShaderTypeDelegate(self.shader_types, self.texset_table),
+                )
+        self.texset_table.setItemDelegateForColumn(
+                module_texset_model.EXPORT_TARGETS_COLUMN,
+                module_texset_model.ExportTargetsDelegate(list(module_export.export_targets), self.texset_table),
+                )
+        self.texset_table.setEditTriggers(QtWidgets.QAbstractItemView.AllEditTriggers)
+        self.texset_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.texset_table.setSortingEnabled(True)
         self.texset_table.setMinimumSize(730, 250)
         self.init_texset_table()
         self.layout.addWidget(self.texset_table)
 
+        # incremental export checkbox
+        self.incremental_export_cb = QtWidgets.QCheckBox("Incremental Export")
+        self.incremental_export_cb.setToolTip("Export only texture sets which were changed since the last export to their export path")
+        self.layout.addWidget(self.incremental_export_cb)
+
+        # progressive export controls
+        progressive_layout = QtWidgets.QHBoxLayout()
+        self.progressive_export_cb = QtWidgets.QCheckBox("Progressive Export")
+        self.progressive_export_cb.setToolTip(
+                f"Export downscaled previews of all the texture sets into the {module_export.PREVIEW_FOLDER_NAME} folder of their export paths first, \
+                \nthen replace them with the full resolution export. Rows show Preview until their full resolution export is Done",
+                )
+        progressive_layout.addWidget(self.progressive_export_cb)
+        self.preview_size_combo = QtWidgets.QComboBox()
+        self.preview_size_combo.addItems([str(preview_max_size) for preview_max_size in module_export.PREVIEW_MAX_SIZES])
+        self.preview_size_combo.setCurrentIndex(len(module_export.PREVIEW_MAX_SIZES) - 1)
+        self.preview_size_combo.setToolTip("Max size of the previews, in pixels")
+        progressive_layout.addWidget(self.preview_size_combo)
+        self.layout.addLayout(progressive_layout)
+
+        # channel pruning checkbox
+        self.prune_channels_cb = QtWidgets.QCheckBox("Prune Empty Maps")
+        self.prune_channels_cb.setToolTip("Skip maps of the shader type whose channels are missing from the texture set stack, e.g. Emissive or Opacity")
+        self.layout.addWidget(self.prune_channels_cb)
+
+        # dedupe checkbox
+        self.dedupe_export_cb = QtWidgets.QCheckBox("Deduplicate Exported Files")
+        self.dedupe_export_cb.setToolTip("Replace byte-identical exported files with hardlinks into the content-addressed store of the export root")
+        self.layout.addWidget(self.dedupe_export_cb)
+
+        # delivery packaging controls
+        delivery_layout = QtWidgets.QHBoxLayout()
+        self.package_delivery_cb = QtWidgets.QCheckBox("Package Delivery")
+        self.package_delivery_cb.setToolTip("Stream exported files into delivery archives with a checksum manifest, while the export is running")
+        delivery_layout.addWidget(self.package_delivery_cb)
+        self.delivery_format_combo = QtWidgets.QComboBox()
+        self.delivery_format_combo.addItems(module_export_package.ARCHIVE_FORMATS)
+        self.delivery_format_combo.setToolTip("Archive format of the delivery, tar.zst requires the zstandard package")
+        delivery_layout.addWidget(self.delivery_format_combo)
+        self.delivery_grouping_combo = QtWidgets.QComboBox()
+        self.delivery_grouping_combo.addItems(module_export_package.GROUPINGS)
+        self.delivery_grouping_combo.setToolTip("asset: archive per texture set, batch: single archive for the whole export")
+        delivery_layout.addWidget(self.delivery_grouping_combo)
+        self.layout.addLayout(delivery_layout)
+
+        # watch mode checkbox
+        self.watch_export_cb = QtWidgets.QCheckBox("Watch Mode (Auto Export)")
+        self.watch_export_cb.setToolTip(
+                f"Export texture sets edited since the last export, {module_export_watch.WATCH_DEBOUNCE_MS / 1000:.0f} s after the edits and saves are over. \
+                \nOnly checked texture sets which passed the validation are exported",
+                )
+        self.layout.addWidget(self.watch_export_cb)
+
+        # reveal checkbox
+        self.reveal_export_cb = QtWidgets.QCheckBox("Reveal Exported Files")
+        self.reveal_export_cb.setToolTip("Open a single file browser window on the exported files when the whole export is finished")
+        self.layout.addWidget(self.reveal_export_cb)
+
+        # texture audit checkbox
+        self.audit_export_cb = QtWidgets.QCheckBox("Audit Exported Textures")
+        self.audit_export_cb.setToolTip("After the export, check exported files for uniform maps, constant channels and texture budget")
+        self.layout.addWidget(self.audit_export_cb)
+
+        # cProfile checkbox
+        self.profile_export_cb = QtWidgets.QCheckBox("Profile Export (cProfile)")
+        self.profile_export_cb.setToolTip("Capture cProfile stats of the next export into a .prof file next to its report")
+        self.layout.addWidget(self.profile_export_cb)
+
         # export push button
         self.export_button = QtWidgets.QPushButton("Export")
         self.export_button.setToolTip("Trigger export of the selected textuyre sets. \nHotkey: Alt + E")
         self.export_button.setShortcut(QtGui.QKeySequence(QtCore.Qt.ALT + QtCore.Qt.Key_E))
         self.layout.addWidget(self.export_button)
 
-        if sp.project.is_open():
-            self.fill_texset_table()
-            settings = QtCore.QSettings()
-            settings.setValue("dialog_window_checkbox_state", QtCore.Qt.Unchecked)
+        # export queue controls
+        export_queue_layout = QtWidgets.QHBoxLayout()
+        self.skip_export_button = QtWidgets.QPushButton("Skip Selected")
+        self.skip_export_button.setToolTip("Skip export of the selected texture sets which are still waiting in the export queue")
+        export_queue_layout.addWidget(self.skip_export_button)
+        self.cancel_export_button = QtWidgets.QPushButton("Cancel Export")
+        self.cancel_export_button.setToolTip("Cancel export of all texture sets which are still waiting in the export queue")
+        export_queue_layout.addWidget(self.cancel_export_button)
+        self.layout.addLayout(export_queue_layout)
+
+        # export farm job specs push button
+        self.farm_export_button = QtWidgets.QPushButton("Write Farm Jobs")
+        self.farm_export_button.setToolTip("Write export job specs of the selected texture sets, to be exported by the export farm (module_export_farm)")
+        self.layout.addWidget(self.farm_export_button)
+
+        # summary of the last instrumented run
+        self.report_label = QtWidgets.QLabel("Last run report:")
+        self.report_label.setVisible(False)
+        self.layout.addWidget(self.report_label)
+        self.report_table = QtWidgets.QTableWidget(0, 3)
+        self.report_table.setHorizontalHeaderLabels(["Phase", "Count", "Seconds"])
+        self.report_table.verticalHeader().setVisible(False)
+        self.report_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.report_table.setMaximumHeight(150)
+        self.report_table.setVisible(False)
+        self.layout.addWidget(self.report_table)
+
+        self.export_queue = module_export_queue.ExportQueue(parent=self.widget)
+        self.export_watcher = module_export_watch.ExportWatcher(parent=self.widget)
+
+        self.population_timer = QtCore.QTimer(self.widget)
+        self.population_timer.setSingleShot(True)
+        self.population_timer.setInterval(0)
+        self.population_timer.timeout.connect(self.populate_next_chunk)
+
+        self.is_ui_built = True
+
+    def reset_dialog_checkbox_state(self):
+        settings = QtCore.QSettings()
+        settings.setValue("dialog_window_checkbox_state", QtCore.Qt.Unchecked)
 
     def connect_widget_events(self):
         self.export_button.clicked.connect(self.on_export_request)
-        self.refresh_table_button.clicked.connect(self.on_refresh_texset_table)
+        self.skip_export_button.clicked.connect(self.on_skip_export_request)
+        self.cancel_export_button.clicked.connect(self.export_queue.cancel)
+        self.farm_export_button.clicked.connect(self.on_farm_export_request)
+        self.export_queue.job_state_changed.connect(self.on_export_job_state_changed)
+        self.export_queue.queue_finished.connect(self.on_export_queue_finished)
+        self.watch_export_cb.stateChanged.connect(self.on_watch_mode_changed)
+        self.export_watcher.dirty_texture_sets_ready.connect(self.on_watch_export_request)
+        self.refresh_table_button.clicked.connect(self.on_refresh_button_clicked)
         self.personal_export_cb.stateChanged.connect(self.on_refresh_texset_table)
         self.asset_type_cmb.currentIndexChanged.connect(self.on_refresh_texset_table)
+        self.texset_model.shader_type_changed.connect(self.on_refresh_texset_table)
+        self.texset_filter_le.textChanged.connect(self.on_texset_search_changed)
+        self.check_matching_button.clicked.connect(self.on_check_matching_request)
         self.help_action.triggered.connect(self.show_help)
 
     def connect_painter_events(self):
-        painter_connections = {
+        # Cache has to be invalidated before the widget is refilled by the same events
+        module_texset_cache.texture_set_cache.connect_painter_events()
+
+        self.painter_connections = {
                 sp.event.ProjectOpened: self.on_project_opened,
                 sp.event.ProjectCreated: self.on_project_created,
                 sp.event.ProjectAboutToClose: self.on_project_close,
                 }
 
-        for event, callback in painter_connections.items():
+        for event, callback in self.painter_connections.items():
             sp.event.DISPATCHER.connect(event, callback)
 
-    def show_ui_widget(self):
-        plugin = spp.plugins.get("Custom Exporter", None)
-        if plugin is not None:
-            # Refresh of the widget
-            self.delete_widget()
-            self.init_widget_window()
+    def disconnect_painter_events(self):
+        for event, callback in self.painter_connections.items():
+            sp.event.DISPATCHER.disconnect(event, callback)
 
+    def show_ui_widget(self):
         sp.ui.add_dock_widget(self.widget)
-        self.widget.show()
 
     def show_help(self, event):
         help_doc_path = os.path.join(self.file_dir, "Custom_Exporter_Help.pdf")
@@ -138,102 +380,135 @@ class CustomExporter():
         QtGui.QDesktopServices.openUrl(help_url)
 
     def init_texset_table(self):
-        column_headers = ["Export", "Texture Set Name", "Shader Type", "Resolution", "Export Path", "Validation"]
-        num_coloumn = len(column_headers)
-        num_row = 0
-
-        self.texset_table.setColumnCount(num_coloumn)
-        self.texset_table.setRowCount(num_row)
-
-        self.texset_table.setHorizontalHeaderLabels(column_headers)
+        self.texset_model.set_rows([])
+        self.rebuild_texset_index()
 
         self.texset_table.verticalHeader().setVisible(False)
 
-        self.texset_table.setColumnWidth(0, 40)
-        self.texset_table.setColumnWidth(3, 70)
-        self.texset_table.setColumnWidth(4, 350)
-        self.texset_table.setColumnWidth(5, 70)
+        self.texset_table.setColumnWidth(module_texset_model.EXPORT_COLUMN, 40)
+        self.texset_table.setColumnWidth(module_texset_model.EXPORT_TARGETS_COLUMN, 120)
+        self.texset_table.setColumnWidth(module_texset_model.RESOLUTION_COLUMN, 70)
+        self.texset_table.setColumnWidth(module_texset_model.EXPORT_PATH_COLUMN, 350)
+        self.texset_table.setColumnWidth(module_texset_model.VALIDATION_COLUMN, 70)
+
+    def build_texset_rows(self):
+        return [
+                module_texset_model.TextureSetRow(
+                    texture_set_info.name,
+                    self.shader_types[0],
+                    texture_set_info.width,
+                    texture_set_info.height,
+                    (module_export.DEFAULT_EXPORT_TARGET,),
+                    )
+                for texture_set_info in self.texture_set_cache.all_texture_sets()
+                ]
 
     def fill_texset_table(self):
-        self.all_texture_sets = sp.textureset.all_texture_sets()
-        self.texset_table.setRowCount(len(self.all_texture_sets))
-
-        for i, texture_set in enumerate(self.all_texture_sets):
-            # Use QCheckbox for the "Export" column
-            check_box = QtWidgets.QCheckBox()
-            check_box.setChecked(True)
-            check_box.stateChanged.connect(self.gray_out_unchecked_rows)
-            self.texset_table.setCellWidget(i, 0, check_box)
-
-            # Texture set name Column
-            self.texset_table.setItem(i, 1, QtWidgets.QTableWidgetItem(texture_set.name()))
-
-            # use QComboBox for "Shader Type" column
-            combo_box = QtWidgets.QComboBox()
-            combo_box.addItems(self.shader_types)
-            combo_box.currentIndexChanged.connect(self.on_refresh_texset_table)
-            combo_box.setToolTip("Specify Type of the export preset to be used during the export")
-            self.texset_table.setCellWidget(i, 2, combo_box)
-
-            # Resolution Column
-            resolution = texture_set.get_resolution()
-            width = resolution.width
-            height = resolution.height
-            self.texset_table.setItem(i, 3, QtWidgets.QTableWidgetItem(f"{width} x {height}"))
+        self.population_timer.stop()
+        self.is_populating = False
+        self.texset_model.set_rows(self.build_texset_rows())
 
         self.on_refresh_texset_table()
 
-    def validate_texture_sets(self):
+    def populate_texset_table(self):
+        """ Rows are created at once, their export paths and validations are rendered in chunks on the event loop. """
+        self.population_start = time.perf_counter()
+        self.texset_model.set_rows(self.build_texset_rows())
+        self.is_populating = True
+        self.has_deferred_overbudget_res = False
+        self.population_row = 0
+        self.population_timer.start()
+
+    def populate_next_chunk(self):
+        all_texture_sets = self.texture_set_cache.all_texture_sets()
+        if not sp.project.is_open() or len(all_texture_sets) != len(self.texset_model.rows):
+            # Project is changed in the meantime, its own refresh is taking over
+            self.is_populating = False
+            return
+
+        chunk_end = min(self.population_row + POPULATION_CHUNK_SIZE, len(all_texture_sets))
+        self.refresh_texset_rows(all_texture_sets, range(self.population_row, chunk_end))
+        self.population_row = chunk_end
+        if self.population_row < len(all_texture_sets):
+            self.population_timer.start()
+            return
+
+        self.is_populating = False
+        self.rebuild_texset_index()
+        sp.logging.log(
+                sp.logging.INFO,
+                "CUSTOM EXPORTER",
+                f"Table of {len(all_texture_sets)} texture set(s) is populated in {(time.perf_counter() - self.population_start) * 1000:.1f} ms",
+                )
+        if self.has_deferred_overbudget_res:
+            self.has_deferred_overbudget_res = False
+            self.open_dialog_res_confirmation()
+
+    def validate_texture_sets(self, rows=None):
+        """
+        Validates only given rows, or all of them. Only rows whose validation outcome is changed are re-rendered.
+        Dialog for the autofix is opened if any of the validated rows became over budget.
+        """
+        texset_rows = self.texset_model.rows
+        if rows is None:
+            rows = range(len(texset_rows))
+
         asset_type = self.asset_type_cmb.currentText()
-        self.texsets_with_overbudget_res = []
-        for i, texture_set in enumerate(self.all_texture_sets):
-            res_is_valid, res_validation_details = module_validation_resolution.validate_res(asset_type, texture_set.get_resolution())
-            validation_item = QtWidgets.QTableWidgetItem()
-            export_checkbox = self.texset_table.cellWidget(i, 0)
-            if res_is_valid:
-                name_is_valid, name_validation_details = module_validation_name.validate_name(asset_type, texture_set.name())
-                if name_is_valid:
-                    validation_item.setIcon(self.icon_validation_ok)
-                    validation_item.setToolTip(f"Texture set validation are OK for texture set {i+1} \
-                                                \n{texture_set.name()}")
-                    export_checkbox.setToolTip(f"Texture set validation are OK for texture set {i+1} \
-                            \n{texture_set.name()}")
-                else:
-                    validation_item.setIcon(self.icon_validation_fail)
-                    validation_item.setToolTip(f"Texture set name validation is FAILED for texture set {i+1} \
-                                                \n{texture_set.name()} \
-                                                \nReason: {name_validation_details} \
-                                                \nExport of this texture set is disabled until validation is OK")
-                    export_checkbox.setToolTip(f"Texture set name validation is FAILED for texture set {i+1} \
-                                                \n{texture_set.name()} \
-                                                \nReason: {name_validation_details} \
-                                                \nExport of this texture set is disabled until validation is OK")
+        has_new_overbudget_res = False
+        changed_rows = []
+        with module_instrumentation.span("validate", [texset_rows[i].name for i in rows]):
+            validation_results = module_validation_service.validate_texture_sets(
+                    asset_type,
+                    [(texset_rows[i].name, texset_rows[i].width, texset_rows[i].height) for i in rows],
+                    )
+            for i, validation_result in zip(rows, validation_results):
+                texset_row = texset_rows[i]
+                if validation_result == texset_row.validation_result:
+                    continue
 
-            else:
-                validation_item.setIcon(self.icon_validation_fail)
-                validation_item.setToolTip(f"Texture set Resolution validation is FAILED for texture set {i+1} \
-                                            \n{texture_set.name()} \
-                                            \nReason: {res_validation_details} \
-                                            \nExport of this texture set is disabled until validation is OK")
-                export_checkbox.setToolTip(f"Texture set Resolution validation is FAILED for texture set {i+1} \
-                                            \n{texture_set.name()} \
-                                            \nReason: {res_validation_details} \
-                                            \nExport of this texture set is disabled until validation is OK")
-                self.texsets_with_overbudget_res.append(texture_set)
-
-            export_checkbox.setChecked(res_is_valid and name_is_valid)
-            export_checkbox.setEnabled(res_is_valid and name_is_valid)
-            self.texset_table.setItem(i, 5, validation_item)
-
-        if len(self.texsets_with_overbudget_res) > 0:
+                if not validation_result.res_is_valid:
+                    texset_row.validation_tooltip = f"Texture set Resolution validation is FAILED for texture set {i+1} \
+                                                \n{texset_row.name} \
+                                                \nReason: {validation_result.res_validation_details} \
+                                                \nExport of this texture set is disabled until validation is OK"
+                    has_new_overbudget_res = has_new_overbudget_res or texset_row.res_is_valid is not False
+                elif validation_result.name_is_valid:
+                    texset_row.validation_tooltip = f"Texture set validation are OK for texture set {i+1} \
+                                                \n{texset_row.name}"
+                else:
+                    texset_row.validation_tooltip = f"Texture set name validation is FAILED for texture set {i+1} \
+                                                \n{texset_row.name} \
+                                                \nReason: {validation_result.name_validation_details} \
+                                                \nExport of this texture set is disabled until validation is OK"
+
+                texset_row.validation_result = validation_result
+                texset_row.res_is_valid = validation_result.res_is_valid
+                texset_row.is_valid = validation_result.is_valid
+                texset_row.is_checked = texset_row.is_valid
+                texset_row.export_state = ""
+                changed_rows.append(i)
+
+        if changed_rows:
+            self.texset_model.update_rows(changed_rows)
+
+        self.texsets_with_overbudget_res = [texset_row.name for texset_row in texset_rows if texset_row.res_is_valid is False]
+        if has_new_overbudget_res and self.is_populating:
+            # Dialog is opened once, when all the chunks are validated
+            self.has_deferred_overbudget_res = True
+        elif has_new_overbudget_res and not self.is_autofix_prompt_suppressed:
             self.open_dialog_res_confirmation()
 
     def open_dialog_res_confirmation(self):
         settings = QtCore.QSettings()
         if settings.value("dialog_window_checkbox_state", QtCore.Qt.Unchecked) == QtCore.Qt.Unchecked:
-            dialog = DialogWindow(self.icon_main_window)
+            resolution_changes = self.plan_required_res()
+            if not resolution_changes:
+                return
+
+            dialog = DialogWindow(self.icon_main_window, module_resolution_fix.format_resolution_diff(resolution_changes))
             if dialog.exec_() == QtWidgets.QDialog.Accepted:
-                self.apply_required_res()
+                self.apply_required_res(resolution_changes)
+                # Single revalidation of all the changed texture sets
                 self.on_refresh_texset_table()
             else:
                 sp.logging.log(
@@ -248,111 +523,452 @@ class CustomExporter():
                     "dialog for Resolution validation autofix was not triggered as per user settings"
                     )
 
-    def apply_required_res(self):
-        required_widht, required_height = module_validation_resolution.get_required_res_from_asset_type(self.asset_type_cmb.currentText())
-        required_res = sp.textureset.Resolution(required_widht, required_height)
-        for texture_set in self.texsets_with_overbudget_res:
-            original_resolution = texture_set.get_resolution()
-            texture_set.set_resolution(required_res)
-            sp.logging.log(sp.logging.INFO,
-                           "CUSTOM EXPORTER",
-                           f"Applied required resolution for texture sets {texture_set.name()} \
-                            \nWas: {original_resolution}; Now: {required_res}"
-                           )
-
-    def gray_out_unchecked_rows(self):
-        for i in range(self.texset_table.rowCount()):
-            check_box_item = self.texset_table.cellWidget(i, 0)
-            if check_box_item.isChecked():
-                for j in range(1, self.texset_table.columnCount() -1):
-                    item = self.texset_table.item(i, j)
-                    if item is not None:
-                        item.setFlags(item.flags() | QtCore.Qt.ItemIsEnabled)
-                    else:
-                        cell_widget = self.texset_table.cellWidget(i, j)
-                        if cell_widget is not None:
-                            cell_widget.setEnabled(True)
-            else:
-                for j in range(1, self.texset_table.columnCount() -1):
-                    item = self.texset_table.item(i, j)
-                    if item is not None:
-                        item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEnabled)
-                    else:
-                        cell_widget = self.texset_table.cellWidget(i, j)
-                        if cell_widget is not None:
-                            cell_widget.setDisabled(True)
+    def plan_required_res(self):
+        """ Dry run of the autofix: new resolution and saved memory of every over budget texture set. """
+        texset_rows = [self.texset_model.rows[self.texset_model.find_row(name)] for name in self.texsets_with_overbudget_res]
+        return module_resolution_fix.plan_resolution_changes(
+                self.asset_type_cmb.currentText(),
+                [
+                    (texset_row.name, texset_row.width, texset_row.height, len(module_export.shader_type_output_maps.get(texset_row.shader_type, [])))
+                    for texset_row in texset_rows
+                    ],
+                )
+
+    def apply_required_res(self, resolution_changes):
+        """
+        All the changes are applied as a single Painter modification (a single undo step where it is supported),
+        texture set cache is invalidated once for all of them.
+        """
+        scoped_modification = getattr(getattr(sp, "layerstack", None), "ScopedModification", None)
+        modification_scope = scoped_modification("Custom Exporter resolution autofix") if scoped_modification is not None else contextlib.nullcontext()
+        with self.texture_set_cache.deferred_invalidation(), modification_scope:
+            for resolution_change in resolution_changes:
+                texture_set = self.texture_set_cache.get_texture_set(resolution_change.texture_set_name)
+                texture_set.set_resolution(sp.textureset.Resolution(resolution_change.new_width, resolution_change.new_height))
+            # Coalesced with the invalidations by Painter events of the changes
+            self.texture_set_cache.invalidate()
+
+        sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", "Applied required resolution for texture sets:")
+        for line in module_resolution_fix.format_resolution_diff(resolution_changes):
+            sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", line)
 
     def on_refresh_texset_table(self):
+        """ Re-renders only the cells and validations of the rows whose inputs are changed since the last refresh. """
         if sp.project.is_open():
-            export_path_root = self.build_root_export_path()
-            if self.all_texture_sets is not None:
-                for i, texture_set in enumerate(self.all_texture_sets):
-                    # Texture set name Column
-                    self.texset_table.setItem(i, 1, QtWidgets.QTableWidgetItem(texture_set.name()))
-
-                    # Resolution Column
-                    resolution = texture_set.get_resolution()
-                    width = resolution.width
-                    height = resolution.height
-                    self.texset_table.setItem(i, 3, QtWidgets.QTableWidgetItem(f"{width} x {height}"))
-
-                    # export path
-                    self.texset_table.setItem(i, 4, QtWidgets.QTableWidgetItem(f"{export_path_root}/{self.asset_type_cmb.currentText()}/{texture_set.name()}/{self.texset_table.cellWidget(i, 2).currentText()}"))
-
-                self.validate_texture_sets()
-                self.gray_out_unchecked_rows()
-
-                self.set_column_read_only(1)  # set read-only to name column
-                self.set_column_read_only(3)  # set read-only to resolution column
-                self.set_column_read_only(4)  # set read-only to export path column
-                self.set_column_read_only(5)  # set read-only to validation column
-
-    def set_column_read_only(self, column_index):
-        for row in range(self.texset_table.rowCount()):
-            item = self.texset_table.item(row, column_index)
-            if item is not None:
-                item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+            all_texture_sets = self.texture_set_cache.all_texture_sets()
+            if len(all_texture_sets) != len(self.texset_model.rows):
+                # Texture sets were added or removed
+                self.fill_texset_table()
+                return
+
+            if all_texture_sets:
+                self.refresh_texset_rows(all_texture_sets, range(len(all_texture_sets)))
+            self.rebuild_texset_index()
+
+    def rebuild_texset_index(self):
+        """ Index is rebuilt once per refresh, searches in between are answered from it. """
+        with module_instrumentation.span("build_search_index", rows=len(self.texset_model.rows)):
+            self.texset_index = module_texset_index.TextureSetIndex(self.texset_model.rows)
+        self.on_texset_search_changed(self.texset_filter_le.text())
+
+    def on_texset_search_changed(self, query):
+        try:
+            matching_rows = self.texset_index.search(query) if query.strip() else None
+        except ValueError as error:
+            # Rows of the last valid query stay visible while the query is typed
+            self.texset_filter_le.setToolTip(f"Search query is not valid: {error}")
+            return
+
+        self.texset_filter_le.setToolTip(TEXSET_SEARCH_HELP)
+        self.texset_proxy_model.set_matching_rows(matching_rows)
+
+    def on_check_matching_request(self):
+        matching_rows = self.texset_proxy_model.matching_rows
+        texset_rows = self.texset_model.rows
+        for i, texset_row in enumerate(texset_rows):
+            texset_row.is_checked = bool(texset_row.is_valid) and (matching_rows is None or i in matching_rows)
+        self.texset_model.update_rows(range(len(texset_rows)))
+
+    def refresh_texset_rows(self, all_texture_sets, rows):
+        export_path_root = self.build_root_export_path()
+        asset_type = self.asset_type_cmb.currentText()
+        texset_rows = self.texset_model.rows
+        with module_instrumentation.span("refresh_rows", rows=len(rows)):
+            changed_rows = []
+            rows_to_validate = []
+            rows_with_new_export_path = []
+            for i in rows:
+                texture_set_info = all_texture_sets[i]
+                texset_row = texset_rows[i]
+                rendered_inputs = texset_row.rendered_inputs
+                texset_row.name = texture_set_info.name
+                texset_row.width = texture_set_info.width
+                texset_row.height = texture_set_info.height
+
+                export_path_inputs = (export_path_root, asset_type, texset_row.name, texset_row.shader_type)
+                if rendered_inputs.get("export_path") != export_path_inputs:
+                    rows_with_new_export_path.append(i)
+
+                validation_inputs = (asset_type, texset_row.name, texset_row.width, texset_row.height)
+                if rendered_inputs.get("validation") != validation_inputs:
+                    rows_to_validate.append(i)
+
+                if rendered_inputs.get("export_path") != export_path_inputs or rendered_inputs.get("validation") != validation_inputs:
+                    changed_rows.append(i)
+
+                rendered_inputs["export_path"] = export_path_inputs
+                rendered_inputs["validation"] = validation_inputs
+
+            # export paths of all the changed rows are built at once from the compiled template
+            if rows_with_new_export_path:
+                export_paths = module_export_paths.build_export_paths(
+                        export_path_root,
+                        asset_type,
+                        [(texset_rows[i].name, texset_rows[i].shader_type) for i in rows_with_new_export_path],
+                        )
+                for i, export_path in zip(rows_with_new_export_path, export_paths):
+                    texset_rows[i].export_path = export_path
+
+        self.texset_model.row_by_name = {texset_row.name: i for i, texset_row in enumerate(texset_rows)}
+        if rows_to_validate:
+            self.validate_texture_sets(rows_to_validate)
+        if changed_rows:
+            self.texset_model.update_rows(changed_rows)
 
     def build_root_export_path(self):
-        if self.personal_export_cb.isChecked():
-            root = "C:/Test"
-        else:
-            root = "D:/Test"
-        return root
+        return module_export_paths.get_export_root(self.personal_export_cb.isChecked())
 
     def delete_widget(self):
-        while self.widget is not None:
-            sp.ui.delete_ui_element(self.widget)
+        if self.widget is None:
+            return
+
+        if self.is_ui_built:
+            self.population_timer.stop()
+            if self.export_queue.is_running():
+                self.export_queue.cancel()
+            self.export_watcher.stop()
+        self.disconnect_painter_events()
+        sp.ui.delete_ui_element(self.widget)
+        self.widget = None
+
+    def on_refresh_button_clicked(self):
+        # Explicit refresh re-reads texture sets from Painter
+        is_refresh_recorded = not module_instrumentation.is_recording()
+        if is_refresh_recorded:
+            module_instrumentation.start_run("refresh")
+
+        self.texture_set_cache.invalidate()
+        with module_instrumentation.span("refresh_table"):
+            self.on_refresh_texset_table()
+
+        if is_refresh_recorded:
+            self.show_run_report(module_instrumentation.finish_run())
+
+    def get_reports_path(self):
+        return os.path.join(self.build_root_export_path(), "_custom_exporter_reports")
+
+    def show_run_report(self, report):
+        summary_rows = module_instrumentation.summarize_report(report)
+        self.report_label.setText(f"Last run report: {report['run']}")
+        self.report_table.setRowCount(len(summary_rows))
+        for i, summary_row in enumerate(summary_rows):
+            for j, value in enumerate(summary_row):
+                self.report_table.setItem(i, j, QtWidgets.QTableWidgetItem(value))
+        self.report_label.setVisible(True)
+        self.report_table.setVisible(True)
 
     def on_export_request(self):
-        if self.all_texture_sets is not None:
-            for i in range(len(self.all_texture_sets)):
-                should_export = self.texset_table.cellWidget(i, 0).isChecked()
-                if not should_export:
-                    continue
+        self.export_texture_sets([texset_row for texset_row in self.texset_model.rows if texset_row.is_checked])
 
-                texture_set_name = self.texset_table.item(i, 1).text()
-                shader_type = self.texset_table.cellWidget(i, 2).currentText()
-                export_path = self.texset_table.item(i, 4).text()
-                module_export.export_textures(texture_set_name, shader_type, export_path)
+    def on_watch_mode_changed(self, state):
+        if state == QtCore.Qt.Checked:
+            self.export_watcher.start()
+        else:
+            self.export_watcher.stop()
+
+    def on_watch_export_request(self, texture_set_names):
+        """ texture_set_names: dirty texture sets, empty for all of them """
+        if not sp.project.is_open():
+            return
+        if self.export_queue.is_running() or self.is_populating:
+            self.export_watcher.postpone(texture_set_names)
+            return
+
+        # Edits could change resolutions, rows are re-validated before the export.
+        # Refresh is running in the background while the user is painting, over budget rows are only shown as failed
+        self.is_autofix_prompt_suppressed = True
+        try:
+            self.on_refresh_texset_table()
+        finally:
+            self.is_autofix_prompt_suppressed = False
+
+        dirty_texture_sets = set(texture_set_names)
+        texset_rows = [
+                texset_row
+                for texset_row in self.texset_model.rows
+                if texset_row.is_valid and texset_row.is_checked and (not dirty_texture_sets or texset_row.name in dirty_texture_sets)
+                ]
+        if texset_rows:
+            sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", f"Watch mode is exporting {len(texset_rows)} changed texture set(s)")
+            self.export_texture_sets(texset_rows, is_watch_export_run=True)
+
+    def export_texture_sets(self, texset_rows, is_watch_export_run: bool = False):
+        export_jobs = [
+                module_export.ExportJob(texset_row.name, texset_row.shader_type, texset_row.export_path, texset_row.export_targets)
+                for texset_row in texset_rows
+                ]
+        if export_jobs:
+            # Up to date texture sets are checked once for the whole export, the queue steps are reusing the plan
+            incremental_plan = None
+            if self.incremental_export_cb.isChecked():
+                pruned_output_maps = module_export.plan_channel_pruning(export_jobs) if self.prune_channels_cb.isChecked() else None
+                incremental_plan = module_export.plan_incremental_export(export_jobs, pruned_output_maps)
+            # Export paths are checked all at once, a broken export root fails the export before anything is baked
+            are_paths_ready, errors, _ = module_export.prepare_export_jobs(
+                    export_jobs,
+                    incremental_plan=incremental_plan,
+                    prune_channels=self.prune_channels_cb.isChecked(),
+                    )
+            if not are_paths_ready:
+                for export_job in export_jobs:
+                    self.texset_model.set_export_state(export_job.texture_set_name, module_export_queue.FAILED, "\n".join(errors))
+                return
+
+            if not self.export_queue.is_running():
+                profile_path = None
+                if self.profile_export_cb.isChecked():
+                    profile_path = os.path.join(self.get_reports_path(), f"export_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+                module_instrumentation.start_run("export", profile_path)
+                self.is_watch_export_run = True
+                self.delivery_packager = self.create_delivery_packager() if self.package_delivery_cb.isChecked() else None
+            # Run is revealed if any of its exports was requested manually
+            self.is_watch_export_run = self.is_watch_export_run and is_watch_export_run
+            dedupe_store_path = self.get_dedupe_store_path() if self.dedupe_export_cb.isChecked() else None
+            self.export_queue.enqueue(
+                    export_jobs,
+                    incremental=self.incremental_export_cb.isChecked(),
+                    dedupe_store_path=dedupe_store_path,
+                    packager=self.delivery_packager,
+                    prune_channels=self.prune_channels_cb.isChecked(),
+                    preview_max_size=int(self.preview_size_combo.currentText()) if self.progressive_export_cb.isChecked() else None,
+                    incremental_plan=incremental_plan,
+                    )
+
+    def create_delivery_packager(self):
+        delivery_path = os.path.join(self.build_root_export_path(), "_custom_exporter_delivery", time.strftime('%Y%m%d_%H%M%S'))
+        try:
+            return module_export_package.DeliveryPackager(
+                    delivery_path,
+                    self.build_root_export_path(),
+                    archive_format=self.delivery_format_combo.currentText(),
+                    grouping=self.delivery_grouping_combo.currentText(),
+                    )
+        except (RuntimeError, ValueError, OSError) as error:
+            sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Delivery is not packaged: {error}")
+            return None
+
+    def get_dedupe_store_path(self):
+        return module_export_dedupe.get_store_path(self.build_root_export_path())
+
+    def get_farm_path(self):
+        return os.path.join(self.build_root_export_path(), "_custom_exporter_farm")
+
+    def on_farm_export_request(self):
+        # Farm workers open the project from its file, so unsaved changes would not be exported
+        project_path = sp.project.file_path()
+        if project_path is None or sp.project.needs_saving():
+            sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", "Project has to be saved before its texture sets are sent to the export farm")
+            return
+
+        export_jobs = [
+                module_export.ExportJob(texset_row.name, texset_row.shader_type, texset_row.export_path, texset_row.export_targets)
+                for texset_row in self.texset_model.rows
+                if texset_row.is_checked
+                ]
+        if not export_jobs:
+            return
+
+        job_specs = module_export.build_farm_job_specs(export_jobs, project_path)
+        project_name = os.path.splitext(os.path.basename(project_path))[0]
+        job_specs_path = os.path.join(self.get_farm_path(), f"{project_name}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+        try:
+            module_export_farm.write_job_specs(job_specs_path, job_specs)
+        except OSError as error:
+            sp.logging.log(sp.logging.ERROR, "CUSTOM EXPORTER", f"Farm job specs could not be written to {job_specs_path}: {error}")
+            return
+
+        sp.logging.log(
+                sp.logging.INFO,
+                "CUSTOM EXPORTER",
+                f"{len(job_specs)} farm job spec(s) are written to {job_specs_path}, \
+                run them with: python module_export_farm.py {job_specs_path} --worker-command <worker command>",
+                )
+
+    def on_skip_export_request(self):
+        selected_indexes = self.texset_table.selectionModel().selectedRows()
+        for i in self.texset_proxy_model.map_rows_to_source(selected_indexes):
+            self.export_queue.skip(self.texset_model.rows[i].name)
+
+    def on_export_job_state_changed(self, texture_set_name, state, details):
+        self.texset_model.set_export_state(texture_set_name, state, details)
+
+    def on_export_queue_finished(self, export_outcomes):
+        report = module_instrumentation.finish_run()
+        if report is not None:
+            report_path = os.path.join(self.get_reports_path(), f"export_{time.strftime('%Y%m%d_%H%M%S')}.json")
+            try:
+                module_instrumentation.write_report(report, report_path)
+            except OSError as error:
+                sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Export report could not be written to {report_path}: {error}")
+            else:
+                sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", f"Export report is written to {report_path}")
+            self.show_run_report(report)
+
+        for texture_set_name, (is_export_passed, export_details, _) in export_outcomes.items():
+            if not is_export_passed:
+                sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Export of texture set {texture_set_name} has failed: {export_details}")
+
+        # Files exported by the watch mode are picked up by the game engine, they are not revealed after every save
+        if self.reveal_export_cb.isChecked() and not self.is_watch_export_run:
+            self.reveal_exported_files(export_outcomes)
+
+        if self.dedupe_export_cb.isChecked():
+            try:
+                pruned_hashes = module_export_dedupe.prune_store(self.get_dedupe_store_path())
+            except OSError as error:
+                sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Dedupe store could not be pruned: {error}")
+            else:
+                sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", f"{len(pruned_hashes)} unused object(s) are pruned from the dedupe store")
+
+        # Archives are closed in the background while the exported files are audited
+        if self.delivery_packager is not None:
+            self.finish_delivery_packaging(self.delivery_packager)
+            self.delivery_packager = None
+
+        if self.audit_export_cb.isChecked():
+            self.audit_exported_textures(export_outcomes)
+
+    def when_done(self, future, callback):
+        """ Future of a background task is polled on the event loop to keep the UI responsive, the callback is run on the main thread. """
+        poll_timer = QtCore.QTimer(self.widget)
+        poll_timer.setInterval(200)
+
+        def on_poll():
+            if not future.done():
+                return
+            poll_timer.stop()
+            poll_timer.deleteLater()
+            callback(future)
+
+        poll_timer.timeout.connect(on_poll)
+        poll_timer.start()
+
+    def finish_delivery_packaging(self, delivery_packager):
+        """ Archives are closed in the background. """
+
+        def on_finished(future):
+            try:
+                delivery_manifest = future.result()
+            except Exception as error:  # any failure of the background close is a failed delivery
+                sp.logging.log(sp.logging.ERROR, "CUSTOM EXPORTER", f"Delivery could not be packaged: {error}")
+                return
+            for archive in delivery_manifest["archives"]:
+                if archive.get("error"):
+                    sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Delivery archive {archive['archive']}: {archive['error']}")
+            for error in delivery_manifest["errors"]:
+                sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Delivery packaging has failed: {error}")
+            if delivery_manifest["errors"] or any(archive.get("error") for archive in delivery_manifest["archives"]):
+                sp.logging.log(sp.logging.ERROR, "CUSTOM EXPORTER", f"Delivery in {delivery_packager.delivery_path} is incomplete, see the errors above")
+                return
+            sp.logging.log(
+                    sp.logging.INFO,
+                    "CUSTOM EXPORTER",
+                    f"{len(delivery_manifest['archives'])} delivery archive(s) are packaged to {delivery_packager.delivery_path}",
+                    )
+
+        self.when_done(delivery_packager.finish(), on_finished)
+
+    def reveal_exported_files(self, export_outcomes):
+        exported_files = [
+                exported_file
+                for is_export_passed, _, texture_set_exported_files in export_outcomes.values()
+                if is_export_passed
+                for exported_file in texture_set_exported_files
+                ]
+        reveal_path = module_export_fs.get_reveal_path(exported_files)
+        if reveal_path is None:
+            return
+
+        try:
+            module_export_fs.reveal_path(reveal_path)
+        except OSError as error:
+            sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Exported files could not be revealed in {reveal_path}: {error}")
+
+    def audit_exported_textures(self, export_outcomes):
+        exported_textures = {
+                texture_set_name: exported_files
+                for texture_set_name, (is_export_passed, _, exported_files) in export_outcomes.items()
+                if is_export_passed and exported_files
+                }
+        try:
+            future = module_texture_audit.audit_exported_textures_in_background(exported_textures, self.asset_type_cmb.currentText())
+        except RuntimeError as error:
+            sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Texture audit is not available: {error}")
+            return
+
+        def on_audited(future):
+            try:
+                report = future.result()
+            except Exception as error:  # any failure of the background audit is logged, the export itself is done
+                sp.logging.log(sp.logging.WARNING, "CUSTOM EXPORTER", f"Texture audit has failed: {error}")
+                return
+            for line in module_texture_audit.format_audit_report(report):
+                sp.logging.log(sp.logging.INFO, "CUSTOM EXPORTER", line)
+
+        self.when_done(future, on_audited)
 
     def on_project_opened(self, e):
-        settings = QtCore.QSettings()
-        settings.setValue("dialog_window_checkbox_state", QtCore.Qt.Unchecked)
-        self.fill_texset_table()
+        self.reset_dialog_checkbox_state()
+        # Dock which was never shown is populated when it is shown for the first time
+        if self.is_ui_built:
+            self.fill_texset_table()
 
     def on_project_created(self, e):
-        self.fill_texset_table()
+        if self.is_ui_built:
+            self.fill_texset_table()
 
     def on_project_close(self,e):
-        self.init_texset_table()
+        if self.is_ui_built:
+            self.export_watcher.clear()
+            self.population_timer.stop()
+            self.is_populating = False
+            self.init_texset_table()
+
+class StartupEventFilter(QtCore.QObject):
+    """ Reports the first Show and the first Paint events of the dock widget. """
+
+    def __init__(self, on_first_show, on_first_paint, parent=None):
+        super().__init__(parent)
+        self.on_first_show = on_first_show
+        self.on_first_paint = on_first_paint
+
+    def eventFilter(self, watched, event):
+        if event.type() == QtCore.QEvent.Show and self.on_first_show is not None:
+            on_first_show, self.on_first_show = self.on_first_show, None
+            on_first_show()
+        elif event.type() == QtCore.QEvent.Paint and self.on_first_show is None and self.on_first_paint is not None:
+            on_first_paint, self.on_first_paint = self.on_first_paint, None
+            on_first_paint()
+            watched.removeEventFilter(self)
+        return False
+
 
 class DialogWindow(QtWidgets.QDialog):
-    def __init__(self, icon):
+    def __init__(self, icon, resolution_diff):
         super().__init__()
         self.setWindowTitle("Texture set Resolution is over Budget")
         self.setWindowIcon(icon)
-        self.setFixedSize(600, 160)
+        self.setFixedSize(600, 320)
 
         layout = QtWidgets.QVBoxLayout(self)
 
@@ -360,6 +976,12 @@ class DialogWindow(QtWidgets.QDialog):
 
         layout.addWidget(text_label)
 
+        # dry run diff of the autofix
+        diff_text_edit = QtWidgets.QPlainTextEdit("\n".join(resolution_diff))
+        diff_text_edit.setReadOnly(True)
+        diff_text_edit.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        layout.addWidget(diff_text_edit)
+
         buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Yes | QtWidgets.QDialogButtonBox.No)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
@@ -379,7 +1001,7 @@ class DialogWindow(QtWidgets.QDialog):
 
 def start_plugin():
     global CUSTOM_EXPORTER
-    CUSTOM_EXPORTER = CustomExporter()
+    CUSTOM_EXPORTER = CustomExporter(lazy=True)
 
 
 def close_plugin():